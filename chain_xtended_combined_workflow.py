@@ -10,53 +10,23 @@ in a single step.
 Program by Charlie Murphy
 '''
 
-from gerrychain.constraints import Validator, deviation_from_ideal
-from gerrychain import updaters
-from calc_fracwins_comp import calc_fracwins_comp
-from fracking import fracking, get_fracked_subgraph, fracking_total_splits, fracking_merge
+from gerrychain.chain_xtended_engine import MarkovChain_xtended_engine
+from metrics_cache import fracwins
+from fracking import (fracking, get_fracked_subgraph, fracking_total_splits,
+    fracking_merge, NoFrackError)
 from pop_constraint import pop_deviation, get_districts
+from evaluation_pipeline import Pipeline, Check, CHEAP, MODERATE, EXPENSIVE
         
-class MarkovChain_xtended_combined_workflow:
+class MarkovChain_xtended_combined_workflow(MarkovChain_xtended_engine):
 
     def __init__(self, proposal, constraints, accept, initial_state, 
         total_steps, election_composite, win_margin, win_volatility,
         cutoff, margin, stage, max_splits):
 
-        if callable(constraints):
-            is_valid = constraints
-        else:
-            is_valid = Validator(constraints)
-
-        if not is_valid(initial_state):
-            failed = [
-                constraint
-                for constraint in is_valid.constraints
-                if not constraint(initial_state)
-            ]
-            message = (
-                "The given initial_state is not valid according is_valid. "
-                "The failed constraints were: " + ",".join([f.__name__ for f in failed])
-            )
-            self.good = 0
-            raise ValueError(message)
-
-        self.proposal = proposal
-        self.is_valid = is_valid
-        self.accept = accept
-        self.good = 1
-        self.total_steps = total_steps
-        self.initial_state = initial_state
-        self.state = initial_state
-
         self.election_composite = election_composite
         self.win_margin = win_margin
         self.win_volatility = win_volatility
 
-        self.old_popdev = pop_deviation(self.state)
-        self.old_fracks = fracking(self.state)
-        self.old_cut_edges = len(self.state["cut_edges"])
-        self.old_wins = calc_fracwins_comp(self.state, self.election_composite, self.win_volatility)
-
         self.stage = stage
 
         self.max_splits = max_splits
@@ -65,12 +35,74 @@ class MarkovChain_xtended_combined_workflow:
         self.margin = margin
         self.tries = 0
 
-    def __iter__(self):
-        self.counter = 0
-        self.state = self.initial_state
-        self.good=1
-        self.fit = 1
-        return self
+        MarkovChain_xtended_engine.__init__(self, proposal, constraints, accept,
+            initial_state, total_steps)
+
+        # Acceptance criteria of each stage, the objective of the stage first
+        smoothing = Check("cut_edges", lambda m: self.smoothing(), CHEAP)
+        wins = Check("wins", lambda m: self.plan_criteria(), EXPENSIVE)
+        self.pipelines = {
+            0: Pipeline([
+                Check("popdev", lambda m: self.old_popdev > m["popdev"], CHEAP,
+                    True),
+                smoothing,
+                Check("merged_splits", lambda m: m["merge"][1] <= 1, MODERATE),
+                wins]),
+            1: Pipeline([
+                Check("fracks", lambda m: self.new_fracks < self.old_fracks,
+                    MODERATE, True),
+                smoothing,
+                wins]),
+            2: Pipeline([
+                smoothing._replace(objective = True),
+                Check("splits", lambda m: self.splits <= self.max_splits,
+                    MODERATE),
+                wins])}
+
+    def initialize(self):
+        self.old_popdev = pop_deviation(self.state)
+        self.old_fracks = fracking(self.state)
+        self.old_cut_edges = len(self.state["cut_edges"])
+        self.old_wins = fracwins(self.state, self.election_composite, self.win_volatility)
+
+    def metric_functions(self):
+        return {
+            "popdev": pop_deviation,
+            "merge": lambda p: fracking_merge(p, self.districts[0],
+                self.districts[1]),
+            "total_splits": fracking_total_splits,
+            "cut_edges": lambda p: len(p["cut_edges"]),
+            "wins": lambda p: fracwins(p, self.election_composite,
+                self.win_volatility)}
+
+    def criteria(self, metrics):
+        return self.pipelines[self.stage](metrics)
+
+    @property
+    def new_popdev(self):
+        return self.metrics["popdev"]
+
+    # Fracks and county splits come from fracking_merge when population is
+    # being balanced and from fracking_total_splits otherwise
+    @property
+    def new_fracks(self):
+        if self.stage == 0:
+            return self.metrics["merge"][0]
+        return self.metrics["total_splits"][0]
+
+    @property
+    def splits(self):
+        if self.stage == 0:
+            return self.metrics["merge"][2]
+        return self.metrics["total_splits"][1]
+
+    @property
+    def new_cut_edges(self):
+        return self.metrics["cut_edges"]
+
+    @property
+    def new_wins(self):
+        return self.metrics["wins"]
 
     # Return whether or not the number of cut edges is sufficiently low. This 
     # starts as less than or equal to the existing number of cut edges. However,
@@ -86,107 +118,57 @@ class MarkovChain_xtended_combined_workflow:
     def plan_criteria(self):
         return self.new_wins <= self.old_wins * (1 + self.win_margin)
 
-    def __next__(self):
+    def select(self):
+        self.tries += 1
+
+        # If population is not yet balanced, choose the districts to merge
+        # that have the greatest population deviation
+        if self.stage == 0:
+            self.districts = get_districts(self.state)
+            return (self.districts,)
+
+        # Otherwise, if there are still fracks, choose districts to merge 
+        # that share fracks. The stage ends once no frack can be reduced
+        elif self.stage == 1:
+            try:
+                self.districts, subgraph, population = get_fracked_subgraph(self.state)
+            except NoFrackError:
+                raise StopIteration
+            return (subgraph, self.districts, population)
+
+        # Otherwise, the proposal (plain recom) chooses the districts to merge
+        # randomly, so it gets no target
+        return MarkovChain_xtended_engine.select(self)
+
+    def keep(self, proposed_next_state):
+
+        # If population is not yet balanced, keep if the plan improves the
+        # population balance and reduces cut edges
+        if self.stage == 0:
+            self.old_popdev = self.new_popdev
+            self.old_cut_edges = self.new_cut_edges
+            self.old_wins = self.new_wins
+            self.state = proposed_next_state
+            self.good = 1
+            self.tries = 0
 
-        # Keep the initial state
-        if self.counter == 0:
-            self.counter += 1
+        # If there are fracks, keep if the plan reduces fracks and cut edges
+        elif self.stage == 1:
             self.good = 1
-            return self
-
-        while self.counter < self.total_steps:
-            self.tries += 1
-
-            # If population is not yet balanced, choose the districts to merge
-            # that have the greatest population deviation
-            if self.stage == 0:
-                districts = get_districts(self.state)
-                proposed_next_state = self.proposal(self.state, districts)
-
-            # Otherwise, if there are still fracks, choose districts to merge 
-            # that share fracks
-            elif self.stage == 1:
-                districts, subgraph, population = get_fracked_subgraph(self.state)
-                proposed_next_state = self.proposal(self.state, subgraph, districts,
-                    population)
-
-            # Otherwise, choose districts to merge randomly
-            else:
-                proposed_next_state = self.proposal(self.state)
-
-            # Find the number of fracks and county splits in the new proposed
-            # plan
-            if self.stage == 0:
-                self.new_fracks, merged_splits, self.splits = fracking_merge(proposed_next_state,
-                    districts[0], districts[1])
-            else:
-                self.new_fracks, self.splits = fracking_total_splits(proposed_next_state)
-
-            # Find population deviation
-            self.new_popdev = pop_deviation(proposed_next_state)
-
-            # Find number of cut edges
-            self.new_cut_edges = len(proposed_next_state["cut_edges"])
-
-            # Find the fractional seat share
-            self.new_wins = calc_fracwins_comp(proposed_next_state, 
-                self.election_composite, self.win_volatility)
-
-            # Erase the parent of the parent, to avoid memory leak
-            self.state.parent = None
-            self.good = 0
-
-            # If the plan meets the constraints
-            if (self.is_valid(proposed_next_state) 
-                and self.accept(proposed_next_state)):
-                if self.plan_criteria():
-
-                    # If population is not yet balanced, keep if the plan 
-                    # improves the population balance and reduces cut edges
-                    if (self.stage == 0 and self.old_popdev > self.new_popdev 
-                        and merged_splits <= 1 and self.smoothing()):
-                        self.old_popdev = self.new_popdev
-                        self.old_cut_edges = self.new_cut_edges
-                        self.old_wins = self.new_wins
-                        self.state = proposed_next_state
-                        self.good = 1
-                        self.tries = 0
-
-                    # If there are fracks, keep if the plan reduces fracks and 
-                    # cut edges
-                    elif (self.stage == 1 and self.new_fracks < self.old_fracks 
-                        and self.smoothing()):
-                        self.good = 1
-                        self.old_fracks = self.new_fracks
-                        self.old_cut_edges = self.new_cut_edges
-                        self.old_wins = self.new_wins
-                        self.state = proposed_next_state
-                        self.tries = 0
-
-                    # Otherwise, only keep plans based on smoothing
-                    elif (self.stage == 2 and self.splits <= self.max_splits and 
-                        self.smoothing()):
-                        self.state = proposed_next_state
-                        self.tries = 0
-                        self.old_wins = self.new_wins
-
-                        # Only make a file of the plan if the number of new cut
-                        # edges is strictly less
-                        if self.new_cut_edges < self.old_cut_edges:
-                            self.good = 1
-                            self.old_cut_edges = self.new_cut_edges
-                   
-                self.counter += 1
-                return self
-        raise StopIteration
-
-    def __len__(self):
-        return self.total_steps
-
-    def __repr__(self):
-        return "<MarkovChain [{} steps]>".format(len(self))
-
-    def with_progress_bar(self):
-        from tqdm.auto import tqdm
-
-        return tqdm(self)
+            self.old_fracks = self.new_fracks
+            self.old_cut_edges = self.new_cut_edges
+            self.old_wins = self.new_wins
+            self.state = proposed_next_state
+            self.tries = 0
+
+        # Otherwise, only keep plans based on smoothing
+        else:
+            self.state = proposed_next_state
+            self.tries = 0
+            self.old_wins = self.new_wins
+
+            # Only make a file of the plan if the number of new cut edges is
+            # strictly less
+            if self.new_cut_edges < self.old_cut_edges:
+                self.good = 1
+                self.old_cut_edges = self.new_cut_edges
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Optimizing Markov chain shared by the MarkovChain_xtended chains. The engine
+keeps the validator setup, the iterator protocol, the metrics of each proposal
+and the acceptance pipeline; a chain is a configuration of it that chooses
+the target of each proposal, names the metrics it needs, lists its criteria
+and says what to remember when a plan is kept. Anything added here (caching,
+incremental metrics) applies to every chain.
+
+A configuration may override:
+    metric_functions() - the metrics of a proposal, by name
+    checks() - the acceptance criteria, as evaluation_pipeline Checks
+    initialize() - values of the initial state, after it has been validated
+    select() - the arguments passed to the proposal after the current state
+    criteria(metrics) - whether a valid proposal is kept
+    keep(proposed_next_state) - keep a proposal that meets the criteria
+    evaluate(proposed_next_state) - the whole test of a proposal, returning
+        whether the step is finished
+'''
+
+from gerrychain.constraints import Validator
+from evaluation_pipeline import Metrics, Pipeline
+
+class MarkovChain_xtended_engine:
+
+    def __init__(self, proposal, constraints, accept, initial_state,
+        total_steps):
+
+        if callable(constraints):
+            is_valid = constraints
+        else:
+            is_valid = Validator(constraints)
+
+        if not is_valid(initial_state):
+            failed = [
+                constraint
+                for constraint in is_valid.constraints
+                if not constraint(initial_state)
+            ]
+            message = (
+                "The given initial_state is not valid according is_valid. "
+                "The failed constraints were: " + ",".join([f.__name__ for f in failed])
+            )
+            self.good = 0
+            raise ValueError(message)
+
+        self.proposal = proposal
+        self.is_valid = is_valid
+        self.accept = accept
+        self.good = 1
+        self.total_steps = total_steps
+        self.initial_state = initial_state
+        self.state = initial_state
+
+        self.initialize()
+
+        # Metrics of each proposal, computed only when a check or the caller
+        # asks for them, and the acceptance criteria
+        self.metrics = Metrics(self.metric_functions())
+        self.pipeline = Pipeline(self.checks())
+
+    def initialize(self):
+        pass
+
+    def metric_functions(self):
+        return {}
+
+    def checks(self):
+        return []
+
+    def select(self):
+        return ()
+
+    def criteria(self, metrics):
+        return self.pipeline(metrics)
+
+    def keep(self, proposed_next_state):
+        self.state = proposed_next_state
+        self.good = 1
+
+    # Keep the proposal if it is valid and meets the criteria. Only valid
+    # proposals finish a step.
+    def evaluate(self, proposed_next_state):
+        if self.is_valid(proposed_next_state) and self.accept(proposed_next_state):
+
+            if self.criteria(self.metrics):
+                self.keep(proposed_next_state)
+
+            self.counter += 1
+            return True
+        return False
+
+    def __iter__(self):
+        self.counter = 0
+        self.state = self.initial_state
+        self.good=1
+        self.fit = 1
+        return self
+
+    def __next__(self):
+
+        if self.counter == 0:
+            self.counter += 1
+            self.good = 1
+            return self
+
+        while self.counter < self.total_steps:
+
+            proposed_next_state = self.proposal(self.state, *self.select())
+            self.metrics.reset(proposed_next_state)
+
+            # Erase the parent of the parent, to avoid memory leak
+            self.state.parent = None
+            self.good = 0
+
+            if self.evaluate(proposed_next_state):
+                return self
+        raise StopIteration
+
+    def __len__(self):
+        return self.total_steps
+
+    def __repr__(self):
+        return "<MarkovChain [{} steps]>".format(len(self))
+
+    def with_progress_bar(self):
+        from tqdm.auto import tqdm
+
+        return tqdm(self)
@@ -3,46 +3,21 @@ this Markov chain forces more compact districts - with smaller boundary length
 and permit lower mean_median scores as long as those >= 0
 """
 
-from .constraints import Validator
+from .chain_xtended_engine import MarkovChain_xtended_engine
 from gerrychain import updaters
 from gerrychain.metrics import mean_median
-from calc_fracwins_comp import calc_fracwins_comp
+from metrics_cache import fracwins
+from graph_schema import get_field
+from evaluation_pipeline import Pipeline, Check, MODERATE, EXPENSIVE
 
 def total_splits(partition):
-    
-    #county_field  = 'COUNTYFP10'
-    #county_field = "COUNTY"
-    fieldlist = partition.graph.nodes[0].keys()   #get LIST OF FIELDS
-    
-    if 'COUNTYFP10' in fieldlist:
-        county_field = 'COUNTYFP10'
-    elif 'CTYNAME' in fieldlist:
-        county_field = 'CTYNAME'
-    
-    elif 'COUNTYFIPS' in fieldlist:
-        county_field = 'COUNTYFIPS'
-    
-    elif 'COUNTYFP' in fieldlist:
-        county_field = 'COUNTYFP'
-    elif 'cnty_nm' in fieldlist:
-        county_field = 'cnty_nm'
-    elif 'county_nam' in fieldlist:
-        county_field = 'county_nam'
-    elif 'FIPS2' in fieldlist:
-        county_field = 'FIPS2'
-    
-    elif 'County' in fieldlist:
-        county_field = 'County'
-    elif 'FIPS' in fieldlist:
-        county_field = 'FIPS'
-    elif 'CNTY_NAME' in fieldlist:
-        county_field = 'CNTY_NAME'
-    elif 'COUNTY' in fieldlist:
-        county_field = 'COUNTY'
-    else:
-        print("no county ID info in shapefile\n")
-        return 10
-    
+
+    # the county_pieces updater keeps the split count between steps
+    if "county_pieces" in partition.updaters:
+        return partition["county_pieces"].splits
+
+    county_field = get_field(partition.graph, "county")
+
     gg = updaters.county_splits(partition, county_field)
     gg_res = gg(partition)
     splitcount=0
@@ -51,7 +26,7 @@ def total_splits(partition):
         
     return splitcount
 
-class MarkovChain_xtended_ltpolish_fracs_dem:
+class MarkovChain_xtended_ltpolish_fracs_dem(MarkovChain_xtended_engine):
     """
     THIS version requires the next state have boundary length not longer than current plan while increaasing republican share. It doesn't really polish
     just keeps boundary length the same but makes redmap w/o it looking bad'
@@ -84,136 +59,90 @@ class MarkovChain_xtended_ltpolish_fracs_dem:
         : seat_min - for polish step, don't increase compactness if number of seats falls below this  
 
         """
-        if callable(constraints):
-            is_valid = constraints
-        else:
-            is_valid = Validator(constraints)
-
-        if not is_valid(initial_state):
-            failed = [
-                constraint
-                for constraint in is_valid.constraints
-                if not constraint(initial_state)
-            ]
-            message = (
-                "The given initial_state is not valid according is_valid. "
-                "The failed constraints were: " + ",".join([f.__name__ for f in failed])
-            )
-            self.good = 0
-            raise ValueError(message)
-
-        self.proposal = proposal
-        self.is_valid = is_valid
-        self.accept = accept
-        self.good = 1
-        self.total_steps = total_steps
-        self.initial_state = initial_state
-        self.state = initial_state
         self.lastgoodcount = 0
     
         self.maxsplits = maxsplits
         self.election_composite = election_composite
         self.win_volatility = win_volatility
         self.seat_min = seat_min
-        
-    
 
-    def __iter__(self):
-        self.counter = 0
-        self.state = self.initial_state
-        self.good=1
-        self.fit = 1
-        return self
-
-    def __next__(self):
-        
-        if self.counter == 0:
-            self.counter += 1
-            self.good=1
-        
-            return self
-            
+        MarkovChain_xtended_engine.__init__(self, proposal, constraints, accept,
+            initial_state, total_steps)
+
+        # proposals that split more counties than the current plan are still
+        # kept while they stay within maxsplits and keep the fractional wins
+        self.within_maxsplits = Pipeline([
+            Check("maxsplits", lambda m: m["splits"] <= self.maxsplits,
+                MODERATE, True),
+            Check("wins", lambda m: self.wins_criteria(), EXPENSIVE)])
+
+    # metrics of each proposal, only computed once a test reaches them
+    def metric_functions(self):
+        return {
+            "wins": lambda p: fracwins(p, self.election_composite, self.win_volatility),
+            "splits": total_splits}
+
+    # fractional wins in proposed state are at least those of the current state
+    # (which are cached), or the seats are at most seat_min anyway
+    def wins_criteria(self):
+        new_wins = self.metrics["wins"]
+        old_wins = fracwins(self.state, self.election_composite, self.win_volatility)
+        return old_wins <= new_wins or new_wins <= self.seat_min
+
+    # fractional wins in proposed state are more than those of the current state
+    def more_wins(self):
+        old_wins = fracwins(self.state, self.election_composite, self.win_volatility)
+        return old_wins < self.metrics["wins"]
+
+    # the proposal does not split more counties than the current plan and
+    # keeps its fractional wins
+    def checks(self):
+        return [
+            Check("splits", lambda m: total_splits(self.state) >= m["splits"],
+                MODERATE, True),
+            Check("wins", lambda m: self.wins_criteria(), EXPENSIVE)]
+
+    def evaluate(self, proposed_next_state):
         
-        while self.counter < self.total_steps:
+        if self.counter - self.lastgoodcount > 100:  #%fit & get new data that attemps to lower county splits.
+            self.fit = 1
         
-            proposed_next_state = self.proposal(self.state)
-            # Erase the parent of the parent, to avoid memory leak
-            self.state.parent = None
-            if self.counter - self.lastgoodcount > 100:  #%fit & get new data that attemps to lower county splits.
-                self.fit = 1
-            
-            new_wins = calc_fracwins_comp(proposed_next_state,self.election_composite, self.win_volatility )
-            
-            # calc fractional wins in proposed state
-            more_eq_wins = calc_fracwins_comp(self.state, self.election_composite, self.win_volatility) <= new_wins
-            more_lt_wins = calc_fracwins_comp(self.state, self.election_composite, self.win_volatility) < new_wins
-                         
-            enuf_wins = new_wins <= self.seat_min
-            
-            new_bdrylength = len(proposed_next_state["cut_edges"])
-            old_bdrylength = len(self.state["cut_edges"])
-            new_le_oldlength = new_bdrylength <= old_bdrylength  #signs of progress
-#            new_lt_oldlength = new_bdrylength < old_bdrylength
-            
-            if self.is_valid(proposed_next_state): # and updaters.districts_within_population_deviation(proposed_next_state):
-
-                '''
-                print(new_wins)
-                print(calc_fracwins_comp(self.state, self.election_composite, self.win_volatility) )
-                print()
-                '''
-                 
-                if self.accept(proposed_next_state) and self.fit == 1 and (total_splits(self.state) >= total_splits(proposed_next_state)) and \
-                	 (more_eq_wins or enuf_wins):
-                    """
-                if self.accept(proposed_next_state) and self.fit == 1 and (total_splits(self.state) >= total_splits(proposed_next_state)) and \
-                	new_le_oldlength and (more_eq_wins or enuf_wins):
-                    """
-                        
-                    if total_splits(self.state) <= self.maxsplits:
-                        self.good=1
-                      #  self.fit = 0  #reset so don't do any more fits for the next 100 after this
-                        self.lastgoodcount = self.counter
-                        self.counter += 1
-                    else:
-                        self.good=0
-                        
-                    if more_lt_wins:   #set flag value to -1 showing the boundary lengths got SHORTER
-                        self.good = -1
-                    
-                elif self.accept(proposed_next_state) and self.fit == 0:  #"dont bother trying to reduce county splits but scramble state"
-                    # self.state = proposed_next_state
-                    self.good=0
-                    
-                elif self.accept(proposed_next_state) and self.fit ==1 and total_splits(proposed_next_state) <= self.maxsplits and \
-                   (more_eq_wins or enuf_wins):    
-#                   substitute for code block at end... avoiding compactness requirement       
+        if self.is_valid(proposed_next_state): # and updaters.districts_within_population_deviation(proposed_next_state):
+
+            self.good=0
+
+            if not self.accept(proposed_next_state):
+                return True
+
+            if self.fit == 0:  #"dont bother trying to reduce county splits but scramble state"
+                # self.state = proposed_next_state
+                return True
+
+            if self.criteria(self.metrics):
                     
+                if total_splits(self.state) <= self.maxsplits:
                     self.good=1
+                  #  self.fit = 0  #reset so don't do any more fits for the next 100 after this
+                    self.lastgoodcount = self.counter
                     self.counter += 1
-                    if more_lt_wins:   #set flag value to -1 showing the boundary lengths got SHORTER
-                        self.good = -1
-                        self.state = proposed_next_state
                     
-                else:
-                    self.good=0
+                if self.more_wins():   #set flag value to -1 showing the boundary lengths got SHORTER
+                    self.good = -1
                 
+            elif self.within_maxsplits(self.metrics):
+#               substitute for code block at end... avoiding compactness requirement       
                 
-                return self
-            else:
-                self.good=0
-        raise StopIteration
-
-    def __len__(self):
-        return self.total_steps
-
-    def __repr__(self):
-        return "<MarkovChain [{} steps]>".format(len(self))
-
-    def with_progress_bar(self):
-        from tqdm.auto import tqdm
+                self.good=1
+                self.counter += 1
+                if self.more_wins():   #set flag value to -1 showing the boundary lengths got SHORTER
+                    self.good = -1
+                    self.state = proposed_next_state
+            
+            return True
+        else:
+            self.good=0
+            return False
 
-        return tqdm(self)
     """        
                         elif self.accept(proposed_next_state) and self.fit ==1 and total_splits(proposed_next_state) <= self.maxsplits and \
                             new_le_oldlength and (more_eq_wins or enuf_wins):  """
\ No newline at end of file
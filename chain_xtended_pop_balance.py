@@ -9,114 +9,81 @@ redistricting plan.
 Program by Charlie Murphy based on code by Dinos Gonatas
 '''
 
-from gerrychain.constraints import Validator, deviation_from_ideal
-from gerrychain import updaters
-from calc_fracwins_comp import calc_fracwins_comp
+from gerrychain.chain_xtended_engine import MarkovChain_xtended_engine
+from metrics_cache import fracwins
 from fracking import fracking_merge
-from pop_constraint import pop_deviation
+from pop_constraint import pop_deviation, get_edge
+from evaluation_pipeline import Check, CHEAP, MODERATE, EXPENSIVE
         
-class MarkovChain_xtended_pop_balance:
+class MarkovChain_xtended_pop_balance(MarkovChain_xtended_engine):
 
     def __init__(self, proposal, constraints, accept, initial_state, 
         total_steps, election_composite, win_margin, win_volatility,
         boundary_margin):
 
-        if callable(constraints):
-            is_valid = constraints
-        else:
-            is_valid = Validator(constraints)
-
-        if not is_valid(initial_state):
-            failed = [
-                constraint
-                for constraint in is_valid.constraints
-                if not constraint(initial_state)
-            ]
-            message = (
-                "The given initial_state is not valid according is_valid. "
-                "The failed constraints were: " + ",".join([f.__name__ for f in failed])
-            )
-            self.good = 0
-            raise ValueError(message)
-
-        self.proposal = proposal
-        self.is_valid = is_valid
-        self.accept = accept
-        self.good = 1
-        self.total_steps = total_steps
-        self.initial_state = initial_state
-        self.state = initial_state
-        self.old_popdev = pop_deviation(self.state)
-
         self.election_composite = election_composite
         self.win_margin = win_margin
         self.win_volatility = win_volatility
         self.boundary_margin = boundary_margin
 
-    def __iter__(self):
-        self.counter = 0
-        self.state = self.initial_state
-        self.good=1
-        self.fit = 1
-        return self
-
-    def plan_criteria(self, proposed_next_state):
-        new_wins = calc_fracwins_comp(proposed_next_state, self.election_composite, self.win_volatility)
-        old_wins = calc_fracwins_comp(self.state, self.election_composite, self.win_volatility)
-        new_le_oldwins = new_wins <= old_wins * (1 + self.win_margin)
-        
-        new_bdrylength = len(proposed_next_state["cut_edges"])
-        old_bdrylength = len(self.state["cut_edges"])
-        new_le_oldlength = new_bdrylength <= old_bdrylength * (1 + self.boundary_margin)
-
-        return (self.merged_splits and new_le_oldlength and new_le_oldwins)
-
-    def __next__(self):
-
-        if self.counter == 0:
-            self.counter += 1
-            self.good = 1
-            return self
-
-        while self.counter < self.total_steps:
+        MarkovChain_xtended_engine.__init__(self, proposal, constraints, accept,
+            initial_state, total_steps)
 
-            edge = max(self.state["cut_edges"], key=lambda x: 
-            abs(abs(self.state["population"][self.state.assignment[x[1]]]) - 
-            abs(self.state["population"][self.state.assignment[x[0]]])) )
-
-            self.d1 = self.state.assignment[edge[0]]
-            self.d2 = self.state.assignment[edge[1]]
-
-            proposed_next_state = self.proposal(self.state, (self.d1, self.d2))
-
-            self.new_popdev = pop_deviation(proposed_next_state)
-
-            # Erase the parent of the parent, to avoid memory leak
-            self.state.parent = None
-            self.good = 0
-
-            if self.is_valid(proposed_next_state) and self.accept(proposed_next_state):
-
-                self.new_fracks, self.merged_splits, self.splits = fracking_merge(proposed_next_state,
-                    self.d1, self.d2)
+    def initialize(self):
+        self.old_popdev = pop_deviation(self.state)
 
-                if (self.plan_criteria(proposed_next_state) and 
-                    self.old_popdev > self.new_popdev):
-                    self.old_popdev = self.new_popdev
-                    self.state = proposed_next_state
-                    self.good = 1
-                   
-                self.counter += 1
-                return self
-        raise StopIteration
+    def metric_functions(self):
+        return {
+            "popdev": pop_deviation,
+            "merge": lambda p: fracking_merge(p, self.d1, self.d2),
+            "cut_edges": lambda p: len(p["cut_edges"]),
+            "wins": lambda p: fracwins(p, self.election_composite,
+                self.win_volatility)}
+
+    # Acceptance criteria, the population objective first
+    def checks(self):
+        return [
+            Check("popdev", lambda m: self.old_popdev > m["popdev"], CHEAP, True),
+            Check("boundary", self.boundary_criteria, CHEAP),
+            Check("merged_splits", lambda m: m["merge"][1], MODERATE),
+            Check("wins", self.plan_criteria, EXPENSIVE)]
+
+    @property
+    def new_popdev(self):
+        return self.metrics["popdev"]
+
+    @property
+    def new_fracks(self):
+        return self.metrics["merge"][0]
+
+    @property
+    def merged_splits(self):
+        return self.metrics["merge"][1]
+
+    @property
+    def splits(self):
+        return self.metrics["merge"][2]
+
+    def plan_criteria(self, metrics):
+        new_wins = metrics["wins"]
+        old_wins = fracwins(self.state, self.election_composite, self.win_volatility)
+        return new_wins <= old_wins * (1 + self.win_margin)
+
+    def boundary_criteria(self, metrics):
+        new_bdrylength = metrics["cut_edges"]
+        old_bdrylength = len(self.state["cut_edges"])
+        return new_bdrylength <= old_bdrylength * (1 + self.boundary_margin)
 
-    def __len__(self):
-        return self.total_steps
+    # Merge the districts with the greatest population deviation
+    def select(self):
+        edge = get_edge(self.state)
 
-    def __repr__(self):
-        return "<MarkovChain [{} steps]>".format(len(self))
+        self.d1 = self.state.assignment[edge[0]]
+        self.d2 = self.state.assignment[edge[1]]
 
-    def with_progress_bar(self):
-        from tqdm.auto import tqdm
+        return ((self.d1, self.d2),)
 
-        return tqdm(self)
+    def keep(self, proposed_next_state):
+        self.old_popdev = self.new_popdev
+        self.state = proposed_next_state
+        self.good = 1
@@ -9,101 +9,71 @@ Program designed to use gerrychain to find plans with proporitonal seats.
 Program by Charlie Murphy based on code by Dinos Gonatas
 '''
 
-from gerrychain.constraints import Validator, deviation_from_ideal
-from gerrychain import updaters
+from gerrychain.chain_xtended_engine import MarkovChain_xtended_engine
 from fracking import fracking_merge
 from proportional_seats_deviation import prop_dev
+from evaluation_pipeline import Check, MODERATE, EXPENSIVE
+from gerrychain.cut_edge_index import random_cut_edge
 import random
         
-class MarkovChain_xtended_prop_dev:
+class MarkovChain_xtended_prop_dev(MarkovChain_xtended_engine):
 
     def __init__(self, proposal, constraints, accept, initial_state, 
         total_steps, election_composite, win_volatility, proportional_seats):
 
-        if callable(constraints):
-            is_valid = constraints
-        else:
-            is_valid = Validator(constraints)
-
-        if not is_valid(initial_state):
-            failed = [
-                constraint
-                for constraint in is_valid.constraints
-                if not constraint(initial_state)
-            ]
-            message = (
-                "The given initial_state is not valid according is_valid. "
-                "The failed constraints were: " + ",".join([f.__name__ for f in failed])
-            )
-            self.good = 0
-            raise ValueError(message)
-
-        self.proposal = proposal
-        self.is_valid = is_valid
-        self.accept = accept
-        self.good = 1
-        self.total_steps = total_steps
-        self.initial_state = initial_state
-        self.state = initial_state
-        
         self.election_composite = election_composite
         self.win_volatility = win_volatility
         self.proportional_seats = proportional_seats
 
-        self.old_propdev = prop_dev(self.state, self.election_composite,
-            self.win_volatility, self.proportional_seats)
-
-    def __iter__(self):
-        self.counter = 0
-        self.state = self.initial_state
-        self.good=1
-        self.fit = 1
-        return self
-
-    def __next__(self):
+        MarkovChain_xtended_engine.__init__(self, proposal, constraints, accept,
+            initial_state, total_steps)
 
-        if self.counter == 0:
-            self.counter += 1
-            self.good = 1
-            return self
-
-        while self.counter < self.total_steps:
-
-            edge = random.choice(tuple(self.state["cut_edges"]))
+    # Disproportionality of partition
+    def deviation(self, partition):
+        return prop_dev(partition, self.election_composite,
+            self.win_volatility, self.proportional_seats)
 
-            self.d1 = self.state.assignment[edge[0]]
-            self.d2 = self.state.assignment[edge[1]]
+    def initialize(self):
+        self.old_propdev = self.deviation(self.state)
 
-            proposed_next_state = self.proposal(self.state, (self.d1, self.d2))
+    def metric_functions(self):
+        return {
+            "propdev": self.deviation,
+            "merge": lambda p: fracking_merge(p, self.d1, self.d2)}
 
-            self.new_propdev = prop_dev(proposed_next_state, self.election_composite,
-                self.win_volatility, self.proportional_seats)
+    # Acceptance criteria, the proportionality objective first
+    def checks(self):
+        return [
+            Check("propdev", lambda m: m["propdev"] < self.old_propdev,
+                EXPENSIVE, True),
+            Check("merged_splits", lambda m: m["merge"][1] <= 1, MODERATE)]
 
-            # Erase the parent of the parent, to avoid memory leak
-            self.state.parent = None
-            self.good = 0
+    @property
+    def new_propdev(self):
+        return self.metrics["propdev"]
 
-            if self.is_valid(proposed_next_state) and self.accept(proposed_next_state):
+    @property
+    def new_fracks(self):
+        return self.metrics["merge"][0]
 
-                self.new_fracks, self.merged_splits, self.splits = fracking_merge(proposed_next_state,
-                    self.d1, self.d2)
+    @property
+    def merged_splits(self):
+        return self.metrics["merge"][1]
 
-                if self.merged_splits <= 1 and self.new_propdev < self.old_propdev:
-                    self.old_propdev = self.new_propdev
-                    self.state = proposed_next_state
-                    self.good = 1
-                   
-                self.counter += 1
-                return self
-        raise StopIteration
+    @property
+    def splits(self):
+        return self.metrics["merge"][2]
 
-    def __len__(self):
-        return self.total_steps
+    # Merge the districts on either side of a random cut edge
+    def select(self):
+        edge = random_cut_edge(self.state, random)
 
-    def __repr__(self):
-        return "<MarkovChain [{} steps]>".format(len(self))
+        self.d1 = self.state.assignment[edge[0]]
+        self.d2 = self.state.assignment[edge[1]]
 
-    def with_progress_bar(self):
-        from tqdm.auto import tqdm
+        return ((self.d1, self.d2),)
 
-        return tqdm(self)
+    def keep(self, proposed_next_state):
+        self.old_propdev = self.new_propdev
+        self.state = proposed_next_state
+        self.good = 1
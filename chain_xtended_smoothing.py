@@ -10,96 +10,62 @@ intent.
 Program by Charlie Murphy
 '''
 
-from gerrychain.constraints import Validator, deviation_from_ideal
-from gerrychain import updaters
+from gerrychain.chain_xtended_engine import MarkovChain_xtended_engine
 from fracking import fracking_merge
+from evaluation_pipeline import Check, CHEAP, MODERATE
+from gerrychain.cut_edge_index import random_cut_edge
 import random
         
-class MarkovChain_xtended_smoothing:
+class MarkovChain_xtended_smoothing(MarkovChain_xtended_engine):
 
     def __init__(self, proposal, constraints, accept, initial_state, 
         total_steps):
 
-        if callable(constraints):
-            is_valid = constraints
-        else:
-            is_valid = Validator(constraints)
-
-        if not is_valid(initial_state):
-            failed = [
-                constraint
-                for constraint in is_valid.constraints
-                if not constraint(initial_state)
-            ]
-            message = (
-                "The given initial_state is not valid according is_valid. "
-                "The failed constraints were: " + ",".join([f.__name__ for f in failed])
-            )
-            self.good = 0
-            raise ValueError(message)
-
-        self.proposal = proposal
-        self.is_valid = is_valid
-        self.accept = accept
-        self.good = 1
-        self.total_steps = total_steps
-        self.initial_state = initial_state
-        self.state = initial_state
+        MarkovChain_xtended_engine.__init__(self, proposal, constraints, accept,
+            initial_state, total_steps)
 
+    def initialize(self):
         self.old_smooth = len(self.state["cut_edges"])
 
-    def __iter__(self):
-        self.counter = 0
-        self.state = self.initial_state
-        self.good=1
-        self.fit = 1
-        return self
-
-    def __next__(self):
-
-        if self.counter == 0:
-            self.counter += 1
-            self.good = 1
-            return self
-
-        while self.counter < self.total_steps:
+    def metric_functions(self):
+        return {
+            "cut_edges": lambda p: len(p["cut_edges"]),
+            "merge": lambda p: fracking_merge(p, self.d1, self.d2)}
 
-            edge = random.choice(tuple(self.state["cut_edges"]))
+    # Acceptance criteria, the boundary length objective first
+    def checks(self):
+        return [
+            Check("cut_edges", lambda m: m["cut_edges"] < self.old_smooth,
+                CHEAP, True),
+            Check("merged_splits", lambda m: m["merge"][1] <= 1, MODERATE),
+            Check("fracks", lambda m: m["merge"][0] == 0, MODERATE)]
 
-            self.d1 = self.state.assignment[edge[0]]
-            self.d2 = self.state.assignment[edge[1]]
+    @property
+    def new_smooth(self):
+        return self.metrics["cut_edges"]
 
-            proposed_next_state = self.proposal(self.state, (self.d1, self.d2))
+    @property
+    def fracks(self):
+        return self.metrics["merge"][0]
 
-            self.new_smooth = len(proposed_next_state["cut_edges"])
+    @property
+    def merged_splits(self):
+        return self.metrics["merge"][1]
 
-            # Erase the parent of the parent, to avoid memory leak
-            self.state.parent = None
-            self.good = 0
+    @property
+    def splits(self):
+        return self.metrics["merge"][2]
 
-            if self.is_valid(proposed_next_state) and self.accept(proposed_next_state):
+    # Merge the districts on either side of a random cut edge
+    def select(self):
+        edge = random_cut_edge(self.state, random)
 
-                self.fracks, self.merged_splits, self.splits = fracking_merge(proposed_next_state,
-                    self.d1, self.d2)
+        self.d1 = self.state.assignment[edge[0]]
+        self.d2 = self.state.assignment[edge[1]]
 
-                if (self.merged_splits <= 1 and 
-                    self.new_smooth < self.old_smooth and
-                    self.fracks == 0):
-                    self.old_smooth = self.new_smooth
-                    self.state = proposed_next_state
-                    self.good = 1
-                   
-                self.counter += 1
-                return self
-        raise StopIteration
+        return ((self.d1, self.d2),)
 
-    def __len__(self):
-        return self.total_steps
-
-    def __repr__(self):
-        return "<MarkovChain [{} steps]>".format(len(self))
-
-    def with_progress_bar(self):
-        from tqdm.auto import tqdm
-
-        return tqdm(self)
+    def keep(self, proposed_next_state):
+        self.old_smooth = self.new_smooth
+        self.state = proposed_next_state
+        self.good = 1
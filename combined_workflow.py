@@ -13,6 +13,8 @@ from gerrychain import (GeographicPartition, Partition, Graph,
     MarkovChain_xtended_combined_workflow, proposals, updaters, constraints, accept,
     Election)
 from gerrychain.proposals import recom_frack, recom_merge, recom
+from gerrychain.cut_edge_index import cut_edge_index
+from gerrychain.district_pairs import district_pair_edges, district_adjacency
 from functools import partial
 import pandas
 import geopandas
@@ -21,16 +23,25 @@ import district_list as dl
 from fracking import fracking
 from pop_constraint import pop_constraint, pop_deviation
 from total_splits import total_splits
+from graph_schema import resolve_schema
+from county_pieces import county_pieces
+from population_spread import population_spread
 
 # Load files and combine into a single dataframe
 exec(open("./input_templates/combined_input.py").read())
 df = geopandas.read_file(my_electiondatafile) 
 exec(open("splice_assignment_fn.py").read())
 graph = graph_PA
+resolve_schema(graph, population = popkey, geoid = geotag)
 
 # Updaters
 elections, composite = get_elections(state)
-my_updaters = {"population": updaters.Tally(popkey, alias = "population")}
+my_updaters = {"population": updaters.Tally(popkey, alias = "population"),
+    "cut_edge_index": cut_edge_index,
+    "population_spread": population_spread,
+    "county_pieces": county_pieces,
+    "district_pair_edges": district_pair_edges,
+    "district_adjacency": district_adjacency}
 election_updaters = {election.name: election for election in elections}
 my_updaters.update(election_updaters)
 
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Updater that keeps the nodes and the number of connected pieces of every
+(county, district) intersection of a plan, along with the districts in each
+county. A step only recounts the intersections that contain a node it moved,
+so the number of pieces, the expected number of pieces, the number of county
+splits and the counties shared by two districts used by the fracking
+functions no longer need a pass over every county and district, and the
+nodes of any one intersection can be looked up directly. The fracked
+intersections are kept in a registry with the size of their smallest
+disconnected fragment, so a chain can pick the next one to fix without
+searching for it.
+
+Register it as "county_pieces": county_pieces in the updaters of the
+partition.
+'''
+
+from gerrychain.cut_edge_index import IndexedEdgeSet
+from gerrychain.random import random
+from gerrychain.versioned import Version, changed_nodes
+from graph_schema import get_field
+
+# Number of nodes in each connected component of the nodes in piece
+def component_sizes(graph, piece):
+    unseen = set(piece)
+    sizes = []
+    while unseen:
+        size = 1
+        stack = [unseen.pop()]
+        while stack:
+            for neighbor in graph.neighbors(stack.pop()):
+                if neighbor in unseen:
+                    unseen.remove(neighbor)
+                    stack.append(neighbor)
+                    size += 1
+        sizes.append(size)
+    return sizes
+
+# Number of connected components of the nodes in piece
+def count_components(graph, piece):
+    return len(component_sizes(graph, piece))
+
+# Number of pieces of the nodes in piece and the number of nodes of the
+# smallest one
+def piece_counts(graph, piece):
+    sizes = component_sizes(graph, piece)
+    return len(sizes), min(sizes)
+
+# Order a pair of districts
+def district_pair(d1, d2):
+    return (d1, d2) if d1 <= d2 else (d2, d1)
+
+# Nodes and number of pieces of each (county, district) intersection, the
+# district of each node, the districts in each county, the number of counties
+# each pair of districts shares, and the intersections that are fracked
+# (IndexedEdgeSet works for any hashable item, so it holds their keys) with the
+# number of nodes of their smallest fragment
+class CountyPiecesStore:
+
+    def __init__(self, graph, county_field, assignment):
+        self.graph = graph
+        self.county_field = county_field
+        self.nodes = {}
+        self.assignment = {}
+        self.districts = {}
+        self.shared = {}
+        for node in graph.nodes:
+            self.add_node(node, graph.nodes[node][county_field], assignment[node])
+
+        counts = {key: piece_counts(graph, nodes)
+            for key, nodes in self.nodes.items()}
+        self.pieces = {key: count for key, (count, _) in counts.items()}
+        self.total = sum(self.pieces.values())
+        self.fragments = {key: smallest for key, (count, smallest)
+            in counts.items() if count > 1}
+        self.fracked = IndexedEdgeSet(self.fragments)
+
+    # Add node to the intersection of county and district
+    def add_node(self, node, county, district):
+        key = (county, district)
+        if key not in self.nodes:
+            self.nodes[key] = set()
+            others = self.districts.setdefault(county, set())
+            for other in others:
+                pair = district_pair(district, other)
+                self.shared[pair] = self.shared.get(pair, 0) + 1
+            others.add(district)
+        self.nodes[key].add(node)
+        self.assignment[node] = district
+
+    # Remove node from the intersection of county and district
+    def remove_node(self, node, county, district):
+        key = (county, district)
+        self.nodes[key].remove(node)
+        if not self.nodes[key]:
+            del self.nodes[key]
+            others = self.districts[county]
+            others.remove(district)
+            for other in others:
+                pair = district_pair(district, other)
+                self.shared[pair] -= 1
+                if not self.shared[pair]:
+                    del self.shared[pair]
+
+    # Move nodes between intersections. change is a list of
+    # (node, county, old district, new district) moves and a dictionary with
+    # the number of pieces and the size of the smallest piece of the
+    # intersections they touch, or None to count them. Returns the change that
+    # undoes this one.
+    def apply(self, change):
+        moves, pieces = change
+
+        touched = set()
+        for node, county, old, new in moves:
+            self.remove_node(node, county, old)
+            self.add_node(node, county, new)
+            touched.add((county, old))
+            touched.add((county, new))
+
+        if pieces is None:
+            pieces = {key: piece_counts(self.graph, self.nodes[key])
+                if key in self.nodes else None for key in touched}
+
+        old_pieces = {}
+        for key, counts in pieces.items():
+            count = self.pieces.pop(key, None)
+            smallest = self.fragments.pop(key, None)
+            old_pieces[key] = None if count is None else (count, smallest)
+            self.total -= count or 0
+            if counts is not None:
+                self.pieces[key] = counts[0]
+                self.total += counts[0]
+            if counts is not None and counts[0] > 1:
+                self.fragments[key] = counts[1]
+                self.fracked.add(key)
+            else:
+                self.fracked.remove(key)
+
+        undo = [(node, county, new, old) for node, county, old, new in reversed(moves)]
+        return undo, old_pieces
+
+# Pieces of one partition, as returned by county_pieces
+class CountyPieces:
+
+    def __init__(self, version):
+        self._version = version
+
+    # Total number of pieces over all intersections
+    @property
+    def total(self):
+        return self._version.store.total
+
+    # Number of pieces there would be if no county was fracked, which is the
+    # number of (county, district) intersections
+    @property
+    def expected(self):
+        return len(self._version.store.nodes)
+
+    # Total number of county splits
+    @property
+    def splits(self):
+        store = self._version.store
+        return len(store.nodes) - len(store.districts)
+
+    # Number of pieces of district within county
+    def pieces(self, county, district):
+        return self._version.store.pieces.get((county, district), 0)
+
+    # Nodes of district within county
+    def nodes(self, county, district):
+        return frozenset(self._version.store.nodes.get((county, district), ()))
+
+    # Number of districts within county
+    def district_count(self, county):
+        return len(self._version.store.districts.get(county, ()))
+
+    # Districts within county
+    def districts(self, county):
+        return set(self._version.store.districts.get(county, ()))
+
+    # Fracked intersections as (county, district, number of nodes), in no
+    # particular order
+    def fracks(self):
+        store = self._version.store
+        return [(county, district, len(store.nodes[(county, district)]))
+            for county, district in store.fracked.edges]
+
+    # Number of nodes of the smallest disconnected fragment of district within
+    # county, or None if it is not fracked. This is the fragment a proposal has
+    # to reabsorb.
+    def fragment(self, county, district):
+        return self._version.store.fragments.get((county, district))
+
+    # Edges from district to the other districts within county, sorted
+    def boundary_edges(self, county, district):
+        store = self._version.store
+        graph = store.graph
+        edges = []
+        for node in sorted(store.nodes.get((county, district), ())):
+            for neighbor in graph.neighbors(node):
+                if (store.assignment[neighbor] != district and
+                    graph.nodes[neighbor][store.county_field] == county):
+                    edges.append(tuple(sorted((node, neighbor))))
+        return edges
+
+    # Districts that border district within county
+    def adjacent_districts(self, county, district):
+        store = self._version.store
+        return {store.assignment[node] for edge in
+            self.boundary_edges(county, district) for node in edge} - {district}
+
+    # The (county, district) of a fracked intersection, or None if nothing is
+    # fracked. By default the first fracked intersection in sorted order is
+    # returned; priority "random" picks one uniformly and "smallest" the one
+    # with the smallest disconnected fragment. The order of the registry
+    # changes as the store moves between plans, so the choice is made in
+    # sorted order to depend only on this plan.
+    def next_frack(self, priority = None, rng = random):
+        store = self._version.store
+        fracked = store.fracked.edges
+        if not fracked:
+            return None
+        if priority is None:
+            return min(fracked)
+        if priority == "random":
+            return sorted(fracked)[rng.randrange(len(fracked))]
+        if priority == "smallest":
+            return min(fracked, key = lambda key: (store.fragments[key], key))
+        raise ValueError("unknown frack priority: " + str(priority))
+
+    # Number of counties split between d1 and d2
+    def shared(self, d1, d2):
+        return self._version.store.shared.get(district_pair(d1, d2), 0)
+
+# Updater returning the CountyPieces of partition. Must be registered under the
+# name "county_pieces"
+def county_pieces(partition):
+    graph = partition.graph
+    parent = partition.parent
+    if parent is None:
+        store = CountyPiecesStore(graph, get_field(graph, "county"),
+            partition.assignment)
+        return CountyPieces(Version(store))
+
+    version = parent["county_pieces"]._version
+    county_field = version.store.county_field
+    moves = [(node, graph.nodes[node][county_field], old, new)
+        for node, (old, new) in changed_nodes(partition).items()]
+
+    return CountyPieces(version.derive((moves, None)))
+
+# CountyPieces of partition for county_field: the updater's if it is registered
+# for that column, otherwise built from scratch
+def get_county_pieces(partition, county_field):
+    if ("county_pieces" in partition.updaters and
+        county_field == get_field(partition.graph, "county")):
+        return partition["county_pieces"]
+
+    store = CountyPiecesStore(partition.graph, county_field, partition.assignment)
+    return CountyPieces(Version(store))
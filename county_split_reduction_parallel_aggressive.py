@@ -14,6 +14,7 @@ from gerrychain import (GeographicPartition, Partition, Graph,
     MarkovChain_xtended, proposals, updaters, constraints, accept,
     Election)
 from gerrychain.proposals import recom
+from gerrychain.cut_edge_index import cut_edge_index
 from functools import partial
 import pandas
 import geopandas
@@ -25,10 +26,14 @@ from multiprocessing import freeze_support, get_context, Value, Manager
 import time
 from pop_constraint import pop_constraint
 from total_splits import total_splits
+from seed_plans import seed_assignment
+from graph_schema import resolve_schema
+from county_pieces import county_pieces
+from population_spread import population_spread
 
 # Multichian Run
 def multi_chain(i1, graph, state, popkey, poptol, markovchainlength, maxsplits,
-    my_apportionment, best_splits, geotag, ns, time_interval, max_pop_deviation):
+    my_apportionment, best_splits, geotag, ns, time_interval, max_pop_deviation, seed_file):
 
     # Limit the total number of plans to markovchainlength
     count = 0
@@ -43,12 +48,17 @@ def multi_chain(i1, graph, state, popkey, poptol, markovchainlength, maxsplits,
 
             # Updaters
             elections, composite = get_elections(state)
-            my_updaters = {"population": updaters.Tally(popkey, alias = "population")}
+            my_updaters = {"population": updaters.Tally(popkey, alias = "population"),
+                "cut_edge_index": cut_edge_index,
+                "population_spread": population_spread,
+                "county_pieces": county_pieces}
             election_updaters = {election.name: election for election in elections}
             my_updaters.update(election_updaters)
 
             # Create Initial Partition
-            initial_partition = GeographicPartition(graph, assignment = my_apportionment,
+            initial_partition = GeographicPartition(graph,
+                assignment = seed_assignment(seed_file, i1, my_apportionment,
+                    graph),
                 updaters = my_updaters)
 
             # Create a Proposal
@@ -122,10 +132,14 @@ if __name__ == '__main__':
     df = geopandas.read_file(my_electiondatafile) 
     exec(open("splice_assignment_fn.py").read())
     graph = graph_PA
+    resolve_schema(graph, population = popkey, geoid = geotag)
 
     # Updaters
     elections, composite = get_elections(state)
-    my_updaters = {"population": updaters.Tally(popkey, alias = "population")}
+    my_updaters = {"population": updaters.Tally(popkey, alias = "population"),
+        "cut_edge_index": cut_edge_index,
+        "population_spread": population_spread,
+        "county_pieces": county_pieces}
     election_updaters = {election.name: election for election in elections}
     my_updaters.update(election_updaters)
 
@@ -147,4 +161,4 @@ if __name__ == '__main__':
 
     updated_vals = p.starmap(multi_chain, [(i1, graph, state, popkey, poptol, 
         markovchainlength, maxsplits, my_apportionment, best_splits, geotag, ns, 
-        time_interval, max_pop_deviation) for i1 in range(poolsize)])
\ No newline at end of file
+        time_interval, max_pop_deviation, seed_file) for i1 in range(poolsize)])
\ No newline at end of file
@@ -0,0 +1,129 @@
+"""
+Indexable set of cut edges, for drawing a uniformly random cut edge in O(1).
+
+``random.choice(tuple(partition["cut_edges"]))`` copies every cut edge of the
+plan on every step just to pick one of them. The :func:`cut_edge_index`
+updater instead keeps the cut edges in a list together with a map from each
+edge to its position in the list, so that edges can be sampled by position and
+added or removed (by swapping with the last edge) in O(1). The list is updated
+from the nodes each step actually moves, and is shared between a partition and
+its proposals through :class:`~gerrychain.versioned.Version`.
+
+Register it as ``"cut_edge_index": cut_edge_index`` in the updaters of the
+partition; :func:`random_cut_edge` falls back to ``partition["cut_edges"]``
+when it is not registered.
+
+Like tree.py, this file must be placed in the gerrychain directory.
+"""
+
+from .random import random
+from .versioned import Version, changed_nodes
+
+
+class IndexedEdgeSet:
+    """Set of edges supporting O(1) insertion, removal and sampling.
+
+    :ivar list edges: The edges, in no particular order.
+    :ivar dict positions: Maps each edge to its position in ``edges``.
+    """
+    __slots__ = ("edges", "positions")
+
+    def __init__(self, edges=()):
+        self.edges = list(edges)
+        self.positions = {edge: i for i, edge in enumerate(self.edges)}
+
+    def add(self, edge):
+        if edge in self.positions:
+            return False
+        self.positions[edge] = len(self.edges)
+        self.edges.append(edge)
+        return True
+
+    def remove(self, edge):
+        i = self.positions.pop(edge, None)
+        if i is None:
+            return False
+        last = self.edges.pop()
+        if last != edge:
+            self.edges[i] = last
+            self.positions[last] = i
+        return True
+
+    def apply(self, change):
+        """Add and remove edges.
+
+        :param change: ``(added, removed)`` iterables of edges
+        :return: The change that undoes this one.
+        """
+        added, removed = change
+        added = [edge for edge in added if self.add(edge)]
+        removed = [edge for edge in removed if self.remove(edge)]
+        return removed, added
+
+
+class CutEdgeIndex:
+    """The cut edges of one partition, as returned by :func:`cut_edge_index`."""
+    __slots__ = ("_version",)
+
+    def __init__(self, version):
+        self._version = version
+
+    def __len__(self):
+        return len(self._version.store.edges)
+
+    def __iter__(self):
+        return iter(list(self._version.store.edges))
+
+    def __contains__(self, edge):
+        return edge in self._version.store.positions
+
+    def choice(self, rng=random):
+        """A uniformly random cut edge.
+
+        :param rng: Random number generator with a ``randrange`` method
+        """
+        edges = self._version.store.edges
+        return edges[rng.randrange(len(edges))]
+
+
+def sorted_edge(u, v):
+    """The edge ``(u, v)`` in the orientation gerrychain's cut_edges uses."""
+    return tuple(sorted((u, v)))
+
+
+def cut_edge_index(partition):
+    """Updater returning the :class:`CutEdgeIndex` of ``partition``.
+
+    Must be registered under the name ``"cut_edge_index"``.
+    """
+    parent = partition.parent
+    if parent is None:
+        assignment = partition.assignment
+        store = IndexedEdgeSet(
+            sorted_edge(u, v) for u, v in partition.graph.edges
+            if assignment[u] != assignment[v]
+        )
+        return CutEdgeIndex(Version(store))
+
+    assignment = partition.assignment
+    graph = partition.graph
+    added, removed = [], []
+    for node in changed_nodes(partition):
+        part = assignment[node]
+        for neighbor in graph.neighbors(node):
+            if assignment[neighbor] != part:
+                added.append(sorted_edge(node, neighbor))
+            else:
+                removed.append(sorted_edge(node, neighbor))
+
+    version = parent["cut_edge_index"]._version
+    return CutEdgeIndex(version.derive((added, removed)))
+
+
+def random_cut_edge(partition, rng=random):
+    """A uniformly random cut edge of ``partition``, in O(1) when the
+    :func:`cut_edge_index` updater is registered.
+    """
+    if "cut_edge_index" in partition.updaters:
+        return partition["cut_edge_index"].choice(rng)
+    return rng.choice(tuple(partition["cut_edges"]))
@@ -13,6 +13,7 @@ from gerrychain import (GeographicPartition, Partition, Graph,
     MarkovChain_xtended_ltpolish_fracs_dem, proposals, updaters, constraints, accept,
     Election)
 from gerrychain.proposals import recom
+from gerrychain.cut_edge_index import cut_edge_index
 from gerrychain.constraints import deviation_from_ideal
 from functools import partial
 import pandas
@@ -24,12 +25,16 @@ from multiprocessing import freeze_support, get_context, Value, Manager
 import time
 from pop_constraint import pop_constraint
 import conditional_dump as cd
-from calc_fracwins_comp import calc_fracwins_comp
+from metrics_cache import fracwins
+from seed_plans import seed_assignment
+from graph_schema import resolve_schema
+from county_pieces import county_pieces
+from population_spread import population_spread
 
 # Multichian Run
 def multi_chain(i1, graph, state, popkey, poptol, markovchainlength,
     electionvol, my_apportionment, best_win, geotag, ns, time_interval, 
-    maxsplits, max_pop_deviation, seat_min, my_electionproxy):
+    maxsplits, max_pop_deviation, seat_min, my_electionproxy, seed_file):
     hi_wins = 37
 
     # Limit the total number of plans to markovchainlength
@@ -45,12 +50,17 @@ def multi_chain(i1, graph, state, popkey, poptol, markovchainlength,
 
             # Updaters
             elections, composite = get_elections(state)
-            my_updaters = {"population": updaters.Tally(popkey, alias = "population")}
+            my_updaters = {"population": updaters.Tally(popkey, alias = "population"),
+                "cut_edge_index": cut_edge_index,
+                "population_spread": population_spread,
+                "county_pieces": county_pieces}
             election_updaters = {election.name: election for election in elections}
             my_updaters.update(election_updaters)
 
             # Create Initial Partition
-            initial_partition = GeographicPartition(graph, assignment = my_apportionment,
+            initial_partition = GeographicPartition(graph,
+                assignment = seed_assignment(seed_file, i1, my_apportionment,
+                    graph),
                 updaters = my_updaters)
 
             # Compactness and Contiguity Constraints
@@ -75,7 +85,7 @@ def multi_chain(i1, graph, state, popkey, poptol, markovchainlength,
             seat_min = seat_min, election_composite = composite)
 
         # Set the best population deviation to the initial value
-        best_win_i1 = calc_fracwins_comp(initial_partition, composite, 
+        best_win_i1 = fracwins(initial_partition, composite, 
             electionvol)
 
         # Set the next time that the processor will check other's progress.
@@ -91,7 +101,7 @@ def multi_chain(i1, graph, state, popkey, poptol, markovchainlength,
                 # Create a file of the plan if the plan reduces population deviation
                 if part.good == -1:
 
-                    rsw_tmp = calc_fracwins_comp(part.state, composite, 
+                    rsw_tmp = fracwins(part.state, composite, 
                         electionvol)
 
                     if rsw_tmp > best_win.value:
@@ -128,10 +138,14 @@ if __name__ == '__main__':
     df = geopandas.read_file(my_electiondatafile) 
     exec(open("splice_assignment_fn.py").read())
     graph = graph_PA
+    resolve_schema(graph, population = popkey, geoid = geotag)
 
     # Updaters
     elections, composite = get_elections(state)
-    my_updaters = {"population": updaters.Tally(popkey, alias = "population")}
+    my_updaters = {"population": updaters.Tally(popkey, alias = "population"),
+        "cut_edge_index": cut_edge_index,
+        "population_spread": population_spread,
+        "county_pieces": county_pieces}
     election_updaters = {election.name: election for election in elections}
     my_updaters.update(election_updaters)
 
@@ -141,7 +155,7 @@ if __name__ == '__main__':
 
     # Value in shared memory
     manager = Manager()
-    best_win = manager.Value('d', calc_fracwins_comp(initial_partition, 
+    best_win = manager.Value('d', fracwins(initial_partition, 
         composite, electionvol))
 
     ns = manager.Namespace()
@@ -153,5 +167,5 @@ if __name__ == '__main__':
 
     updated_vals = p.starmap(multi_chain, [(i1, graph, state, popkey, poptol, 
         markovchainlength, electionvol, my_apportionment, best_win, geotag, ns, 
-        time_interval, maxsplits, max_pop_deviation, seat_min, my_electionproxy) 
+        time_interval, maxsplits, max_pop_deviation, seat_min, my_electionproxy, seed_file) 
         for i1 in range(poolsize)])
\ No newline at end of file
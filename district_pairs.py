@@ -0,0 +1,297 @@
+"""
+Boundary edges between each pair of adjacent districts.
+
+The :func:`district_pair_edges` updater keeps, for every unordered pair of
+districts that share a boundary, the edges between them in an
+:class:`~gerrychain.cut_edge_index.IndexedEdgeSet`. It is updated from the
+nodes each step actually moves and shared between a partition and its
+proposals through :class:`~gerrychain.versioned.Version`, so finding the
+boundary of a pair, its length, or a random edge on it takes O(1) instead of a
+scan over every edge of the graph.
+
+The :func:`district_adjacency` updater builds on it to keep every adjacent
+pair in a heap ordered by the population gap between the two districts, so the
+pair with the largest gap comes out in O(log k) after each step.
+
+Register them as ``"district_pair_edges": district_pair_edges`` and
+``"district_adjacency": district_adjacency`` in the updaters of the
+partition; the latter also needs the ``"population"`` updater.
+
+Like tree.py, this file must be placed in the gerrychain directory.
+"""
+
+import heapq
+
+from .cut_edge_index import IndexedEdgeSet, sorted_edge
+from .random import random
+from .versioned import Version, changed_nodes
+
+
+def _pair(a, b):
+    return (a, b) if a <= b else (b, a)
+
+
+class PairEdgeSets:
+    """Boundary edges grouped by the unordered pair of districts they join.
+
+    :ivar dict pairs: Maps each ``(a, b)`` pair with ``a < b`` to the
+        :class:`~gerrychain.cut_edge_index.IndexedEdgeSet` of its edges.
+    :ivar dict neighbors: Maps each district to the set of districts it is
+        adjacent to.
+    """
+    __slots__ = ("pairs", "neighbors")
+
+    def __init__(self):
+        self.pairs = {}
+        self.neighbors = {}
+
+    def add(self, pair, edge):
+        edges = self.pairs.get(pair)
+        if edges is None:
+            edges = self.pairs[pair] = IndexedEdgeSet()
+            a, b = pair
+            self.neighbors.setdefault(a, set()).add(b)
+            self.neighbors.setdefault(b, set()).add(a)
+        return edges.add(edge)
+
+    def remove(self, pair, edge):
+        edges = self.pairs.get(pair)
+        if edges is None or not edges.remove(edge):
+            return False
+        if not edges.edges:
+            del self.pairs[pair]
+            a, b = pair
+            self.neighbors[a].discard(b)
+            self.neighbors[b].discard(a)
+        return True
+
+    def apply(self, change):
+        """Add and remove boundary edges.
+
+        :param change: ``(added, removed)`` iterables of ``(pair, edge)``
+        :return: The change that undoes this one.
+        """
+        added, removed = change
+        removed = [item for item in removed if self.remove(*item)]
+        added = [item for item in added if self.add(*item)]
+        return removed, added
+
+
+class DistrictPairIndex:
+    """The district pair boundaries of one partition, as returned by
+    :func:`district_pair_edges`.
+    """
+    __slots__ = ("_version",)
+
+    def __init__(self, version):
+        self._version = version
+
+    def __iter__(self):
+        """The adjacent pairs ``(a, b)``, with ``a < b``."""
+        return iter(list(self._version.store.pairs))
+
+    def __len__(self):
+        return len(self._version.store.pairs)
+
+    def __contains__(self, pair):
+        return _pair(*pair) in self._version.store.pairs
+
+    def count(self, a, b):
+        """Number of edges between districts ``a`` and ``b``."""
+        edges = self._version.store.pairs.get(_pair(a, b))
+        return 0 if edges is None else len(edges.edges)
+
+    def neighbors(self, district):
+        """The districts adjacent to ``district``."""
+        return set(self._version.store.neighbors.get(district, ()))
+
+    def edge(self, a, b):
+        """An edge between districts ``a`` and ``b``, or None if they are not
+        adjacent.
+        """
+        edges = self._version.store.pairs.get(_pair(a, b))
+        return None if edges is None else edges.edges[0]
+
+    def edges(self, a, b):
+        """The edges between districts ``a`` and ``b``."""
+        edges = self._version.store.pairs.get(_pair(a, b))
+        return set() if edges is None else set(edges.edges)
+
+    def choice(self, a, b, rng=random):
+        """A uniformly random edge between districts ``a`` and ``b``, or None
+        if they are not adjacent.
+        """
+        edges = self._version.store.pairs.get(_pair(a, b))
+        if edges is None:
+            return None
+        return edges.edges[rng.randrange(len(edges.edges))]
+
+
+def district_pair_edges(partition):
+    """Updater returning the :class:`DistrictPairIndex` of ``partition``.
+
+    Must be registered under the name ``"district_pair_edges"``.
+    """
+    assignment = partition.assignment
+    parent = partition.parent
+    if parent is None:
+        store = PairEdgeSets()
+        for u, v in partition.graph.edges:
+            if assignment[u] != assignment[v]:
+                store.add(_pair(assignment[u], assignment[v]), sorted_edge(u, v))
+        return DistrictPairIndex(Version(store))
+
+    old = parent.assignment
+    graph = partition.graph
+    added, removed = [], []
+    seen = set()
+    for node in changed_nodes(partition):
+        for neighbor in graph.neighbors(node):
+            edge = sorted_edge(node, neighbor)
+            if edge in seen:
+                continue
+            seen.add(edge)
+            if old[node] != old[neighbor]:
+                removed.append((_pair(old[node], old[neighbor]), edge))
+            if assignment[node] != assignment[neighbor]:
+                added.append((_pair(assignment[node], assignment[neighbor]), edge))
+
+    version = parent["district_pair_edges"]._version
+    return DistrictPairIndex(version.derive((added, removed)))
+
+
+class PairGapHeap:
+    """Population gap of each adjacent district pair, in a max-heap.
+
+    Entries are never removed from the heap when a gap changes; a new entry is
+    pushed instead and stale ones are dropped when they reach the top.
+
+    :ivar dict gaps: Maps each adjacent ``(a, b)`` pair to its population gap.
+    :ivar dict neighbors: Maps each district to the set of districts it is
+        adjacent to.
+    """
+    __slots__ = ("gaps", "neighbors", "_heap")
+
+    def __init__(self, gaps):
+        self.gaps = dict(gaps)
+        self.neighbors = {}
+        for a, b in self.gaps:
+            self.neighbors.setdefault(a, set()).add(b)
+            self.neighbors.setdefault(b, set()).add(a)
+        self._rebuild()
+
+    def _rebuild(self):
+        self._heap = [(-gap, pair) for pair, gap in self.gaps.items()]
+        heapq.heapify(self._heap)
+
+    def apply(self, change):
+        """Set the gaps of some pairs.
+
+        :param change: Dict mapping pairs to their new gap, or to None for
+            pairs that are no longer adjacent
+        :return: The change that undoes this one.
+        """
+        inverse = {}
+        for pair, gap in change.items():
+            old = self.gaps.get(pair)
+            if old == gap:
+                continue
+            inverse[pair] = old
+            a, b = pair
+            if gap is None:
+                del self.gaps[pair]
+                self.neighbors[a].discard(b)
+                self.neighbors[b].discard(a)
+                continue
+            if old is None:
+                self.neighbors.setdefault(a, set()).add(b)
+                self.neighbors.setdefault(b, set()).add(a)
+            self.gaps[pair] = gap
+            heapq.heappush(self._heap, (-gap, pair))
+
+        # Keep stale entries from piling up
+        if len(self._heap) > 2 * len(self.gaps) + 16:
+            self._rebuild()
+        return inverse
+
+    def top(self, n):
+        """The ``n`` pairs with the largest gaps, largest first."""
+        heap, gaps = self._heap, self.gaps
+        found, seen = [], set()
+        while heap and len(found) < n:
+            entry = heapq.heappop(heap)
+            if gaps.get(entry[1]) == -entry[0] and entry[1] not in seen:
+                found.append(entry)
+                seen.add(entry[1])
+        for entry in found:
+            heapq.heappush(heap, entry)
+        return [pair for _, pair in found]
+
+
+class DistrictAdjacency:
+    """Adjacent district pairs of one partition ordered by population gap, as
+    returned by :func:`district_adjacency`.
+    """
+    __slots__ = ("_version", "_population")
+
+    def __init__(self, version, population):
+        self._version = version
+        self._population = population
+
+    def __len__(self):
+        return len(self._version.store.gaps)
+
+    def __iter__(self):
+        """The adjacent pairs ``(a, b)``, with ``a < b``."""
+        return iter(list(self._version.store.gaps))
+
+    def gap(self, a, b):
+        """Population gap between adjacent districts ``a`` and ``b``."""
+        return self._version.store.gaps[_pair(a, b)]
+
+    def populations(self, a, b):
+        """Populations of districts ``a`` and ``b``."""
+        return self._population[a], self._population[b]
+
+    def max_gap_pair(self):
+        """The adjacent pair with the largest population gap."""
+        return self._version.store.top(1)[0]
+
+    def top_pairs(self, n):
+        """The ``n`` adjacent pairs with the largest population gaps, largest
+        first.
+        """
+        return self._version.store.top(n)
+
+
+def _gap(population, pair):
+    return abs(abs(population[pair[1]]) - abs(population[pair[0]]))
+
+
+def district_adjacency(partition):
+    """Updater returning the :class:`DistrictAdjacency` of ``partition``.
+
+    Must be registered under the name ``"district_adjacency"``, together with
+    :func:`district_pair_edges` and a ``"population"`` tally.
+    """
+    population = partition["population"]
+    pairs = partition["district_pair_edges"]
+    parent = partition.parent
+    if parent is None:
+        store = PairGapHeap((pair, _gap(population, pair)) for pair in pairs)
+        return DistrictAdjacency(Version(store), population)
+
+    # Only pairs touching a district that gained or lost nodes can change
+    version = parent["district_adjacency"]._version
+    old_neighbors = version.store.neighbors
+    districts = {part for move in changed_nodes(partition).values() for part in move}
+    change = {}
+    for district in districts:
+        for other in old_neighbors.get(district, ()):
+            change[_pair(district, other)] = None
+    for district in districts:
+        for other in pairs.neighbors(district):
+            pair = _pair(district, other)
+            change[pair] = _gap(population, pair)
+
+    return DistrictAdjacency(version.derive(change), population)
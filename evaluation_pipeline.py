@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Cheap-first evaluation of the proposals of a chain. A chain declares the
+metrics it needs as functions of the proposed plan, which are only computed
+the first time something asks for them, and its acceptance criteria as checks
+with a cost hint. The checks run with the stage objective first and then from
+the cheapest to the most expensive, stopping at the first one that fails, so a
+proposal that does not improve the objective never pays for the metrics that
+only the later checks use. Counters of the checks run, failed and skipped,
+and of the metrics computed, show how much work was skipped.
+'''
+
+from collections import Counter, namedtuple
+
+# Rough cost of a check, to order them
+CHEAP = 1
+MODERATE = 10
+EXPENSIVE = 100
+
+# A criterion of a chain. predicate takes the Metrics of the proposal and
+# returns whether it passes. The objective of the stage is checked before
+# everything else.
+Check = namedtuple("Check", ["name", "predicate", "cost", "objective"])
+Check.__new__.__defaults__ = (CHEAP, False)
+
+# Metrics of the current proposal, each computed on first use
+class Metrics:
+
+    def __init__(self, functions):
+        self.functions = functions
+        self.partition = None
+        self.values = {}
+        self.computed = Counter()
+
+    # Start on a new proposal
+    def reset(self, partition):
+        self.partition = partition
+        self.values = {}
+
+    def __getitem__(self, name):
+        if name not in self.values:
+            self.values[name] = self.functions[name](self.partition)
+            self.computed[name] += 1
+        return self.values[name]
+
+# Ordered checks of a chain, run until one fails
+class Pipeline:
+
+    def __init__(self, checks):
+        self.checks = sorted(checks,
+            key = lambda check: (not check.objective, check.cost))
+        self.steps = 0
+        self.run = Counter()
+        self.failed = Counter()
+        self.skipped = Counter()
+
+    # Whether the proposal whose metrics are given passes every check
+    def __call__(self, metrics):
+        self.steps += 1
+        for i, check in enumerate(self.checks):
+            self.run[check.name] += 1
+            if not check.predicate(metrics):
+                self.failed[check.name] += 1
+                for later in self.checks[i + 1:]:
+                    self.skipped[later.name] += 1
+                return False
+        return True
@@ -10,60 +10,27 @@ Program by Charlie Murphy
 '''
 
 from gerrychain.constraints import contiguous
-from gerrychain.updaters import county_splits
-import networkx as nx
+import numpy as np
 import random
+from itertools import chain
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+from gerrychain.graph_index import node_index
+from graph_schema import get_field
+from county_pieces import get_county_pieces
 
 # Get name of field with county information
 def get_county_field(partition):
-
-    fieldlist = partition.graph.nodes[0].keys()
-    
-    if 'COUNTYFP10' in fieldlist:
-        county_field = 'COUNTYFP10'
-    elif 'COUNTYFP20' in fieldlist:
-        county_field = 'COUNTYFP20'
-    elif 'CTYNAME' in fieldlist:
-        county_field = 'CTYNAME'
-    elif 'COUNTYFIPS' in fieldlist:
-        county_field = 'COUNTYFIPS'
-    elif 'COUNTYFP' in fieldlist:
-        county_field = 'COUNTYFP'
-    elif 'cnty_nm' in fieldlist:
-        county_field = 'cnty_nm'
-    elif 'county_nam' in fieldlist:
-        county_field = 'county_nam'
-    elif 'FIPS2' in fieldlist:
-        county_field = 'FIPS2'
-    elif 'COUNTY' in fieldlist:
-        county_field = 'COUNTY'
-    elif 'County' in fieldlist:
-        county_field = 'County'   
-    elif 'CNTY_NAME' in fieldlist:
-        county_field = 'CNTY_NAME'
-    else:
-        print("no county ID info in shapefile")
-    
-    return county_field
+    return get_field(partition.graph, "county")
 
 # This function takes in a partition and returns the number of fracks.
 # A district is considered fracked if it has at least two 
 # discontinuous portions within a county.
 def fracking(partition):
 
-    # Get column with counties
-    county_field = get_county_field(partition)
-
-    # Get a dictionary with the number of county splits
-    county_splits_dict = county_splits(partition, county_field)(partition)
-
-    # Get the number of pieces if the county was not fracked
-    expected_pieces = 0
-    for x in county_splits_dict:
-        expected_pieces += len(county_splits_dict[x].contains)
-
     # Get the number of pieces that actually exist in the redistricting plan
-    pieces = num_pieces(partition, county_field)
+    # and the number of pieces if the county was not fracked
+    pieces, expected_pieces, split_count, merged = county_counts(partition)
 
     return pieces - expected_pieces
 
@@ -72,51 +39,35 @@ def fracking(partition):
 # through the dictionary of county splits twice
 def fracking_total_splits(partition):
 
-    # Get column with counties
-    county_field = get_county_field(partition)
-
-    # Get a dictionary with the number of county splits
-    county_splits_dict = county_splits(partition, county_field)(partition)
-
-    # Get the number of pieces if the county was not fracked and the total
-    # number of county splits
-    expected_pieces = split_count = 0
-    for x in county_splits_dict:
-        districts = len(county_splits_dict[x].contains)
-        expected_pieces += districts
-        split_count += districts - 1
-
-    # Get the number of pieces that actually exist in the redistricting plan
-    pieces = num_pieces(partition, county_field)
+    # Get the number of pieces, the number of pieces if the county was not
+    # fracked and the total number of county splits
+    pieces, expected_pieces, split_count, merged = county_counts(partition)
 
     return pieces - expected_pieces, split_count
 
 # This version is for use in chain_xtended_pop_balance and chain_xtended_fracking
 def fracking_merge(partition, d1, d2):
 
-    # Get column with counties
-    county_field = get_county_field(partition)
+    # Also count the number of counties split between both districts
+    pieces, expected_pieces, split_count, merged_district_count = \
+        county_counts(partition, d1, d2)
 
-    # Get a dictionary with the number of county splits
-    county_splits_dict = county_splits(partition, county_field)(partition)
+    return pieces - expected_pieces, merged_district_count, split_count
 
-    # Get the number of pieces if the county was not fracked and the total
-    # number of county splits
-    expected_pieces = split_count = merged_district_count = 0
-    for x in county_splits_dict:
-        districts = county_splits_dict[x].contains
-        district_num = len(districts)
-        expected_pieces += district_num
-        split_count += district_num - 1
+# Get the number of pieces, the number of pieces if no county was fracked, the
+# number of county splits and the number of counties split between d1 and d2.
+# These are read from the county_pieces updater if it is registered and counted
+# in one pass over the graph otherwise.
+def county_counts(partition, d1 = None, d2 = None):
 
-        # Count number of counties split between both districts
-        if d1 in districts and d2 in districts:
-            merged_district_count += 1
+    if "county_pieces" in partition.updaters:
+        counts = partition["county_pieces"]
+        merged_district_count = 0
+        if d1 is not None and d2 is not None:
+            merged_district_count = counts.shared(d1, d2)
+        return counts.total, counts.expected, counts.splits, merged_district_count
 
-    # Get the number of pieces that actually exist in the redistricting plan
-    pieces = num_pieces(partition, county_field)
-
-    return pieces - expected_pieces, merged_district_count, split_count
+    return count_pieces(partition, get_county_field(partition), d1, d2)
 
 # Split state by both county and district boundaries
 def get_intersections(partition, col_id):
@@ -137,96 +88,131 @@ def get_intersections(partition, col_id):
 # cutting the graph by both county and district boundaries.
 # Adapted from locality_split_scores.py
 def num_pieces(partition, col_id):
-    
-    locality_intersections = get_intersections(partition, col_id)
 
-    pieces = 0
-    for locality in locality_intersections:
-        for d in locality_intersections[locality]:
-            subgraph = partition.graph.subgraph(    
-                [x for x in partition.parts[d]
-                    if partition.graph.nodes[x][col_id] == locality]
-            )
-
-            pieces += nx.number_connected_components(subgraph)
-
-    return pieces
+    # The county_pieces updater keeps this number up to date between steps
+    if ("county_pieces" in partition.updaters and
+        col_id == get_county_field(partition)):
+        return partition["county_pieces"].total
+    
+    return count_pieces(partition, col_id)[0]
+
+# Count the pieces of the plan with a single connected components call: keep
+# only the edges whose endpoints share both county and district, so each
+# component of what is left is one piece. Returns the number of pieces, the
+# number of (county, district) intersections (the pieces if nothing was
+# fracked), the number of county splits and the number of counties split
+# between d1 and d2.
+def count_pieces(partition, col_id, d1 = None, d2 = None):
+
+    graph = partition.graph
+    index = node_index(graph)
+
+    # Use the precomputed edge list when the partition covers the whole graph
+    if len(graph) == len(index):
+        nodes = index.nodes
+        ids = np.arange(len(nodes))
+        indptr, indices = index.indptr, index.indices
+    else:
+        nodes = list(graph.nodes)
+        ids = index.ids_of(nodes)
+        indptr, indices = index.induced(ids)
+
+    counties = index.codes(col_id)[1][ids]
+    labels, districts = np.unique(
+        np.asarray([partition.assignment[node] for node in nodes]),
+        return_inverse = True)
+
+    rows = np.repeat(np.arange(len(nodes)), np.diff(indptr))
+    keep = ((counties[rows] == counties[indices]) &
+        (districts[rows] == districts[indices]))
+    same_piece = csr_matrix((np.ones(keep.sum(), dtype = np.int8),
+        (rows[keep], indices[keep])), shape = (len(nodes), len(nodes)))
+    pieces = connected_components(same_piece, directed = False)[0]
+
+    # Each distinct (county, district) pair is one expected piece
+    pairs = np.unique(counties * len(labels) + districts)
+    pair_counties, pair_districts = np.divmod(pairs, len(labels))
+    split_count = len(pairs) - len(np.unique(pair_counties))
+
+    merged_district_count = 0
+    if d1 is not None and d2 is not None:
+        code = {label: i for i, label in enumerate(labels.tolist())}
+        if d1 in code and d2 in code:
+            merged_district_count = len(np.intersect1d(
+                pair_counties[pair_districts == code[d1]],
+                pair_counties[pair_districts == code[d2]]))
+
+    return pieces, len(pairs), split_count, merged_district_count
 
 # Return the district number of 2 districts that share a county where at least
-# one of them is fracked
-def get_fracks(partition, county_field, locality_intersections):
-
-    # Get a dictionary with the districts within each county
-    county_splits_dict = county_splits(partition, county_field)(partition) 
-
-    # Get the subgraph for each county
-    for locality in locality_intersections:
-        for d in locality_intersections[locality]:
-            subgraph = partition.graph.subgraph(    
-                [x for x in partition.parts[d]
-                    if partition.graph.nodes[x][county_field] == locality]
-            )
-
-            # If the county is fracked, return districts in that county
-            if nx.number_connected_components(subgraph) != 1:
-                for node in subgraph:
-                    county = partition.graph.nodes[node][county_field]
-                    districts = county_splits_dict[county].contains
-
-                    # If there are only two districts return those districts
-                    if len(districts) == 2:
-                        return tuple(districts), county
-
-                    # Otherwise, find a district that borders frack
-                    d1 = partition.assignment[node]
-                    while True:
-                        edge = random.choice(tuple(partition["cut_edges"]))
-                        edge_districts = (partition.assignment[edge[0]], 
-                            partition.assignment[edge[1]])
-                        edge_counties = (partition.graph.nodes[edge[0]][county_field], 
-                            partition.graph.nodes[edge[1]][county_field])
-                        if (d1 in edge_districts 
-                            and edge_counties == (county, county)):
-                            return edge_districts, county
+# one of them is fracked. The fracked pieces come from the registry of the
+# county_pieces updater; priority picks which one to fix first (None for any,
+# "smallest" for the one with the smallest disconnected fragment, or "random").
+# locality_intersections is no longer needed and only kept for old callers.
+def get_fracks(partition, county_field, locality_intersections = None,
+    priority = None):
+
+    registry = get_county_pieces(partition, county_field)
+
+    key = registry.next_frack(priority, random)
+    if key is None:
+        return None
+
+    # Only look at the other fracked pieces if this one borders no other
+    # district within its county
+    others = sorted(frack[:2] for frack in registry.fracks())
+    for county, d1 in chain([key], others):
+        districts = registry.districts(county)
+
+        # If there are only two districts return those districts (sorted, so
+        # runs with the same seed do not depend on set order)
+        if len(districts) == 2:
+            return tuple(sorted(districts)), county
+
+        # Otherwise, pick a cut edge between the fracked district and an
+        # adjacent district in the county (as likely as any other such edge)
+        edges = registry.boundary_edges(county, d1)
+        if edges:
+            edge = random.choice(edges)
+            return (partition.assignment[edge[0]],
+                partition.assignment[edge[1]]), county
+
+# Raised when a plan has no frack that a proposal can reduce
+class NoFrackError(ValueError):
+    pass
 
 # Return the nodes of two districts in a county where one of them is fracked and
 # the population of those districts in that county
-def get_fracked_subgraph(partition):
-
-    # Get the column with the county information in it
-    county_field = get_county_field(partition)
-
-    pop_field = 'POP20'
+def get_fracked_subgraph(partition, priority = None):
 
-    # Get the pieces splitting by both district and county boundaries
-    locality_intersections = get_intersections(partition, county_field)
+    # Get the columns with the county and population information in them
+    county_field = get_field(partition.graph, "county")
+    pop_field = get_field(partition.graph, "population")
 
     # Get fracked districts and county
-    districts, county = get_fracks(partition, county_field, locality_intersections)
-
-    # Get the subgraph
-    fracked_subgraph = []
-    for locality in locality_intersections:
-        for d in locality_intersections[locality]:
-            subgraph = partition.graph.subgraph(    
-                [x for x in partition.parts[d]
-                    if partition.graph.nodes[x][county_field] == locality]
-            )
-            
-            # Add nodes if they are in the fracked districts and county
-            for node in subgraph:
-                if (partition.assignment[node] in districts and 
-                    subgraph.nodes[node][county_field] == county):
-                    fracked_subgraph.append(subgraph.nodes)
-                break
+    fracks = get_fracks(partition, county_field, priority = priority)
+    if fracks is None:
+        raise NoFrackError("no fracked county can be reduced: either nothing "
+            "is fracked or no fracked piece borders another district in its "
+            "county")
+    districts, county = fracks
+
+    # Get the nodes of each fracked district within the fracked county
+    fracked_subgraph = [get_piece(partition, county_field, county, d)
+        for d in districts]
 
     # Get population of each district within the fracked county
-    populations = []
-    for subgraph in fracked_subgraph:
-        current_pop = 0
-        for node in subgraph:
-            current_pop += partition.graph.nodes[node][pop_field]
-        populations.append(current_pop)
+    index = node_index(partition.graph)
+    populations = [index.total(pop_field, nodes) for nodes in fracked_subgraph]
 
     return districts, partition.graph.subgraph(
-        fracked_subgraph[0] | fracked_subgraph[1]), populations
\ No newline at end of file
+        fracked_subgraph[0] | fracked_subgraph[1]), populations
+
+# Get the nodes of district within county, from the county_pieces updater if it
+# is registered
+def get_piece(partition, county_field, county, district):
+    if "county_pieces" in partition.updaters:
+        return partition["county_pieces"].nodes(county, district)
+
+    return set(x for x in partition.parts[district]
+        if partition.graph.nodes[x][county_field] == county)
\ No newline at end of file
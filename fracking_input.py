@@ -10,6 +10,9 @@ Program by Charlie Murphy
 # File Names
 my_electiondatafile = r'C:\Users\charl\Box\Internships\Gerry Chain\States\Ohio\OH 2018 & 2020 Elections\OH_2020_censusvtds.shp'
 ex_dist_name = 'fracking_test.csv'
+# Seed plans built by seed_plans.py, one per processor. None starts every
+# processor from ex_dist_name
+seed_file = None
 
 # State Attributes
 state = 'OH'
@@ -23,6 +26,9 @@ poptol = 0.01
 win_margin = 0.5
 electionvol = 0.06
 boundary_margin = 0.5
+# Order in which fracks are fixed: 'smallest' for the frack with the smallest
+# disconnected fragment first, 'random', or None for any
+frack_priority = 'smallest'
 max_pop_deviation = 0.0075
 
 # Pool Attributes
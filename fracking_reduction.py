@@ -12,6 +12,8 @@ from gerrychain import (GeographicPartition, Partition, Graph,
     MarkovChain_xtended_fracking, proposals, updaters, constraints, accept,
     Election)
 from gerrychain.proposals import recom_frack
+from gerrychain.tree import bipartition_tree_speculative
+from gerrychain.cut_edge_index import cut_edge_index
 from functools import partial
 import pandas
 import geopandas
@@ -19,16 +21,23 @@ from get_electioninfo import get_elections
 import district_list as dl
 from fracking import get_fracks
 from pop_constraint import pop_constraint, pop_deviation
+from graph_schema import resolve_schema
+from county_pieces import county_pieces
+from population_spread import population_spread
 
 # Load files and combine into a single dataframe
 exec(open("./input_templates/fracking_input.py").read())
 df = geopandas.read_file(my_electiondatafile) 
 exec(open("splice_assignment_fn.py").read())
 graph = graph_PA
+resolve_schema(graph, population = popkey, geoid = geotag)
 
 # Updaters
 elections, composite = get_elections(state)
-my_updaters = {"population": updaters.Tally(popkey, alias = "population")}
+my_updaters = {"population": updaters.Tally(popkey, alias = "population"),
+    "cut_edge_index": cut_edge_index,
+    "population_spread": population_spread,
+    "county_pieces": county_pieces}
 election_updaters = {election.name: election for election in elections}
 my_updaters.update(election_updaters)
 
@@ -43,16 +52,19 @@ contiguous_parts = lambda p: constraints.contiguous(p)
 my_constraints = [contiguous_parts, compactness_bound,
     pop_constraint(max_pop_deviation)]
 
-# Create a Proposal
+# Create a Proposal. A fracked county is split within the populations its
+# districts already have there, which few spanning trees allow, so several
+# trees are drawn and scanned at once
 proposal = partial(recom_frack, pop_col = popkey, epsilon = poptol, 
-    node_repeats = 2)
+    node_repeats = 2, method = bipartition_tree_speculative)
 
 # Run Markov Chain
 chain = MarkovChain_xtended_fracking(proposal = proposal,
     constraints = my_constraints, accept = accept.always_accept,
     initial_state = initial_partition, total_steps = markovchainlength,
     election_composite = composite, win_margin = win_margin,
-    win_volatility = electionvol, boundary_margin = boundary_margin)
+    win_volatility = electionvol, boundary_margin = boundary_margin,
+    frack_priority = frack_priority)
 
 # Return files of valid plans
 for part in chain.with_progress_bar():
@@ -12,6 +12,7 @@ from gerrychain import (GeographicPartition, Partition, Graph,
     MarkovChain_xtended_fracking, proposals, updaters, constraints, accept,
     Election)
 from gerrychain.proposals import recom_frack
+from gerrychain.cut_edge_index import cut_edge_index
 from gerrychain.constraints import deviation_from_ideal
 from functools import partial
 import pandas
@@ -24,11 +25,15 @@ from multiprocessing import freeze_support, get_context, Value, Manager
 import time
 from pop_constraint import pop_constraint
 from fracking import fracking
+from seed_plans import seed_assignment
+from graph_schema import resolve_schema
+from county_pieces import county_pieces
+from population_spread import population_spread
 
 # Multichian Run
 def multi_chain(i1, graph, state, popkey, poptol, markovchainlength, win_margin,
     electionvol, boundary_margin, my_apportionment, best, geotag, ns,
-    time_interval, max_pop_deviation):
+    time_interval, max_pop_deviation, seed_file, frack_priority):
 
     # Limit the total number of plans to markovchainlength
     count = 0
@@ -43,12 +48,17 @@ def multi_chain(i1, graph, state, popkey, poptol, markovchainlength, win_margin,
 
             # Updaters
             elections, composite = get_elections(state)
-            my_updaters = {"population": updaters.Tally(popkey, alias = "population")}
+            my_updaters = {"population": updaters.Tally(popkey, alias = "population"),
+                "cut_edge_index": cut_edge_index,
+                "population_spread": population_spread,
+                "county_pieces": county_pieces}
             election_updaters = {election.name: election for election in elections}
             my_updaters.update(election_updaters)
 
             # Create Initial Partition
-            initial_partition = GeographicPartition(graph, assignment = my_apportionment,
+            initial_partition = GeographicPartition(graph,
+                assignment = seed_assignment(seed_file, i1, my_apportionment,
+                    graph),
                 updaters = my_updaters)
 
             # Constraints
@@ -69,7 +79,8 @@ def multi_chain(i1, graph, state, popkey, poptol, markovchainlength, win_margin,
             constraints = my_constraints, accept = accept.always_accept,
             initial_state = initial_partition, total_steps = markovchainlength,
             election_composite = composite, win_margin = win_margin,
-            win_volatility = electionvol, boundary_margin = boundary_margin)
+            win_volatility = electionvol, boundary_margin = boundary_margin,
+            frack_priority = frack_priority)
 
         # Set the best population deviation to the initial value
         best_i1 = fracking(initial_partition)
@@ -121,10 +132,14 @@ if __name__ == '__main__':
     df = geopandas.read_file(my_electiondatafile) 
     exec(open("splice_assignment_fn.py").read())
     graph = graph_PA
+    resolve_schema(graph, population = popkey, geoid = geotag)
 
     # Updaters
     elections, composite = get_elections(state)
-    my_updaters = {"population": updaters.Tally(popkey, alias = "population")}
+    my_updaters = {"population": updaters.Tally(popkey, alias = "population"),
+        "cut_edge_index": cut_edge_index,
+        "population_spread": population_spread,
+        "county_pieces": county_pieces}
     election_updaters = {election.name: election for election in elections}
     my_updaters.update(election_updaters)
 
@@ -146,5 +161,5 @@ if __name__ == '__main__':
 
     updated_vals = p.starmap(multi_chain, [(i1, graph, state, popkey, poptol, 
         markovchainlength, win_margin, electionvol, boundary_margin, 
-        my_apportionment, best, geotag, ns, time_interval, max_pop_deviation) 
-        for i1 in range(poolsize)])
\ No newline at end of file
+        my_apportionment, best, geotag, ns, time_interval, max_pop_deviation, seed_file,
+        frack_priority) for i1 in range(poolsize)])
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""
+Columnar index of the nodes of a graph and their attributes.
+
+The index gives every node of a graph a contiguous integer id, stores the
+adjacency as CSR arrays and loads node attributes (population, county,
+election columns, ...) as NumPy vectors on first use. It is built once per
+graph and shared by every subgraph view of that graph, so repeated lookups
+become array gathers instead of dict-of-dict lookups.
+
+The index is rebuilt whenever the nodes of the graph change (added, removed or
+relabeled). Attribute columns are snapshots taken on first use: code that
+changes node attributes of an indexed graph must call :func:`refresh_index`
+before the next lookup.
+
+Like tree.py, this file must be placed in the gerrychain directory.
+"""
+
+import weakref
+
+import networkx as nx
+import numpy as np
+
+
+class NodeIndex:
+    """Integer ids, CSR adjacency and attribute columns of a graph.
+
+    :ivar list nodes: ``nodes[i]`` is the node with id ``i``.
+    :ivar dict ids: Maps each node to its id.
+    :ivar numpy.ndarray indptr: CSR offsets of the adjacency.
+    :ivar numpy.ndarray indices: CSR neighbor ids of the adjacency.
+    """
+    __slots__ = ("nodes", "ids", "indptr", "indices", "_data", "_columns", "_codes")
+
+    def __init__(self, graph):
+        """
+        :param graph: The (root) networkx graph to index
+        """
+        self.nodes = list(graph.nodes)
+        self.ids = {node: i for i, node in enumerate(self.nodes)}
+        n = len(self.nodes)
+
+        ids = self.ids
+        edges = np.fromiter(
+            (ids[node] for edge in graph.edges for node in edge[:2]),
+            dtype=np.int64, count=2 * graph.number_of_edges()
+        ).reshape(-1, 2)
+        rows = np.concatenate((edges[:, 0], edges[:, 1]))
+        cols = np.concatenate((edges[:, 1], edges[:, 0]))
+        order = np.lexsort((cols, rows))
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=self.indptr[1:])
+        self.indices = cols[order]
+
+        # Only the node data is kept, so the index does not keep the graph alive
+        self._data = graph.nodes
+        self._columns = {}
+        self._codes = {}
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def ids_of(self, nodes):
+        """Integer ids of ``nodes``, in iteration order.
+
+        :param nodes: Iterable of nodes (or a graph or subgraph view)
+        :rtype: numpy.ndarray
+        """
+        ids = self.ids
+        return np.fromiter((ids[node] for node in nodes), dtype=np.int64)
+
+    def column(self, name):
+        """The node attribute ``name`` of every node, indexed by id.
+
+        :rtype: numpy.ndarray
+        """
+        if name not in self._columns:
+            data = self._data
+            self._columns[name] = np.asarray([data[node][name] for node in self.nodes])
+        return self._columns[name]
+
+    def codes(self, name):
+        """Integer codes for a categorical node attribute such as a county.
+
+        :return: ``(labels, codes)`` where ``labels[codes[i]]`` is the value of
+            ``name`` on the node with id ``i``.
+        """
+        if name not in self._codes:
+            labels, codes = np.unique(self.column(name), return_inverse=True)
+            self._codes[name] = (labels, codes.astype(np.int64))
+        return self._codes[name]
+
+    def total(self, name, nodes):
+        """Sum of the node attribute ``name`` over ``nodes``."""
+        return self.column(name)[self.ids_of(nodes)].sum().item()
+
+    def induced(self, ids):
+        """CSR adjacency of the subgraph induced by ``ids``.
+
+        :param ids: Array of node ids. Position ``k`` in this array becomes
+            local id ``k`` in the result.
+        :return: ``(indptr, indices)`` over local ids.
+        """
+        k = len(ids)
+        local = np.full(len(self.nodes), -1, dtype=np.int64)
+        local[ids] = np.arange(k)
+
+        starts = self.indptr[ids]
+        counts = self.indptr[ids + 1] - starts
+        rows = np.repeat(np.arange(k), counts)
+        positions = np.arange(counts.sum()) + np.repeat(starts - np.cumsum(counts) + counts, counts)
+        neighbors = local[self.indices[positions]]
+
+        keep = neighbors >= 0
+        indptr = np.zeros(k + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows[keep], minlength=k), out=indptr[1:])
+        return indptr, neighbors[keep]
+
+
+_indices = weakref.WeakKeyDictionary()
+
+
+def root_graph(graph):
+    """The graph that ``graph`` is a (possibly frozen) subgraph view of."""
+    while not isinstance(graph, nx.Graph):
+        # gerrychain's FrozenGraph wraps the networkx graph it freezes
+        graph = graph.graph
+    while hasattr(graph, "_graph"):
+        graph = graph._graph
+    return graph
+
+
+def node_index(graph):
+    """The :class:`NodeIndex` of ``graph``, built on first use and shared by
+    every subgraph view of the same graph.
+
+    :param graph: A graph, a :class:`~gerrychain.graph.FrozenGraph` or a
+        subgraph view of either
+    :rtype: NodeIndex
+    """
+    root = root_graph(graph)
+    index = _indices.get(root)
+    # Compares the labels in order, so relabeled nodes are caught even when
+    # the number of nodes is unchanged
+    if index is None or index.nodes != list(root.nodes):
+        index = _indices[root] = NodeIndex(root)
+    return index
+
+
+def refresh_index(graph):
+    """Drop the cached :class:`NodeIndex` of ``graph``, so the next
+    :func:`node_index` reloads node attributes that have been changed since.
+
+    :param graph: A graph, a :class:`~gerrychain.graph.FrozenGraph` or a
+        subgraph view of either
+    """
+    _indices.pop(root_graph(graph), None)
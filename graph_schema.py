@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Program designed to find which columns of a shapefile hold the county,
+population and GEOID of each node. The columns are detected once, from the
+first node, and kept in the graph's attributes so that the metric functions
+(and the processors the graph is sent to) all share them.
+'''
+
+from collections import namedtuple
+from gerrychain.graph_index import root_graph
+
+GraphSchema = namedtuple("GraphSchema", ["county", "population", "geoid"])
+
+# Column names tried, in order, when a column is not given explicitly
+COUNTY_FIELDS = ['COUNTYFP10', 'COUNTYFP20', 'CTYNAME', 'COUNTYFIPS', 'COUNTYFP',
+    'cnty_nm', 'county_nam', 'FIPS2', 'COUNTY', 'County', 'CNTY_NAME', 'FIPS']
+POPULATION_FIELDS = ['POP20', 'POP19', 'POP10', 'TOTPOP20', 'TOTPOP', 'TOTPOP10',
+    'TOT_POP', 'tot_pop', 'P0010001']
+GEOID_FIELDS = ['GEOID20', 'GEOID10', 'GEOID', 'GEOID19', 'geoid']
+
+class SchemaError(ValueError):
+    pass
+
+# Return the first candidate column of the graph, or None if there is none and
+# the column is not required. Every node of a shapefile has the same columns,
+# so only the first node is checked.
+def find_field(graph, candidates, kind, required = True):
+    columns = graph.nodes[next(iter(graph.nodes))] if len(graph) else {}
+    for field in candidates:
+        if field in columns:
+            return field
+    if required:
+        raise SchemaError("no " + kind + " column in shapefile, tried: " +
+            ", ".join(candidates))
+    return None
+
+# Raise a SchemaError if a node of graph lacks one of the columns of schema.
+# Detection only looks at the first node, so this catches shapefiles whose
+# other rows are missing a column before a chain trips over them.
+def check_schema(graph, schema):
+    for node, columns in graph.nodes(data = True):
+        for kind, field in schema._asdict().items():
+            if field is not None and field not in columns:
+                raise SchemaError(kind + " column " + field +
+                    " missing on node " + str(node))
+
+# Detect the county, population and GEOID columns of graph and keep them on
+# the graph. Columns given explicitly (such as popkey and geotag from the input
+# templates) are checked instead of detected. Call this once after loading the
+# graph so that a missing column is reported before any chain runs, including
+# a column that only some of the nodes lack.
+def resolve_schema(graph, county = None, population = None, geoid = None):
+    graph = root_graph(graph)
+    schema = GraphSchema(
+        find_field(graph, [county] if county else COUNTY_FIELDS, "county"),
+        find_field(graph, [population] if population else POPULATION_FIELDS,
+            "population"),
+        find_field(graph, [geoid] if geoid else GEOID_FIELDS, "GEOID"))
+    check_schema(graph, schema)
+    graph.graph["schema"] = schema
+    return schema
+
+# Columns of graph, detected on first use if resolve_schema was not called.
+# Columns that cannot be detected are None.
+def get_schema(graph):
+    graph = root_graph(graph)
+    schema = graph.graph.get("schema")
+    if schema is None:
+        schema = graph.graph["schema"] = GraphSchema(
+            find_field(graph, COUNTY_FIELDS, "county", False),
+            find_field(graph, POPULATION_FIELDS, "population", False),
+            find_field(graph, GEOID_FIELDS, "GEOID", False))
+    return schema
+
+# Name of the county, population or geoid column of graph
+def get_field(graph, kind):
+    field = getattr(get_schema(graph), kind)
+    if field is None:
+        candidates = {"county": COUNTY_FIELDS, "population": POPULATION_FIELDS,
+            "geoid": GEOID_FIELDS}[kind]
+        raise SchemaError("no " + kind + " column in shapefile, tried: " +
+            ", ".join(candidates))
+    return field
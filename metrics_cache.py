@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Cache of plan metrics kept with each partition. A metric is computed the first
+time it is asked for on a partition, with given parameters, and then reused,
+so a chain that compares every proposal against its current state scores the
+current state once, when it was proposed, rather than again on every step.
+'''
+
+from calc_fracwins_comp import calc_fracwins_comp
+
+# Hashable version of a metric parameter. Lists (such as the election
+# composite) become tuples, and anything else that cannot be hashed is keyed by
+# its identity.
+def param_key(param):
+    if isinstance(param, (list, tuple)):
+        return tuple(param_key(item) for item in param)
+    try:
+        hash(param)
+    except TypeError:
+        return ("id", id(param))
+    return param
+
+# Value of function(partition, *params), computed once per partition. The
+# values are kept in the partition's own cache, next to its updaters, under a
+# key made from name and the parameters, so they are dropped along with the
+# partition.
+def cached_metric(partition, name, function, *params):
+    key = ("metric", name, param_key(params))
+    cache = partition._cache
+    if key not in cache:
+        cache[key] = function(partition, *params)
+    return cache[key]
+
+# Fractional seats won by partition, as calculated by calc_fracwins_comp
+def fracwins(partition, composite, volatility):
+    return cached_metric(partition, "fracwins", calc_fracwins_comp, composite,
+        volatility)
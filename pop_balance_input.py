@@ -10,6 +10,9 @@ Program by Charlie Murphy
 # File Names
 my_electiondatafile = r'C:\Users\charl\Box\Internships\Gerry Chain\States\Ohio\OH 2018 & 2020 Elections\OH_2020_censusvtds.shp'
 ex_dist_name = 'OH_assignment_pop_4.918.txt'
+# Seed plans built by seed_plans.py, one per processor. None starts every
+# processor from ex_dist_name
+seed_file = None
 
 # State Attributes
 state = 'OH'
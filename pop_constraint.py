@@ -9,22 +9,39 @@ Program by Charlie Murphy
 '''
 
 from gerrychain.constraints import deviation_from_ideal
-from fracking import get_intersections, get_county_field
+from fracking import get_piece
+from gerrychain.graph_index import node_index
+from graph_schema import get_field
+from metrics_cache import cached_metric
 
-# Population Deviation
-def pop_deviation(partition):
+# Population Deviation calculated from every district
+def full_pop_deviation(partition):
     deviation = deviation_from_ideal(partition)
     key_max = max(deviation.keys(), key = (lambda k: deviation[k]))
     key_min = min(deviation.keys(), key = (lambda k: deviation[k]))
     popdev = abs(deviation[key_max] + abs(deviation[key_min]))
     return popdev
 
+# Population Deviation. It comes from the population_spread updater if it is
+# registered, and is otherwise cached on the partition, so the chain and the
+# population constraint share one calculation per partition
+def pop_deviation(partition):
+    if "population_spread" in partition.updaters:
+        return partition["population_spread"].deviation
+    return cached_metric(partition, "pop_deviation", full_pop_deviation)
+
 # Population Constraint
 def pop_constraint(max_pop_deviation):
     return lambda p: pop_deviation(p) <= max_pop_deviation
 
-# Find edge between the districts with the maximum population deviation
+# Find edge between the districts with the maximum population deviation. If the
+# district_adjacency updater is registered, the pair comes from its heap instead
+# of a scan over every cut edge
 def get_edge(partition):
+    if "district_adjacency" in partition.updaters:
+        districts = partition["district_adjacency"].max_gap_pair()
+        return partition["district_pair_edges"].edge(*districts)
+
     return max(partition["cut_edges"], key=lambda x: 
         abs(abs(partition["population"][partition.assignment[x[1]]]) - 
         abs(partition["population"][partition.assignment[x[0]]])) )
@@ -37,46 +54,26 @@ def get_districts(partition):
 # Get subgraph of counties that the districts split
 def get_pop_subgraph(partition):
 
-    # Get the name of the column with county information
-    county_field = get_county_field(partition)
-
-    pop_field = 'POP20'
-
-    # Get the pieces splitting by both district and county boundaries
-    locality_intersections = get_intersections(partition, county_field)
+    # Get the names of the columns with county and population information
+    county_field = get_field(partition.graph, "county")
+    pop_field = get_field(partition.graph, "population")
 
     # Get the districts and county with the greatest population deviation
     edge = get_edge(partition)
     districts = (partition.assignment[edge[0]], partition.assignment[edge[1]])
     county = partition.graph.nodes[edge[0]][county_field]
 
-    # Get the subgraph
-    pop_subgraph = []
-    for locality in locality_intersections:
-        for d in locality_intersections[locality]:
-            subgraph = partition.graph.subgraph(    
-                [x for x in partition.parts[d]
-                    if partition.graph.nodes[x][county_field] == locality]
-            )
-            
-            # Add nodes if they are in the districts and county
-            for node in subgraph:
-                if (partition.assignment[node] in districts and 
-                    subgraph.nodes[node][county_field] == county):
-                    pop_subgraph.append(subgraph.nodes)
-                break
+    # Get the nodes of each district within the county
+    pop_subgraph = [get_piece(partition, county_field, county, d)
+        for d in districts]
 
     # Calculate population target for each district
     pop_target = (partition["population"][districts[0]] + \
         partition["population"][districts[1]]) / 2
 
     # Get the current population of each subgrpah
-    populations = []
-    for subgraph in pop_subgraph:
-        current_pop = 0
-        for node in subgraph:
-            current_pop += partition.graph.nodes[node][pop_field]
-        populations.append(current_pop)
+    index = node_index(partition.graph)
+    populations = [index.total(pop_field, nodes) for nodes in pop_subgraph]
 
     # Find the target population for the portion of the district in each 
     # subgraph
@@ -13,6 +13,8 @@ from gerrychain import (GeographicPartition, Partition, Graph,
     MarkovChain_xtended_pop_balance,proposals, updaters, constraints, accept,
     Election)
 from gerrychain.proposals import recom_merge
+from gerrychain.cut_edge_index import cut_edge_index
+from gerrychain.district_pairs import district_pair_edges, district_adjacency
 from functools import partial
 import pandas
 import geopandas
@@ -21,6 +23,9 @@ import district_list as dl
 import random
 import os
 from multiprocessing import freeze_support, get_context
+from graph_schema import resolve_schema
+from county_pieces import county_pieces
+from population_spread import population_spread
 
 # Multichian Run
 def multi_chain(i1, graph, state, popkey, poptol, markovchainlength, win_margin,
@@ -31,7 +36,12 @@ def multi_chain(i1, graph, state, popkey, poptol, markovchainlength, win_margin,
 
     # Updaters
     elections, composite = get_elections(state)
-    my_updaters = {"population": updaters.Tally(popkey, alias = "population")}
+    my_updaters = {"population": updaters.Tally(popkey, alias = "population"),
+        "cut_edge_index": cut_edge_index,
+        "population_spread": population_spread,
+        "county_pieces": county_pieces,
+        "district_pair_edges": district_pair_edges,
+        "district_adjacency": district_adjacency}
     election_updaters = {election.name: election for election in elections}
     my_updaters.update(election_updaters)
 
@@ -79,6 +89,7 @@ if __name__ == '__main__':
     df = geopandas.read_file(my_electiondatafile) 
     exec(open("splice_assignment_fn.py").read())
     graph = graph_PA
+    resolve_schema(graph, population = popkey, geoid = geotag)
 
     # Run in parallel
     poolsize = 10
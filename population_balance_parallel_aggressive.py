@@ -13,6 +13,8 @@ from gerrychain import (GeographicPartition, Partition, Graph,
     MarkovChain_xtended_pop_balance,proposals, updaters, constraints, accept,
     Election)
 from gerrychain.proposals import recom_merge
+from gerrychain.cut_edge_index import cut_edge_index
+from gerrychain.district_pairs import district_pair_edges, district_adjacency
 from gerrychain.constraints import deviation_from_ideal
 from functools import partial
 import pandas
@@ -24,11 +26,15 @@ import os
 from multiprocessing import freeze_support, get_context, Value, Manager
 import time
 from pop_constraint import pop_deviation
+from seed_plans import seed_assignment
+from graph_schema import resolve_schema
+from county_pieces import county_pieces
+from population_spread import population_spread
 
 # Multichian Run
 def multi_chain(i1, graph, state, popkey, poptol, markovchainlength, win_margin,
     electionvol, boundary_margin, my_apportionment, best_pop, geotag, ns,
-    time_interval):
+    time_interval, seed_file):
 
     # Limit the total number of plans to markovchainlength
     count = 0
@@ -43,12 +49,19 @@ def multi_chain(i1, graph, state, popkey, poptol, markovchainlength, win_margin,
 
             # Updaters
             elections, composite = get_elections(state)
-            my_updaters = {"population": updaters.Tally(popkey, alias = "population")}
+            my_updaters = {"population": updaters.Tally(popkey, alias = "population"),
+                "cut_edge_index": cut_edge_index,
+                "population_spread": population_spread,
+                "county_pieces": county_pieces,
+                "district_pair_edges": district_pair_edges,
+                "district_adjacency": district_adjacency}
             election_updaters = {election.name: election for election in elections}
             my_updaters.update(election_updaters)
 
             # Create Initial Partition
-            initial_partition = GeographicPartition(graph, assignment = my_apportionment,
+            initial_partition = GeographicPartition(graph,
+                assignment = seed_assignment(seed_file, i1, my_apportionment,
+                    graph),
                 updaters = my_updaters)
 
             # Compactness and Contiguity Constraints
@@ -120,10 +133,16 @@ if __name__ == '__main__':
     df = geopandas.read_file(my_electiondatafile) 
     exec(open("splice_assignment_fn.py").read())
     graph = graph_PA
+    resolve_schema(graph, population = popkey, geoid = geotag)
 
     # Updaters
     elections, composite = get_elections(state)
-    my_updaters = {"population": updaters.Tally(popkey, alias = "population")}
+    my_updaters = {"population": updaters.Tally(popkey, alias = "population"),
+        "cut_edge_index": cut_edge_index,
+        "population_spread": population_spread,
+        "county_pieces": county_pieces,
+        "district_pair_edges": district_pair_edges,
+        "district_adjacency": district_adjacency}
     election_updaters = {election.name: election for election in elections}
     my_updaters.update(election_updaters)
 
@@ -145,5 +164,5 @@ if __name__ == '__main__':
 
     updated_vals = p.starmap(multi_chain, [(i1, graph, state, popkey, poptol, 
         markovchainlength, win_margin, electionvol, boundary_margin, 
-        my_apportionment, best_pop, geotag, ns, time_interval) 
+        my_apportionment, best_pop, geotag, ns, time_interval, seed_file) 
         for i1 in range(poolsize)])
\ No newline at end of file
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Updater that keeps the largest and smallest district populations of a plan in
+two heaps. A step only pushes the new populations of the districts whose nodes
+it moved, so the population deviation used by the chains and by the
+population constraint is found in O(log k) instead of a pass over every
+district, and since it is an updater it is computed once per partition and
+shared by both.
+
+Register it as "population_spread": population_spread in the updaters of the
+partition, together with the "population" tally.
+'''
+
+import heapq
+from gerrychain.versioned import Version, changed_nodes
+
+# Population of each district, with a min-heap and a max-heap of them. Entries
+# are never removed from the heaps when a population changes; a new entry is
+# pushed instead and stale ones are dropped when they reach the top.
+class PopulationHeaps:
+
+    def __init__(self, population):
+        self.population = dict(population)
+        self.total = sum(self.population.values())
+        self.rebuild()
+
+    def rebuild(self):
+        self.low = [(pop, d) for d, pop in self.population.items()]
+        self.high = [(-pop, d) for d, pop in self.population.items()]
+        heapq.heapify(self.low)
+        heapq.heapify(self.high)
+
+    # Set the population of some districts. change is a dictionary of
+    # districts and their new populations, or None for districts that no longer
+    # exist. Returns the change that undoes this one.
+    def apply(self, change):
+        inverse = {}
+        for district, pop in change.items():
+            old = self.population.get(district)
+            if old == pop:
+                continue
+            inverse[district] = old
+            self.total -= old or 0
+            if pop is None:
+                del self.population[district]
+                continue
+            self.population[district] = pop
+            self.total += pop
+            heapq.heappush(self.low, (pop, district))
+            heapq.heappush(self.high, (-pop, district))
+
+        # Keep stale entries from piling up
+        if len(self.low) > 2 * len(self.population) + 16:
+            self.rebuild()
+        return inverse
+
+    # Smallest population, dropping stale entries
+    def smallest(self):
+        low = self.low
+        while self.population.get(low[0][1]) != low[0][0]:
+            heapq.heappop(low)
+        return low[0][0]
+
+    # Largest population, dropping stale entries
+    def largest(self):
+        high = self.high
+        while self.population.get(high[0][1]) != -high[0][0]:
+            heapq.heappop(high)
+        return -high[0][0]
+
+# Population spread of one partition, as returned by population_spread
+class PopulationSpread:
+
+    def __init__(self, version):
+        self._version = version
+
+    # Largest district population
+    @property
+    def max(self):
+        return self._version.store.largest()
+
+    # Smallest district population
+    @property
+    def min(self):
+        return self._version.store.smallest()
+
+    # Ideal district population
+    @property
+    def ideal(self):
+        store = self._version.store
+        return store.total / len(store.population)
+
+    # Population deviation as calculated by pop_deviation: the deviation of
+    # the largest district from the ideal plus that of the smallest one
+    @property
+    def deviation(self):
+        ideal = self.ideal
+        dev_max = (self.max - ideal) / ideal
+        dev_min = (self.min - ideal) / ideal
+        return abs(dev_max + abs(dev_min))
+
+# Updater returning the PopulationSpread of partition. Must be registered under
+# the name "population_spread"
+def population_spread(partition):
+    population = partition["population"]
+    parent = partition.parent
+    if parent is None:
+        return PopulationSpread(Version(PopulationHeaps(population)))
+
+    districts = {part for move in changed_nodes(partition).values() for part in move}
+    change = {d: population[d] if d in population else None for d in districts}
+
+    version = parent["population_spread"]._version
+    return PopulationSpread(version.derive(change))
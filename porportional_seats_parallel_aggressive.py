@@ -13,6 +13,7 @@ from gerrychain import (GeographicPartition, Partition, Graph,
     MarkovChain_xtended_prop_dev, proposals, updaters, constraints, accept,
     Election)
 from gerrychain.proposals import recom_merge
+from gerrychain.cut_edge_index import cut_edge_index
 from gerrychain.constraints import deviation_from_ideal
 from functools import partial
 import pandas
@@ -26,11 +27,15 @@ import time
 from pop_constraint import pop_constraint
 from proportional_seats_deviation import prop_dev
 from total_splits import total_splits
+from seed_plans import seed_assignment
+from graph_schema import resolve_schema
+from county_pieces import county_pieces
+from population_spread import population_spread
 
 # Multichian Run
 def multi_chain(i1, graph, state, popkey, poptol, markovchainlength,
     electionvol, my_apportionment, proportional_seats, max_pop_deviation,
-    best_dev, geotag, ns, time_interval):
+    best_dev, geotag, ns, time_interval, seed_file):
 
     # Limit the total number of plans to markovchainlength
     count = 0
@@ -45,12 +50,17 @@ def multi_chain(i1, graph, state, popkey, poptol, markovchainlength,
 
             # Updaters
             elections, composite = get_elections(state)
-            my_updaters = {"population": updaters.Tally(popkey, alias = "population")}
+            my_updaters = {"population": updaters.Tally(popkey, alias = "population"),
+                "cut_edge_index": cut_edge_index,
+                "population_spread": population_spread,
+                "county_pieces": county_pieces}
             election_updaters = {election.name: election for election in elections}
             my_updaters.update(election_updaters)
 
             # Create Initial Partition
-            initial_partition = GeographicPartition(graph, assignment = my_apportionment,
+            initial_partition = GeographicPartition(graph,
+                assignment = seed_assignment(seed_file, i1, my_apportionment,
+                    graph),
                 updaters = my_updaters)
 
             # Compactness and Contiguity Constraints
@@ -124,10 +134,14 @@ if __name__ == '__main__':
     df = geopandas.read_file(my_electiondatafile) 
     exec(open("splice_assignment_fn.py").read())
     graph = graph_PA
+    resolve_schema(graph, population = popkey, geoid = geotag)
 
     # Updaters
     elections, composite = get_elections(state)
-    my_updaters = {"population": updaters.Tally(popkey, alias = "population")}
+    my_updaters = {"population": updaters.Tally(popkey, alias = "population"),
+        "cut_edge_index": cut_edge_index,
+        "population_spread": population_spread,
+        "county_pieces": county_pieces}
     election_updaters = {election.name: election for election in elections}
     my_updaters.update(election_updaters)
 
@@ -149,5 +163,5 @@ if __name__ == '__main__':
 
     updated_vals = p.starmap(multi_chain, [(i1, graph, state, popkey, poptol, 
         markovchainlength, electionvol, my_apportionment, 
-        proportional_seats, max_pop_deviation, best_dev, geotag, ns, time_interval) 
+        proportional_seats, max_pop_deviation, best_dev, geotag, ns, time_interval, seed_file) 
         for i1 in range(poolsize)])
\ No newline at end of file
@@ -10,6 +10,9 @@ Program by Charlie Murphy
 # File Names
 my_electiondatafile = r'C:\Users\charl\Box\Internships\Gerry Chain\States\Texas\Combined Level 1\TX_2020_censusvtds.shp'
 ex_dist_name = 'TX_smoothed.csv'
+# Seed plans built by seed_plans.py, one per processor. None starts every
+# processor from ex_dist_name
+seed_file = None
 
 # State Attributes
 state = 'TX'
@@ -10,13 +10,13 @@ seats won.
 Program by Charlie Murphy
 '''
 
-from calc_fracwins_comp import calc_fracwins_comp
+from metrics_cache import fracwins
 
 # Disproportionality as calculated using Dave's
 def prop_dev(partition, composite, electionvol, proportional_seats):
 
     seats_num = len(partition)
-    wins = calc_fracwins_comp(partition, composite, electionvol)
+    wins = fracwins(partition, composite, electionvol)
 
     return abs(proportional_seats - wins) / seats_num
 
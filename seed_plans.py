@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Program designed to build batches of seed plans in parallel with gerrychain's
+recursive_seed_part (or recursive_seed_part_parallel, for batches smaller than
+the pool of processes) and keep them in an on-disk cache, so that each processor
+of the parallel drivers can start from its own plan instead of all starting
+from the same assignment.
+
+Plans are stored as a single .npz file per graph, number of districts,
+population column, epsilon, bipartition method and node_repeats: an
+(plans x nodes) assignment matrix, the node order of its columns, and the
+metadata used to build them. Set seed_file in an input template to the path
+printed by this program to use them. Each processor's plan is relabeled with
+the district labels of the plan it would otherwise start from, so the
+district files written by the drivers use the same labels either way.
+'''
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import freeze_support
+
+import numpy as np
+from functools import lru_cache
+from scipy.optimize import linear_sum_assignment
+from gerrychain.graph_index import node_index
+from gerrychain.random import random
+from gerrychain.tree import (bipartition_tree, recursive_seed_part,
+    recursive_seed_part_parallel, seed_part_executor)
+from graph_schema import resolve_schema
+
+# Graph that each worker process builds plans of; set once per worker so that
+# tasks only carry their parameters
+_graph = None
+
+def _init_worker(graph):
+    global _graph
+    _graph = graph
+
+# Build a single seed plan from its own random seed
+def _build_plan(num_dists, pop_target, pop_col, epsilon, method, node_repeats,
+    seed):
+
+    random.seed(seed)
+    return recursive_seed_part(_graph, range(num_dists), pop_target, pop_col,
+        epsilon, method=method, node_repeats=node_repeats)
+
+# Build count seed plans of graph with num_dists districts, each within epsilon
+# of the ideal population, spread over a pool of processes. The plans are
+# numbered from first, so a batch that tops up earlier plans built with the
+# same seed gets new plans. Returns the node order and a (count x nodes) matrix
+# of district numbers.
+def generate_seed_plans(graph, num_dists, pop_col, epsilon, count,
+    processes=None, method=bipartition_tree, node_repeats=1, seed=None,
+    first=0):
+
+    nodes = list(graph.nodes)
+    pop_target = node_index(graph).total(pop_col, nodes) / num_dists
+
+    # Give every plan its own seed, derived from seed and the number of the
+    # plan, so the batch does not depend on the order in which the processes
+    # finish
+    entropy = np.random.SeedSequence(seed).entropy
+    seeds = [int(np.random.SeedSequence(entropy, spawn_key = (i,)).generate_state(
+        1, np.uint64)[0]) for i in range(first, first + count)]
+
+    # With at least one plan per process, build whole plans in parallel.
+    # Otherwise some processes would sit idle, so build the plans one at a time
+    # and split each one across the processes by its independent chunks.
+    if count >= (processes or os.cpu_count()):
+        with ProcessPoolExecutor(max_workers=processes,
+            initializer=_init_worker, initargs=(graph,)) as executor:
+            plans = list(executor.map(_build_plan, *zip(*[(num_dists,
+                pop_target, pop_col, epsilon, method, node_repeats, s)
+                for s in seeds])))
+    else:
+        # These plans are built in this process, so put back the caller's
+        # random state afterwards
+        plans = []
+        state = random.getstate()
+        try:
+            with seed_part_executor(graph, processes) as executor:
+                for s in seeds:
+                    random.seed(s)
+                    plans.append(recursive_seed_part_parallel(graph,
+                        range(num_dists), pop_target, pop_col, epsilon,
+                        method=method, node_repeats=node_repeats,
+                        executor=executor))
+        finally:
+            random.setstate(state)
+
+    assignments = np.array([[plan[node] for node in nodes] for plan in plans],
+        dtype=np.int32).reshape(count, len(nodes))
+    return nodes, assignments
+
+# Name of a bipartition method for the cache key and metadata
+def method_name(method):
+    method = getattr(method, "func", method)
+    return method.__module__ + "." + method.__qualname__
+
+# Cache of seed plans on disk, keyed by the graph and the parameters used to
+# build the plans
+class SeedCache:
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    # Identify a graph by its node order and populations together with the
+    # plan parameters
+    def key(self, graph, num_dists, pop_col, epsilon, method = bipartition_tree,
+        node_repeats = 1):
+        index = node_index(graph)
+        digest = hashlib.sha1()
+        digest.update(repr(list(graph.nodes)).encode())
+        digest.update(np.ascontiguousarray(
+            index.column(pop_col)[index.ids_of(graph.nodes)]).tobytes())
+        digest.update(repr((num_dists, pop_col, float(epsilon),
+            method_name(method), int(node_repeats))).encode())
+        return digest.hexdigest()[:16]
+
+    def path(self, graph, num_dists, pop_col, epsilon, method = bipartition_tree,
+        node_repeats = 1):
+        return os.path.join(self.directory, 'seeds_' + str(num_dists) + '_' +
+            self.key(graph, num_dists, pop_col, epsilon, method, node_repeats) +
+            '.npz')
+
+    # Return the path of a file with at least count seed plans, building only
+    # the plans that are not already cached
+    def get(self, graph, num_dists, pop_col, epsilon, count, processes=None,
+        method=bipartition_tree, node_repeats=1, seed=None):
+
+        path = self.path(graph, num_dists, pop_col, epsilon, method,
+            node_repeats)
+
+        if os.path.exists(path):
+            nodes, assignments, metadata = load_seed_plans(path)
+        else:
+            nodes, assignments = list(graph.nodes), np.zeros(
+                (0, len(graph)), dtype=np.int32)
+            metadata = {'num_dists': num_dists, 'pop_col': pop_col,
+                'epsilon': epsilon, 'method': method_name(method),
+                'node_repeats': node_repeats}
+
+        missing = count - len(assignments)
+        if missing > 0:
+            new_nodes, new_assignments = generate_seed_plans(graph, num_dists,
+                pop_col, epsilon, missing, processes, method, node_repeats,
+                seed, first=len(assignments))
+            if new_nodes != nodes:
+                raise ValueError("Cached seed plans use a different node order: "
+                    + path)
+            assignments = np.vstack([assignments, new_assignments])
+
+            os.makedirs(self.directory, exist_ok=True)
+            np.savez_compressed(path, nodes=np.asarray(nodes),
+                assignments=assignments, metadata=np.array(json.dumps(metadata)))
+            cached_seed_plans.cache_clear()
+
+        return path
+
+# Load the node order, assignment matrix and metadata of a seed file
+def load_seed_plans(path):
+    with np.load(path) as data:
+        nodes = data['nodes'].tolist()
+        assignments = data['assignments']
+        metadata = json.loads(str(data['metadata']))
+    return nodes, assignments, metadata
+
+# load_seed_plans, reading each seed file only once per process
+@lru_cache(maxsize=None)
+def cached_seed_plans(path):
+    return load_seed_plans(path)
+
+# Relabel the districts of plan (district numbers in the order of nodes) with
+# the labels of the existing plan in the default column of graph. Each seed
+# district gets the label of a different existing district, chosen so the
+# seed districts keep as many nodes of their existing districts as possible.
+def match_labels(graph, nodes, plan, default):
+    existing = [graph.nodes[node][default] for node in nodes]
+    labels = list(dict.fromkeys(existing))
+    seed_labels, seed_ids = np.unique(plan, return_inverse = True)
+    if len(seed_labels) != len(labels):
+        raise ValueError("Seed plan has " + str(len(seed_labels)) +
+            " districts but " + default + " has " + str(len(labels)))
+
+    label_ids = {label: i for i, label in enumerate(labels)}
+    overlap = np.zeros((len(seed_labels), len(labels)), dtype = int)
+    np.add.at(overlap, (seed_ids, [label_ids[label] for label in existing]), 1)
+    rows, columns = linear_sum_assignment(overlap, maximize = True)
+    relabel = {int(seed_labels[r]): labels[c] for r, c in zip(rows, columns)}
+
+    return {node: relabel[d] for node, d in zip(nodes, plan)}
+
+# Assignment for processor i: its own plan from seed_file, labeled like the
+# existing plan in the default column of graph, or default if there is no seed
+# file. Processors beyond the number of cached plans wrap around.
+def seed_assignment(seed_file, i, default, graph):
+    if seed_file is None:
+        return default
+
+    nodes, assignments, metadata = cached_seed_plans(seed_file)
+    plan = assignments[i % len(assignments)].tolist()
+    return match_labels(graph, nodes, plan, default)
+
+# Setup
+if __name__ == '__main__':
+    freeze_support()
+
+    # Load files and combine into a single dataframe
+    exec(open("./input_templates/seed_plans_input.py").read())
+    import geopandas
+    df = geopandas.read_file(my_electiondatafile)
+    exec(open("splice_assignment_fn.py").read())
+    graph = graph_PA
+    resolve_schema(graph, population = popkey, geoid = geotag)
+
+    # Use the same number of districts as the existing plan
+    num_dists = len(set(graph.nodes[node][my_apportionment] for node in graph))
+
+    path = SeedCache(seed_directory).get(graph, num_dists, popkey, poptol,
+        seed_count, processes=poolsize, node_repeats=node_repeats)
+    print(path)
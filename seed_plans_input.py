@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+'''
+Input file for seed_plans.py
+'''
+
+# File Names
+my_electiondatafile = r'C:\Users\charl\Box\Internships\Gerry Chain\States\Ohio\OH 2018 & 2020 Elections\OH_2020_censusvtds.shp'
+ex_dist_name = 'OH_assignment_pop_4.918.txt'
+seed_directory = 'redist_data/seed_plans'
+
+# State Attributes
+state = 'OH'
+popkey = 'POP19'
+geotag = 'GEOID10'
+my_apportionment = 'assignment'
+
+# Seed Attributes
+seed_count = 10
+poptol = .01
+node_repeats = 2
+
+# Pool Attributes
+poolsize = 10
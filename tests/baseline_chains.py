@@ -0,0 +1,496 @@
+"""The xtended chains as they were before they shared
+MarkovChain_xtended_engine, kept to check that the engine walks the same way."""
+
+import random
+
+from gerrychain.constraints import Validator
+
+from calc_fracwins_comp import calc_fracwins_comp
+from fracking import fracking, fracking_merge, get_fracked_subgraph
+from pop_constraint import pop_deviation
+from proportional_seats_deviation import prop_dev, prop_frac_dev
+
+
+class MarkovChain_xtended_smoothing:
+
+    def __init__(self, proposal, constraints, accept, initial_state, 
+        total_steps):
+
+        if callable(constraints):
+            is_valid = constraints
+        else:
+            is_valid = Validator(constraints)
+
+        if not is_valid(initial_state):
+            failed = [
+                constraint
+                for constraint in is_valid.constraints
+                if not constraint(initial_state)
+            ]
+            message = (
+                "The given initial_state is not valid according is_valid. "
+                "The failed constraints were: " + ",".join([f.__name__ for f in failed])
+            )
+            self.good = 0
+            raise ValueError(message)
+
+        self.proposal = proposal
+        self.is_valid = is_valid
+        self.accept = accept
+        self.good = 1
+        self.total_steps = total_steps
+        self.initial_state = initial_state
+        self.state = initial_state
+
+        self.old_smooth = len(self.state["cut_edges"])
+
+    def __iter__(self):
+        self.counter = 0
+        self.state = self.initial_state
+        self.good=1
+        self.fit = 1
+        return self
+
+    def __next__(self):
+
+        if self.counter == 0:
+            self.counter += 1
+            self.good = 1
+            return self
+
+        while self.counter < self.total_steps:
+
+            edge = random.choice(tuple(self.state["cut_edges"]))
+
+            self.d1 = self.state.assignment[edge[0]]
+            self.d2 = self.state.assignment[edge[1]]
+
+            proposed_next_state = self.proposal(self.state, (self.d1, self.d2))
+
+            self.new_smooth = len(proposed_next_state["cut_edges"])
+
+            # Erase the parent of the parent, to avoid memory leak
+            self.state.parent = None
+            self.good = 0
+
+            if self.is_valid(proposed_next_state) and self.accept(proposed_next_state):
+
+                self.fracks, self.merged_splits, self.splits = fracking_merge(proposed_next_state,
+                    self.d1, self.d2)
+
+                if (self.merged_splits <= 1 and 
+                    self.new_smooth < self.old_smooth and
+                    self.fracks == 0):
+                    self.old_smooth = self.new_smooth
+                    self.state = proposed_next_state
+                    self.good = 1
+                   
+                self.counter += 1
+                return self
+        raise StopIteration
+
+    def __len__(self):
+        return self.total_steps
+
+    def __repr__(self):
+        return "<MarkovChain [{} steps]>".format(len(self))
+
+    def with_progress_bar(self):
+        from tqdm.auto import tqdm
+
+        return tqdm(self)
+
+
+class MarkovChain_xtended_pop_balance:
+
+    def __init__(self, proposal, constraints, accept, initial_state, 
+        total_steps, election_composite, win_margin, win_volatility,
+        boundary_margin):
+
+        if callable(constraints):
+            is_valid = constraints
+        else:
+            is_valid = Validator(constraints)
+
+        if not is_valid(initial_state):
+            failed = [
+                constraint
+                for constraint in is_valid.constraints
+                if not constraint(initial_state)
+            ]
+            message = (
+                "The given initial_state is not valid according is_valid. "
+                "The failed constraints were: " + ",".join([f.__name__ for f in failed])
+            )
+            self.good = 0
+            raise ValueError(message)
+
+        self.proposal = proposal
+        self.is_valid = is_valid
+        self.accept = accept
+        self.good = 1
+        self.total_steps = total_steps
+        self.initial_state = initial_state
+        self.state = initial_state
+        self.old_popdev = pop_deviation(self.state)
+
+        self.election_composite = election_composite
+        self.win_margin = win_margin
+        self.win_volatility = win_volatility
+        self.boundary_margin = boundary_margin
+
+    def __iter__(self):
+        self.counter = 0
+        self.state = self.initial_state
+        self.good=1
+        self.fit = 1
+        return self
+
+    def plan_criteria(self, proposed_next_state):
+        new_wins = calc_fracwins_comp(proposed_next_state, self.election_composite, self.win_volatility)
+        old_wins = calc_fracwins_comp(self.state, self.election_composite, self.win_volatility)
+        new_le_oldwins = new_wins <= old_wins * (1 + self.win_margin)
+        
+        new_bdrylength = len(proposed_next_state["cut_edges"])
+        old_bdrylength = len(self.state["cut_edges"])
+        new_le_oldlength = new_bdrylength <= old_bdrylength * (1 + self.boundary_margin)
+
+        return (self.merged_splits and new_le_oldlength and new_le_oldwins)
+
+    def __next__(self):
+
+        if self.counter == 0:
+            self.counter += 1
+            self.good = 1
+            return self
+
+        while self.counter < self.total_steps:
+
+            edge = max(self.state["cut_edges"], key=lambda x: 
+            abs(abs(self.state["population"][self.state.assignment[x[1]]]) - 
+            abs(self.state["population"][self.state.assignment[x[0]]])) )
+
+            self.d1 = self.state.assignment[edge[0]]
+            self.d2 = self.state.assignment[edge[1]]
+
+            proposed_next_state = self.proposal(self.state, (self.d1, self.d2))
+
+            self.new_popdev = pop_deviation(proposed_next_state)
+
+            # Erase the parent of the parent, to avoid memory leak
+            self.state.parent = None
+            self.good = 0
+
+            if self.is_valid(proposed_next_state) and self.accept(proposed_next_state):
+
+                self.new_fracks, self.merged_splits, self.splits = fracking_merge(proposed_next_state,
+                    self.d1, self.d2)
+
+                if (self.plan_criteria(proposed_next_state) and 
+                    self.old_popdev > self.new_popdev):
+                    self.old_popdev = self.new_popdev
+                    self.state = proposed_next_state
+                    self.good = 1
+                   
+                self.counter += 1
+                return self
+        raise StopIteration
+
+    def __len__(self):
+        return self.total_steps
+
+    def __repr__(self):
+        return "<MarkovChain [{} steps]>".format(len(self))
+
+    def with_progress_bar(self):
+        from tqdm.auto import tqdm
+
+        return tqdm(self)
+
+
+class MarkovChain_xtended_fracking:
+
+    def __init__(self, proposal, constraints, accept, initial_state, 
+        total_steps, election_composite, win_margin, win_volatility,
+        boundary_margin):
+
+        if callable(constraints):
+            is_valid = constraints
+        else:
+            is_valid = Validator(constraints)
+
+        if not is_valid(initial_state):
+            failed = [
+                constraint
+                for constraint in is_valid.constraints
+                if not constraint(initial_state)
+            ]
+            message = (
+                "The given initial_state is not valid according is_valid. "
+                "The failed constraints were: " + ",".join([f.__name__ for f in failed])
+            )
+            self.good = 0
+            raise ValueError(message)
+
+        self.proposal = proposal
+        self.is_valid = is_valid
+        self.accept = accept
+        self.good = 1
+        self.total_steps = total_steps
+        self.initial_state = initial_state
+        self.state = initial_state
+        self.old_fracks = fracking(self.state)
+
+        self.election_composite = election_composite
+        self.win_margin = win_margin
+        self.win_volatility = win_volatility
+        self.boundary_margin = boundary_margin
+
+    def __iter__(self):
+        self.counter = 0
+        self.state = self.initial_state
+        self.good=1
+        self.fit = 1
+        return self
+
+    def plan_criteria(self, proposed_next_state):
+        new_wins = calc_fracwins_comp(proposed_next_state, self.election_composite, self.win_volatility)
+        old_wins = calc_fracwins_comp(self.state, self.election_composite, self.win_volatility)
+        new_le_oldwins = new_wins <= old_wins * (1 + self.win_margin)
+        
+        new_bdrylength = len(proposed_next_state["cut_edges"])
+        old_bdrylength = len(self.state["cut_edges"])
+        new_le_oldlength = new_bdrylength <= old_bdrylength * (1 + self.boundary_margin)
+
+        return (new_le_oldlength and new_le_oldwins)
+
+    def __next__(self):
+
+        if self.counter == 0:
+            self.counter += 1
+            self.good = 1
+            return self
+
+        while self.counter < self.total_steps:
+
+            districts, subgraph, population = get_fracked_subgraph(self.state)
+
+            proposed_next_state = self.proposal(self.state, subgraph, districts,
+                population)
+
+            self.new_fracks = fracking(proposed_next_state)
+
+            # Erase the parent of the parent, to avoid memory leak
+            self.state.parent = None
+            self.good = 0
+
+            if self.is_valid(proposed_next_state) and self.accept(proposed_next_state):
+
+                if (self.new_fracks < self.old_fracks and
+                    self.plan_criteria(proposed_next_state)):
+                    self.good = 1
+                    self.old_fracks = self.new_fracks
+                    self.state = proposed_next_state
+                   
+                self.counter += 1
+                return self
+        raise StopIteration
+
+    def __len__(self):
+        return self.total_steps
+
+    def __repr__(self):
+        return "<MarkovChain [{} steps]>".format(len(self))
+
+    def with_progress_bar(self):
+        from tqdm.auto import tqdm
+
+        return tqdm(self)
+
+
+class MarkovChain_xtended_prop_dev:
+
+    def __init__(self, proposal, constraints, accept, initial_state, 
+        total_steps, election_composite, win_volatility, proportional_seats):
+
+        if callable(constraints):
+            is_valid = constraints
+        else:
+            is_valid = Validator(constraints)
+
+        if not is_valid(initial_state):
+            failed = [
+                constraint
+                for constraint in is_valid.constraints
+                if not constraint(initial_state)
+            ]
+            message = (
+                "The given initial_state is not valid according is_valid. "
+                "The failed constraints were: " + ",".join([f.__name__ for f in failed])
+            )
+            self.good = 0
+            raise ValueError(message)
+
+        self.proposal = proposal
+        self.is_valid = is_valid
+        self.accept = accept
+        self.good = 1
+        self.total_steps = total_steps
+        self.initial_state = initial_state
+        self.state = initial_state
+        
+        self.election_composite = election_composite
+        self.win_volatility = win_volatility
+        self.proportional_seats = proportional_seats
+
+        self.old_propdev = prop_dev(self.state, self.election_composite,
+            self.win_volatility, self.proportional_seats)
+
+    def __iter__(self):
+        self.counter = 0
+        self.state = self.initial_state
+        self.good=1
+        self.fit = 1
+        return self
+
+    def __next__(self):
+
+        if self.counter == 0:
+            self.counter += 1
+            self.good = 1
+            return self
+
+        while self.counter < self.total_steps:
+
+            edge = random.choice(tuple(self.state["cut_edges"]))
+
+            self.d1 = self.state.assignment[edge[0]]
+            self.d2 = self.state.assignment[edge[1]]
+
+            proposed_next_state = self.proposal(self.state, (self.d1, self.d2))
+
+            self.new_propdev = prop_dev(proposed_next_state, self.election_composite,
+                self.win_volatility, self.proportional_seats)
+
+            # Erase the parent of the parent, to avoid memory leak
+            self.state.parent = None
+            self.good = 0
+
+            if self.is_valid(proposed_next_state) and self.accept(proposed_next_state):
+
+                self.new_fracks, self.merged_splits, self.splits = fracking_merge(proposed_next_state,
+                    self.d1, self.d2)
+
+                if self.merged_splits <= 1 and self.new_propdev < self.old_propdev:
+                    self.old_propdev = self.new_propdev
+                    self.state = proposed_next_state
+                    self.good = 1
+                   
+                self.counter += 1
+                return self
+        raise StopIteration
+
+    def __len__(self):
+        return self.total_steps
+
+    def __repr__(self):
+        return "<MarkovChain [{} steps]>".format(len(self))
+
+    def with_progress_bar(self):
+        from tqdm.auto import tqdm
+
+        return tqdm(self)
+
+
+class MarkovChain_xtended_prop_frac_dev:
+
+    def __init__(self, proposal, constraints, accept, initial_state, 
+        total_steps, election_composite, win_volatility, vote_share):
+
+        if callable(constraints):
+            is_valid = constraints
+        else:
+            is_valid = Validator(constraints)
+
+        if not is_valid(initial_state):
+            failed = [
+                constraint
+                for constraint in is_valid.constraints
+                if not constraint(initial_state)
+            ]
+            message = (
+                "The given initial_state is not valid according is_valid. "
+                "The failed constraints were: " + ",".join([f.__name__ for f in failed])
+            )
+            self.good = 0
+            raise ValueError(message)
+
+        self.proposal = proposal
+        self.is_valid = is_valid
+        self.accept = accept
+        self.good = 1
+        self.total_steps = total_steps
+        self.initial_state = initial_state
+        self.state = initial_state
+        
+        self.election_composite = election_composite
+        self.win_volatility = win_volatility
+        self.vote_share = vote_share
+
+        self.old_propdev = prop_frac_dev(self.state, self.election_composite,
+            self.win_volatility, self.vote_share)
+
+    def __iter__(self):
+        self.counter = 0
+        self.state = self.initial_state
+        self.good=1
+        self.fit = 1
+        return self
+
+    def __next__(self):
+
+        if self.counter == 0:
+            self.counter += 1
+            self.good = 1
+            return self
+
+        while self.counter < self.total_steps:
+
+            edge = random.choice(tuple(self.state["cut_edges"]))
+
+            self.d1 = self.state.assignment[edge[0]]
+            self.d2 = self.state.assignment[edge[1]]
+
+            proposed_next_state = self.proposal(self.state, (self.d1, self.d2))
+
+            self.new_propdev = prop_frac_dev(proposed_next_state, self.election_composite,
+                self.win_volatility, self.vote_share)
+
+            # Erase the parent of the parent, to avoid memory leak
+            self.state.parent = None
+            self.good = 0
+
+            if self.is_valid(proposed_next_state) and self.accept(proposed_next_state):
+
+                self.new_fracks, self.merged_splits, self.splits = fracking_merge(proposed_next_state,
+                    self.d1, self.d2)
+
+                if self.merged_splits <= 1 and self.new_propdev < self.old_propdev:
+                    self.old_propdev = self.new_propdev
+                    self.state = proposed_next_state
+                    self.good = 1
+                   
+                self.counter += 1
+                return self
+        raise StopIteration
+
+    def __len__(self):
+        return self.total_steps
+
+    def __repr__(self):
+        return "<MarkovChain [{} steps]>".format(len(self))
+
+    def with_progress_bar(self):
+        from tqdm.auto import tqdm
+
+        return tqdm(self)
@@ -0,0 +1,106 @@
+import os
+import random
+import sys
+import types
+
+import networkx as nx
+import pytest
+
+from gerrychain import Graph, Partition
+from gerrychain.updaters import Tally, cut_edges
+
+# The redistricting modules live at the top of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_graph(size=12, seed=0, fragmented=False):
+    """A ``size`` x ``size`` grid with integer nodes and random populations,
+    counties and election results. ``fragmented`` counties are not contiguous,
+    so most plans frack some of them."""
+    rng = random.Random(seed)
+    graph = Graph(nx.convert_node_labels_to_integers(
+        nx.grid_2d_graph(size, size), label_attribute="xy"))
+    for node in graph.nodes:
+        x, y = graph.nodes[node]["xy"]
+        if fragmented:
+            county = (x // 4) * 10 + ((y + 4 * (x % 2)) // 5) % 3
+        else:
+            county = (x // 4) * 10 + y // 5
+        graph.nodes[node].update(
+            POP20=rng.randint(20, 40),
+            COUNTYFP20=county,
+            GEOID20=str(node),
+            DA=rng.randint(0, 100), RA=rng.randint(0, 100),
+            DB=rng.randint(0, 100), RB=rng.randint(0, 100))
+    return graph
+
+
+def column_plan(graph, width=2):
+    """Districts made of ``width`` columns of the grid each."""
+    return {node: graph.nodes[node]["xy"][0] // width for node in graph.nodes}
+
+
+def make_partition(graph, assignment, extra=None):
+    updaters = {"population": Tally("POP20", alias="population"),
+        "cut_edges": cut_edges}
+    updaters.update(extra or {})
+    return Partition(graph, assignment, updaters)
+
+
+def walk(partition, steps, seed=0, keep=0.4):
+    """A recom walk from ``partition``, yielding every proposal and the
+    current state after it. Proposals are kept with probability ``keep``, so
+    the incremental updaters see both rejected proposals and moves back to an
+    older state."""
+    from gerrychain.proposals import recom
+
+    rng = random.Random(seed)
+    random.seed(seed)
+    graph = partition.graph
+    total = sum(graph.nodes[node]["POP20"] for node in graph.nodes)
+    target = total / len(partition)
+    state = partition
+    for _ in range(steps):
+        proposed = recom(state, "POP20", target, 0.3, node_repeats=2)
+        if rng.random() < keep:
+            state.parent = None
+            state = proposed
+        yield proposed, state
+
+
+def stand_in_fracwins(partition, composite, volatility):
+    """Expected seats won by the first party of each election in the names of
+    ``composite``, with a normal swing of ``volatility`` in its vote share,
+    averaged over the elections."""
+    from scipy.stats import norm
+
+    wins = 0
+    for name in composite:
+        results = partition[name]
+        party = results.election.parties[0]
+        wins += sum(norm.cdf((results.percent(party, district) - 0.5) / volatility)
+            for district in partition.parts)
+    return wins / len(composite)
+
+
+@pytest.fixture
+def fracwins_comp(monkeypatch):
+    """calc_fracwins_comp, replaced by :func:`stand_in_fracwins` where it is
+    not installed, so that the modules importing it can be tested."""
+    try:
+        import calc_fracwins_comp as module
+    except ImportError:
+        module = types.ModuleType("calc_fracwins_comp")
+        module.calc_fracwins_comp = stand_in_fracwins
+        monkeypatch.setitem(sys.modules, "calc_fracwins_comp", module)
+    return module.calc_fracwins_comp
+
+
+@pytest.fixture
+def graph():
+    return make_graph()
+
+
+@pytest.fixture
+def fragmented_graph():
+    return make_graph(fragmented=True)
@@ -0,0 +1,150 @@
+import random
+from functools import partial
+
+import pytest
+
+from gerrychain.constraints import contiguous
+from gerrychain.cut_edge_index import cut_edge_index
+from gerrychain.district_pairs import district_adjacency, district_pair_edges
+from gerrychain.proposals import recom_frack, recom_merge
+
+from conftest import column_plan, make_graph, make_partition
+from county_pieces import county_pieces
+from fracking import NoFrackError
+from graph_schema import resolve_schema
+from population_spread import population_spread
+
+STEPS = 40
+COMPOSITE = ["A", "B"]
+VOLATILITY = 0.1
+# Win and boundary margins tight enough that the criteria reject proposals
+MARGINS = (0.005, 0.02)
+
+
+# The column plan with two fracks: the second district takes both ends of
+# column 4 in the county of columns 4 to 7 and rows 0 to 4, and the fourth
+# district both ends of column 8 in the county of columns 8 to 11 and rows 5 to
+# 9.
+def fracked_plan(graph):
+    assignment = column_plan(graph)
+    for node in graph.nodes:
+        x, y = graph.nodes[node]["xy"]
+        if (x, y) in [(4, 0), (4, 4)]:
+            assignment[node] = 1
+        if (x, y) in [(8, 5), (8, 9)]:
+            assignment[node] = 3
+    return assignment
+
+
+# A partition with the elections of COMPOSITE. The indexed updaters draw their
+# random cut edges and district pairs differently from the original chains, so
+# they are only registered when indexed is set.
+def chain_partition(plan=fracked_plan, indexed=False):
+    from gerrychain.updaters import Election
+
+    graph = make_graph()
+    resolve_schema(graph)
+    extra = {"population_spread": population_spread,
+        "county_pieces": county_pieces}
+    if indexed:
+        extra.update({"cut_edge_index": cut_edge_index,
+            "district_pair_edges": district_pair_edges,
+            "district_adjacency": district_adjacency})
+    for name in COMPOSITE:
+        extra[name] = Election(name, {"Dem": "D" + name, "Rep": "R" + name})
+    return make_partition(graph, plan(graph), extra)
+
+
+merge = partial(recom_merge, pop_col="POP20", epsilon=0.1, node_repeats=2)
+frack = partial(recom_frack, pop_col="POP20", epsilon=0.1, node_repeats=2)
+
+
+# Whether each step kept its proposal and the plan after it. The original
+# fracking chain raised once nothing was left to reduce rather than stopping.
+def trace(chain):
+    steps = []
+    try:
+        for step in chain:
+            steps.append((step.good, dict(step.state.assignment)))
+    except NoFrackError:
+        pass
+    return steps
+
+
+def same_walk(chain, baseline):
+    random.seed(2024)
+    expected = trace(baseline)
+    random.seed(2024)
+    assert trace(chain) == expected
+    assert sum(good for good, _ in expected) > 1
+
+
+def test_smoothing_chain_matches_the_original_chain(fracwins_comp):
+    import baseline_chains
+    from gerrychain.chain_xtended_smoothing import MarkovChain_xtended_smoothing
+
+    args = (merge, [contiguous], lambda p: True)
+    same_walk(
+        MarkovChain_xtended_smoothing(*args, chain_partition(column_plan), STEPS),
+        baseline_chains.MarkovChain_xtended_smoothing(*args,
+            chain_partition(column_plan), STEPS))
+
+
+def test_pop_balance_chain_matches_the_original_chain(fracwins_comp):
+    import baseline_chains
+    from gerrychain.chain_xtended_pop_balance import MarkovChain_xtended_pop_balance
+
+    args = (merge, [contiguous], lambda p: True)
+    params = (COMPOSITE, MARGINS[0], VOLATILITY, MARGINS[1])
+    same_walk(
+        MarkovChain_xtended_pop_balance(*args, chain_partition(), STEPS, *params),
+        baseline_chains.MarkovChain_xtended_pop_balance(*args,
+            chain_partition(), STEPS, *params))
+
+
+def test_fracking_chain_matches_the_original_chain(fracwins_comp):
+    import baseline_chains
+    from gerrychain.chain_xtended_fracking import MarkovChain_xtended_fracking
+
+    args = (frack, [contiguous], lambda p: True)
+    params = (COMPOSITE, MARGINS[0], VOLATILITY, MARGINS[1])
+    same_walk(
+        MarkovChain_xtended_fracking(*args, chain_partition(), STEPS, *params),
+        baseline_chains.MarkovChain_xtended_fracking(*args, chain_partition(),
+            STEPS, *params))
+
+
+@pytest.mark.parametrize("fractional", [False, True])
+def test_prop_dev_chains_match_the_original_chains(fracwins_comp, fractional):
+    import baseline_chains
+    from gerrychain.chain_xtended_prop_dev import MarkovChain_xtended_prop_dev
+    from gerrychain.chain_xtended_prop_frac_dev import \
+        MarkovChain_xtended_prop_frac_dev
+
+    if fractional:
+        chains = (MarkovChain_xtended_prop_frac_dev,
+            baseline_chains.MarkovChain_xtended_prop_frac_dev)
+        target = 0.3
+    else:
+        chains = (MarkovChain_xtended_prop_dev,
+            baseline_chains.MarkovChain_xtended_prop_dev)
+        target = 1.5
+    chain, baseline = (cls(merge, [contiguous], lambda p: True,
+        chain_partition(), STEPS, COMPOSITE, VOLATILITY, target)
+        for cls in chains)
+    same_walk(chain, baseline)
+
+
+def test_fracking_chain_with_indexed_updaters_reduces_fracks(fracwins_comp):
+    from gerrychain.chain_xtended_fracking import MarkovChain_xtended_fracking
+    from fracking import fracking
+
+    random.seed(2024)
+    initial = chain_partition(indexed=True)
+    chain = MarkovChain_xtended_fracking(frack, [contiguous], lambda p: True,
+        initial, STEPS, COMPOSITE, 0.5, VOLATILITY, 0.5,
+        frack_priority="smallest")
+    fracks = [fracking(step.state) for step in chain]
+    assert fracks[0] == fracking(initial) > 0
+    assert fracks == sorted(fracks, reverse=True)
+    assert fracks[-1] < fracks[0]
@@ -0,0 +1,131 @@
+import networkx as nx
+import pytest
+
+from conftest import column_plan, make_graph, make_partition, walk
+from county_pieces import county_pieces, get_county_pieces
+from fracking import (count_pieces, fracking, fracking_merge,
+    fracking_total_splits, get_fracks, get_fracked_subgraph, NoFrackError)
+from graph_schema import resolve_schema
+
+
+def brute_force(partition):
+    graph = partition.graph
+    nodes = {}
+    for node in graph.nodes:
+        key = (graph.nodes[node]["COUNTYFP20"], partition.assignment[node])
+        nodes.setdefault(key, set()).add(node)
+    pieces = {key: nx.number_connected_components(graph.subgraph(piece))
+        for key, piece in nodes.items()}
+    return nodes, pieces
+
+
+def adjacent_districts(partition, county, district):
+    graph = partition.graph
+    return {partition.assignment[v] for u in partition.parts[district]
+        for v in graph.neighbors(u)
+        if graph.nodes[u]["COUNTYFP20"] == graph.nodes[v]["COUNTYFP20"] == county
+        } - {district}
+
+
+def check(partition):
+    nodes, pieces = brute_force(partition)
+    view = partition["county_pieces"]
+    counties = {county for county, _ in nodes}
+
+    assert view.total == sum(pieces.values())
+    assert view.expected == len(pieces)
+    assert view.splits == len(pieces) - len(counties)
+    for (county, district), piece in nodes.items():
+        assert view.nodes(county, district) == piece
+        assert view.pieces(county, district) == pieces[(county, district)]
+    for county in counties:
+        assert view.districts(county) == {d for c, d in nodes if c == county}
+    assert ({(county, district) for county, district, _ in view.fracks()} ==
+        {key for key, count in pieces.items() if count > 1})
+    fragments = {key: min(len(c) for c in
+        nx.connected_components(partition.graph.subgraph(piece)))
+        for key, piece in nodes.items() if pieces[key] > 1}
+    for (county, district), piece in nodes.items():
+        assert view.fragment(county, district) == fragments.get((county, district))
+    if fragments:
+        assert (fragments[view.next_frack("smallest")] ==
+            min(fragments.values()))
+
+    plain = make_partition(partition.graph, dict(partition.assignment))
+    # The frack picked does not depend on the plans the updater visited before
+    fresh = get_county_pieces(plain, "COUNTYFP20")
+    for priority in [None, "smallest"]:
+        assert view.next_frack(priority) == fresh.next_frack(priority)
+    assert fracking(partition) == fracking(plain)
+    assert fracking_total_splits(partition) == fracking_total_splits(plain)
+    for d1, d2 in [(0, 1), (2, 3), (1, 4)]:
+        assert fracking_merge(partition, d1, d2) == fracking_merge(plain, d1, d2)
+
+
+@pytest.mark.parametrize("fragmented", [False, True])
+def test_county_pieces_matches_brute_force_along_a_chain(fragmented):
+    graph = make_graph(fragmented=fragmented)
+    resolve_schema(graph)
+    partition = make_partition(graph, column_plan(graph),
+        {"county_pieces": county_pieces})
+    check(partition)
+    for proposed, state in walk(partition, 60):
+        check(proposed)
+        check(state)
+
+
+def test_count_pieces_matches_brute_force(fragmented_graph):
+    resolve_schema(fragmented_graph)
+    partition = make_partition(fragmented_graph, column_plan(fragmented_graph))
+    nodes, pieces = brute_force(partition)
+    total, expected, splits, merged = count_pieces(partition, "COUNTYFP20", 0, 1)
+
+    counties = {county for county, _ in nodes}
+    shared = ({c for c, d in nodes if d == 0} & {c for c, d in nodes if d == 1})
+    assert (total, expected, splits, merged) == (sum(pieces.values()),
+        len(pieces), len(pieces) - len(counties), len(shared))
+
+
+def test_get_fracks_returns_districts_of_a_fracked_county(fragmented_graph):
+    resolve_schema(fragmented_graph)
+    partition = make_partition(fragmented_graph, column_plan(fragmented_graph),
+        {"county_pieces": county_pieces})
+    _, pieces = brute_force(partition)
+
+    districts, county = get_fracks(partition, "COUNTYFP20")
+    assert any(pieces.get((county, d), 0) > 1 for d in districts)
+    assert len(set(districts)) == 2
+
+    # The smallest fragment is fixed first
+    view = partition["county_pieces"]
+    county, district = view.next_frack("smallest")
+    districts, smallest_county = get_fracks(partition, "COUNTYFP20",
+        priority="smallest")
+    assert smallest_county == county and district in districts
+
+    districts, subgraph, populations = get_fracked_subgraph(partition)
+    assert set(subgraph.nodes) == {node for node in subgraph.nodes
+        if fragmented_graph.nodes[node]["COUNTYFP20"] == county}
+    assert len(populations) == 2
+
+
+def test_county_pieces_adjacent_districts(fragmented_graph):
+    resolve_schema(fragmented_graph)
+    partition = make_partition(fragmented_graph, column_plan(fragmented_graph),
+        {"county_pieces": county_pieces})
+    for proposed, state in walk(partition, 10):
+        view = proposed["county_pieces"]
+        nodes, _ = brute_force(proposed)
+        for county, district in nodes:
+            assert (view.adjacent_districts(county, district) ==
+                adjacent_districts(proposed, county, district))
+
+
+def test_get_fracked_subgraph_without_fracks_raises(graph):
+    resolve_schema(graph)
+    partition = make_partition(graph, column_plan(graph),
+        {"county_pieces": county_pieces})
+
+    assert get_fracks(partition, "COUNTYFP20") is None
+    with pytest.raises(NoFrackError):
+        get_fracked_subgraph(partition)
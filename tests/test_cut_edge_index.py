@@ -0,0 +1,81 @@
+import random
+
+from gerrychain.cut_edge_index import (IndexedEdgeSet, cut_edge_index,
+    random_cut_edge)
+from gerrychain.versioned import Version
+
+from conftest import column_plan, make_partition, walk
+
+
+class ListStore:
+    """A list whose changes are ``(index, value)`` assignments."""
+
+    def __init__(self, values):
+        self.values = list(values)
+
+    def apply(self, change):
+        index, value = change
+        old = self.values[index]
+        self.values[index] = value
+        return index, old
+
+
+def check(partition):
+    index = partition["cut_edge_index"]
+    assert set(index) == set(partition["cut_edges"])
+    assert len(index) == len(partition["cut_edges"])
+    assert all(edge in index for edge in partition["cut_edges"])
+    assert index.choice(random) in partition["cut_edges"]
+
+
+def test_versions_move_the_store_between_them():
+    root = Version(ListStore([0, 0, 0]))
+    a = root.derive((0, 1))
+    b = a.derive((1, 2))
+    c = root.derive((2, 3))
+    d = b.derive((0, 4))
+
+    expected = {root: [0, 0, 0], a: [1, 0, 0], b: [1, 2, 0], c: [0, 0, 3],
+        d: [4, 2, 0]}
+    rng = random.Random(0)
+    for version in rng.choices(list(expected), k=50):
+        assert version.store.values == expected[version]
+
+
+def test_indexed_edge_set():
+    edges = IndexedEdgeSet([(0, 1), (1, 2)])
+    assert edges.add((2, 3)) and not edges.add((0, 1))
+    assert edges.remove((0, 1)) and not edges.remove((0, 1))
+    assert sorted(edges.edges) == [(1, 2), (2, 3)]
+    assert all(edges.edges[i] == edge for edge, i in edges.positions.items())
+
+    undo = edges.apply(([(0, 1), (1, 2)], [(2, 3), (5, 6)]))
+    assert sorted(edges.edges) == [(0, 1), (1, 2)]
+    edges.apply(undo)
+    assert sorted(edges.edges) == [(1, 2), (2, 3)]
+
+
+def test_cut_edge_index_matches_cut_edges_along_a_chain(graph):
+    partition = make_partition(graph, column_plan(graph),
+        {"cut_edge_index": cut_edge_index})
+    seen = [partition]
+    check(partition)
+    for proposed, state in walk(partition, 100):
+        check(proposed)
+        check(state)
+        seen.append(proposed)
+
+    # Going back to older partitions, kept or not, replays the store to them
+    rng = random.Random(1)
+    for partition in rng.sample(seen, len(seen)):
+        check(partition)
+
+
+def test_random_cut_edge_with_and_without_the_index(graph):
+    indexed = make_partition(graph, column_plan(graph),
+        {"cut_edge_index": cut_edge_index})
+    plain = make_partition(graph, column_plan(graph))
+    rng = random.Random(2)
+    for _ in range(20):
+        assert random_cut_edge(indexed, rng) in indexed["cut_edges"]
+        assert random_cut_edge(plain, rng) in plain["cut_edges"]
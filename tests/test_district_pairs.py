@@ -0,0 +1,74 @@
+import random
+
+from gerrychain.district_pairs import district_adjacency, district_pair_edges
+
+from conftest import column_plan, make_partition, walk
+
+
+def pair_edges(partition):
+    """The edges between each pair of districts, found from every edge."""
+    pairs = {}
+    for u, v in partition.graph.edges:
+        a, b = partition.assignment[u], partition.assignment[v]
+        if a != b:
+            pairs.setdefault((min(a, b), max(a, b)), set()).add(tuple(sorted((u, v))))
+    return pairs
+
+
+def check_pairs(partition):
+    index = partition["district_pair_edges"]
+    pairs = pair_edges(partition)
+    assert set(index) == set(pairs)
+    assert len(index) == len(pairs)
+    for (a, b), edges in pairs.items():
+        assert (a, b) in index and (b, a) in index
+        assert index.edges(b, a) == edges
+        assert index.count(a, b) == len(edges)
+        assert index.edge(a, b) in edges
+        assert index.choice(a, b, random) in edges
+    for district in partition.parts:
+        assert index.neighbors(district) == ({b for a, b in pairs if a == district} |
+            {a for a, b in pairs if b == district})
+    apart = [(a, b) for a in partition.parts for b in partition.parts
+        if a < b and (a, b) not in pairs]
+    for a, b in apart:
+        assert (a, b) not in index and index.count(a, b) == 0
+        assert index.edges(a, b) == set() and index.choice(a, b) is None
+
+
+def check_adjacency(partition):
+    adjacency = partition["district_adjacency"]
+    population = partition["population"]
+    gaps = {(a, b): abs(population[a] - population[b])
+        for a, b in pair_edges(partition)}
+    assert set(adjacency) == set(gaps)
+    assert len(adjacency) == len(gaps)
+    for (a, b), gap in gaps.items():
+        assert adjacency.gap(b, a) == gap
+    assert gaps[adjacency.max_gap_pair()] == max(gaps.values())
+    top = adjacency.top_pairs(3)
+    assert len(set(top)) == 3
+    assert ([gaps[pair] for pair in top] ==
+        sorted(gaps.values(), reverse=True)[:3])
+
+
+def check(partition):
+    check_pairs(partition)
+    check_adjacency(partition)
+
+
+def test_district_pairs_match_every_edge_along_a_chain(graph):
+    partition = make_partition(graph, column_plan(graph),
+        {"district_pair_edges": district_pair_edges,
+        "district_adjacency": district_adjacency})
+    seen = [partition]
+    check(partition)
+    for proposed, state in walk(partition, 100):
+        check(proposed)
+        check(state)
+        seen.append(proposed)
+
+    # Going back to older partitions, kept or not, replays the stores to them
+    rng = random.Random(1)
+    for partition in rng.sample(seen, len(seen)):
+        check(partition)
@@ -0,0 +1,56 @@
+import networkx as nx
+import numpy as np
+
+from gerrychain.graph_index import node_index, refresh_index
+
+
+def populations(graph):
+    return [graph.nodes[node]["POP20"] for node in graph.nodes]
+
+
+def test_subgraph_views_share_the_index(graph):
+    index = node_index(graph)
+    view = graph.subgraph(list(graph.nodes)[:5])
+    assert node_index(view) is index
+    assert index.nodes == list(graph.nodes)
+    assert index.column("POP20").tolist() == populations(graph)
+    assert index.total("POP20", view) == sum(populations(view))
+
+
+def test_induced_adjacency_matches_the_subgraph(graph):
+    index = node_index(graph)
+    nodes = list(graph.nodes)[::2]
+    indptr, indices = index.induced(index.ids_of(nodes))
+    sub = graph.subgraph(nodes)
+    for k, node in enumerate(nodes):
+        neighbors = {nodes[j] for j in indices[indptr[k]:indptr[k + 1]]}
+        assert neighbors == set(sub[node])
+
+
+def test_relabeled_nodes_rebuild_the_index(graph):
+    node_index(graph).column("POP20")
+    count = len(graph)
+    nx.relabel_nodes(graph, {node: ("n", node) for node in graph.nodes},
+        copy=False)
+    assert len(graph) == count
+
+    index = node_index(graph)
+    assert index.nodes == list(graph.nodes)
+    assert index.column("POP20").tolist() == populations(graph)
+    node = ("n", 3)
+    assert set(index.nodes[j] for j in
+        index.indices[index.indptr[index.ids[node]]:index.indptr[index.ids[node] + 1]]
+        ) == set(graph[node])
+
+
+def test_refresh_reloads_changed_attributes(graph):
+    index = node_index(graph)
+    before = index.column("POP20").copy()
+    for node in graph.nodes:
+        graph.nodes[node]["POP20"] += 1
+
+    # Columns are snapshots until the index is refreshed
+    assert np.array_equal(node_index(graph).column("POP20"), before)
+    refresh_index(graph)
+    assert node_index(graph) is not index
+    assert node_index(graph).column("POP20").tolist() == populations(graph)
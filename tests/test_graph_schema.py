@@ -0,0 +1,53 @@
+import pytest
+
+from conftest import make_graph
+from graph_schema import (GraphSchema, SchemaError, get_field, get_schema,
+    resolve_schema)
+
+
+def test_resolve_detects_and_caches_the_columns(graph):
+    schema = resolve_schema(graph)
+    assert schema == GraphSchema("COUNTYFP20", "POP20", "GEOID20")
+    assert graph.graph["schema"] is schema
+    view = graph.subgraph(list(graph.nodes)[:3])
+    assert get_schema(view) is schema
+    assert get_field(view, "county") == "COUNTYFP20"
+
+
+def test_detection_follows_the_candidate_order(graph):
+    for node in graph.nodes:
+        graph.nodes[node]["COUNTYFP10"] = 0
+        graph.nodes[node]["TOTPOP"] = 0
+    assert resolve_schema(graph) == GraphSchema("COUNTYFP10", "POP20", "GEOID20")
+
+
+def test_explicit_columns_are_checked_instead_of_detected(graph):
+    for node in graph.nodes:
+        graph.nodes[node]["TOTPOP"] = graph.nodes[node]["POP20"]
+    schema = resolve_schema(graph, population="TOTPOP", geoid="GEOID20")
+    assert schema == GraphSchema("COUNTYFP20", "TOTPOP", "GEOID20")
+
+    with pytest.raises(SchemaError, match="population"):
+        resolve_schema(graph, population="POP10")
+
+
+def test_missing_column_is_an_error(graph):
+    for node in graph.nodes:
+        del graph.nodes[node]["COUNTYFP20"]
+    with pytest.raises(SchemaError, match="county"):
+        resolve_schema(graph)
+    assert "schema" not in graph.graph
+
+    # Lazily detected columns are None until one of them is asked for
+    assert get_schema(graph).county is None
+    assert get_field(graph, "population") == "POP20"
+    with pytest.raises(SchemaError, match="county"):
+        get_field(graph, "county")
+
+
+def test_column_missing_on_a_later_node_is_an_error():
+    graph = make_graph()
+    last = list(graph.nodes)[-1]
+    del graph.nodes[last]["GEOID20"]
+    with pytest.raises(SchemaError, match="node " + str(last)):
+        resolve_schema(graph)
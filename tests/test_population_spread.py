@@ -0,0 +1,46 @@
+import pytest
+
+from conftest import column_plan, make_partition, walk
+from population_spread import PopulationHeaps, population_spread
+
+
+# The deviation as pop_constraint.full_pop_deviation calculates it, from every
+# district
+def full_deviation(partition):
+    population = partition["population"]
+    ideal = sum(population.values()) / len(population)
+    deviation = {d: (pop - ideal) / ideal for d, pop in population.items()}
+    return abs(max(deviation.values()) + abs(min(deviation.values())))
+
+
+def check(partition):
+    spread = partition["population_spread"]
+    population = partition["population"]
+    assert spread.max == max(population.values())
+    assert spread.min == min(population.values())
+    assert spread.ideal == pytest.approx(sum(population.values()) /
+        len(population))
+    assert spread.deviation == pytest.approx(full_deviation(partition))
+
+
+def test_population_spread_matches_every_district_along_a_chain(graph):
+    partition = make_partition(graph, column_plan(graph),
+        {"population_spread": population_spread})
+    check(partition)
+    for proposed, state in walk(partition, 100):
+        check(proposed)
+        check(state)
+
+
+def test_population_heaps_drop_stale_entries():
+    heaps = PopulationHeaps({0: 10, 1: 20, 2: 30})
+    undo = heaps.apply({2: 5, 1: None})
+    assert (heaps.smallest(), heaps.largest(), heaps.total) == (5, 10, 15)
+
+    heaps.apply(undo)
+    assert (heaps.smallest(), heaps.largest(), heaps.total) == (10, 30, 60)
+
+    for pop in range(100):
+        heaps.apply({0: pop})
+    assert (heaps.smallest(), heaps.largest()) == (20, 99)
+    assert len(heaps.low) <= 2 * len(heaps.population) + 16
@@ -0,0 +1,122 @@
+import random
+from functools import partial
+
+import pytest
+
+from gerrychain.tree import bipartition_tree_random
+
+import seed_plans
+from conftest import make_graph
+from seed_plans import (SeedCache, cached_seed_plans, generate_seed_plans,
+    load_seed_plans, match_labels, seed_assignment)
+
+
+@pytest.mark.parametrize("count", [1, 3])
+def test_generate_seed_plans_builds_balanced_plans(count):
+    graph = make_graph(size=8)
+    nodes, assignments = generate_seed_plans(graph, 4, "POP20", 0.1, count,
+        processes=2, node_repeats=2, seed=7)
+
+    assert nodes == list(graph.nodes)
+    assert assignments.shape == (count, len(nodes))
+    total = sum(graph.nodes[node]["POP20"] for node in nodes)
+    for plan in assignments.tolist():
+        assert sorted(set(plan)) == [0, 1, 2, 3]
+        for district in range(4):
+            pop = sum(graph.nodes[node]["POP20"]
+                for node, d in zip(nodes, plan) if d == district)
+            assert abs(pop - total / 4) <= 0.1 * total / 4
+
+    again = generate_seed_plans(graph, 4, "POP20", 0.1, count, processes=2,
+        node_repeats=2, seed=7)[1]
+    assert (again == assignments).all()
+
+
+def test_generate_seed_plans_keeps_the_random_state():
+    graph = make_graph(size=8)
+    random.seed(2)
+    state = random.getstate()
+    generate_seed_plans(graph, 4, "POP20", 0.1, 1, processes=2, seed=7)
+    assert random.getstate() == state
+
+
+def test_seed_cache_tops_up_with_new_plans(tmp_path):
+    graph = make_graph(size=8)
+    cache = SeedCache(str(tmp_path))
+    path = cache.get(graph, 4, "POP20", 0.1, 2, processes=2, seed=1)
+    first = load_seed_plans(path)[1]
+    assert cache.get(graph, 4, "POP20", 0.1, 4, processes=2, seed=1) == path
+
+    assignments = load_seed_plans(path)[1]
+    assert assignments.shape[0] == 4
+    assert (assignments[:2] == first).all()
+    assert len({tuple(plan) for plan in assignments.tolist()}) == 4
+
+    # The top-up builds the plans numbered after the cached ones
+    nodes, batch = generate_seed_plans(graph, 4, "POP20", 0.1, 2,
+        processes=2, seed=1, first=2)
+    assert (batch == assignments[2:]).all()
+
+
+def test_seed_assignment_uses_the_labels_of_the_existing_plan(tmp_path):
+    graph = make_graph(size=8)
+    for node in graph.nodes:
+        x, y = graph.nodes[node]["xy"]
+        graph.nodes[node]["assignment"] = "D" + str(2 * (x // 4) + y // 4)
+
+    cache = SeedCache(str(tmp_path))
+    path = cache.get(graph, 4, "POP20", 0.1, 2, processes=2, node_repeats=2,
+        seed=1)
+    nodes, assignments, metadata = load_seed_plans(path)
+    assert metadata["node_repeats"] == 2
+
+    for i in range(3):
+        assignment = seed_assignment(path, i, "assignment", graph)
+        plan = assignments[i % 2].tolist()
+        assert set(assignment.values()) == {"D0", "D1", "D2", "D3"}
+        # Relabeling keeps the districts themselves
+        assert ({frozenset(n for n in nodes if assignment[n] == label)
+            for label in set(assignment.values())} ==
+            {frozenset(n for n, d in zip(nodes, plan) if d == district)
+            for district in set(plan)})
+
+    assert seed_assignment(None, 0, "assignment", graph) == "assignment"
+
+
+def test_seed_assignment_matches_districts_by_overlap():
+    graph = make_graph(size=8)
+    nodes = list(graph.nodes)
+    for node in nodes:
+        graph.nodes[node]["assignment"] = 10 + graph.nodes[node]["xy"][0] // 4
+    plan = [1 - graph.nodes[node]["xy"][0] // 4 for node in nodes]
+
+    assignment = match_labels(graph, nodes, plan, "assignment")
+    assert assignment == {node: graph.nodes[node]["assignment"]
+        for node in nodes}
+
+
+def test_seed_cache_key_depends_on_method_and_node_repeats(tmp_path):
+    graph = make_graph(size=8)
+    cache = SeedCache(str(tmp_path))
+    paths = {cache.path(graph, 4, "POP20", 0.1),
+        cache.path(graph, 4, "POP20", 0.1, node_repeats=2),
+        cache.path(graph, 4, "POP20", 0.1, bipartition_tree_random),
+        cache.path(graph, 4, "POP20", 0.1,
+            partial(bipartition_tree_random, tree_pool=None))}
+    assert len(paths) == 3
+
+
+def test_seed_files_are_loaded_once(tmp_path, monkeypatch):
+    graph = make_graph(size=8)
+    for node in graph.nodes:
+        graph.nodes[node]["assignment"] = graph.nodes[node]["xy"][0] // 2
+    path = SeedCache(str(tmp_path)).get(graph, 4, "POP20", 0.1, 2,
+        processes=2, seed=1)
+
+    loads = []
+    monkeypatch.setattr(seed_plans, "load_seed_plans",
+        lambda path: loads.append(path) or load_seed_plans(path))
+    cached_seed_plans.cache_clear()
+    for i in range(4):
+        seed_assignment(path, i, "assignment", graph)
+    assert loads == [path]
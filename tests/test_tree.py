@@ -0,0 +1,181 @@
+import random
+
+from collections import Counter
+
+import networkx as nx
+import numpy as np
+
+from gerrychain.tree import (PopulatedGraph, TreePool, bipartition_tree,
+    bipartition_tree_random, bipartition_tree_speculative,
+    find_balanced_edge_cuts_contraction, find_balanced_edge_cuts_memoization,
+    find_balanced_edge_cuts_union_find, random_spanning_tree_array,
+    uniform_spanning_tree_array)
+
+
+def is_spanning_tree(tree, graph):
+    edges = list(tree.edges)
+    return (len(edges) == len(graph) - 1 and
+        all(graph.has_edge(u, v) for u, v in edges) and
+        nx.is_connected(nx.Graph(edges)))
+
+
+def balanced_cuts(tree, populations, root, ideal_pop, epsilon):
+    """Every balanced edge of the component of ``root`` in ``tree``, found by
+    cutting each edge in turn, with the nodes on the side away from ``root``."""
+    forest = tree.to_networkx()
+    total = sum(populations.values())
+    tolerance = ideal_pop * epsilon
+    cuts = {}
+    for u, v in list(nx.bfs_edges(forest, root)):
+        forest.remove_edge(u, v)
+        below = nx.node_connected_component(forest, v)
+        forest.add_edge(u, v)
+        pop = sum(populations[node] for node in below)
+        if (abs(pop - ideal_pop) <= tolerance or
+                abs(total - pop - ideal_pop) <= tolerance):
+            cuts[frozenset((u, v))] = below
+    return cuts
+
+
+def check_memoized_cuts(tree, populations, root, ideal_pop, epsilon):
+    h = PopulatedGraph(tree, populations, ideal_pop, epsilon)
+    cuts = find_balanced_edge_cuts_memoization(h, choice=lambda nodes: root)
+    expected = balanced_cuts(tree, populations, root, ideal_pop, epsilon)
+    assert {frozenset(cut.edge) for cut in cuts} == set(expected)
+    for cut in cuts:
+        below = expected[frozenset(cut.edge)]
+        assert cut.subset in (below, set(populations) - below)
+        assert cut.pop == sum(populations[node] for node in cut.subset)
+        assert abs(cut.pop - ideal_pop) <= ideal_pop * epsilon
+
+
+def test_array_spanning_trees_span_the_graph(graph):
+    rng = np.random.default_rng(0)
+    for spanning_tree_fn in (random_spanning_tree_array, uniform_spanning_tree_array):
+        for _ in range(5):
+            assert is_spanning_tree(spanning_tree_fn(graph, rng=rng), graph)
+
+
+def test_array_spanning_trees_are_reproducible(graph):
+    for spanning_tree_fn in (random_spanning_tree_array, uniform_spanning_tree_array):
+        first = spanning_tree_fn(graph, rng=np.random.default_rng(5))
+        second = spanning_tree_fn(graph, rng=np.random.default_rng(5))
+        assert set(first.edges) == set(second.edges)
+
+
+def test_uniform_spanning_tree_array_is_uniform():
+    # The 2 x 3 grid has 15 spanning trees
+    grid = nx.convert_node_labels_to_integers(nx.grid_2d_graph(2, 3))
+    rng = np.random.default_rng(1)
+    counts = Counter(
+        frozenset(frozenset(edge) for edge in uniform_spanning_tree_array(grid, rng=rng).edges)
+        for _ in range(4500))
+    assert len(counts) == 15
+    assert all(200 < count < 400 for count in counts.values())
+
+
+def test_memoized_cuts_match_cutting_every_edge(graph):
+    populations = {node: graph.nodes[node]["POP20"] for node in graph}
+    total = sum(populations.values())
+    rng = np.random.default_rng(2)
+    for ideal_pop, epsilon in ((total / 2, 0.05), (total / 3, 0.1), (total / 5, 0.2)):
+        tree = random_spanning_tree_array(graph, rng=rng)
+        root = next(node for node in tree if tree.degree(node) > 1)
+        check_memoized_cuts(tree, populations, root, ideal_pop, epsilon)
+
+
+def test_memoized_cuts_on_a_spanning_forest(graph):
+    # recom_frack can hand a disconnected subgraph to bipartition_tree, whose
+    # spanning "tree" is then a forest
+    region = graph.subgraph([node for node in graph
+        if graph.nodes[node]["xy"][0] not in (4, 5)])
+    assert not nx.is_connected(region)
+    populations = {node: region.nodes[node]["POP20"] for node in region}
+    total = sum(populations.values())
+    rng = np.random.default_rng(3)
+    for _ in range(5):
+        tree = random_spanning_tree_array(region, rng=rng)
+        assert len(tree.edges) == len(region) - 2
+        for component in nx.connected_components(region):
+            root = next(node for node in component if tree.degree(node) > 1)
+            check_memoized_cuts(tree, populations, root, total / 4, 0.2)
+
+
+def test_union_find_cuts_match_contraction(graph):
+    populations = {node: graph.nodes[node]["POP20"] for node in graph}
+    total = sum(populations.values())
+    path = nx.path_graph(200)
+    path_populations = {node: 1 + node % 3 for node in path}
+    rng = np.random.default_rng(4)
+    cases = [(random_spanning_tree_array(graph, rng=rng), populations, total / k)
+        for k in (2, 3, 5, 8)]
+    cases.append((nx.minimum_spanning_tree(graph), populations, total / 4))
+    cases.append((path, path_populations, 40))
+    for tree, pops, ideal_pop in cases:
+        root = next(node for node in tree if tree.degree(node) > 1)
+        cuts = {}
+        for balance_edge_fn in (find_balanced_edge_cuts_contraction,
+                find_balanced_edge_cuts_union_find):
+            h = PopulatedGraph(tree, pops, ideal_pop, 0.1)
+            found = balance_edge_fn(h, choice=lambda nodes: root)
+            cuts[balance_edge_fn] = [(cut.edge, cut.pop, cut.subset) for cut in found]
+        assert cuts[find_balanced_edge_cuts_contraction]
+        assert (cuts[find_balanced_edge_cuts_contraction] ==
+            cuts[find_balanced_edge_cuts_union_find])
+
+
+def test_bipartition_tree_with_the_union_find_cut_finder(graph):
+    total = sum(graph.nodes[node]["POP20"] for node in graph)
+    results = []
+    for balance_edge_fn in (find_balanced_edge_cuts_contraction,
+            find_balanced_edge_cuts_union_find):
+        random.seed(6)
+        results.append(bipartition_tree(graph, "POP20", total / 3, 0.05,
+            node_repeats=2, balance_edge_fn=balance_edge_fn))
+    assert results[0] == results[1]
+    pop = sum(graph.nodes[node]["POP20"] for node in results[1])
+    assert abs(pop - total / 3) <= 0.05 * total / 3
+
+
+def test_tree_pool_keeps_trees_for_the_same_region(graph):
+    random.seed(0)
+    drawn = []
+    pool = TreePool(4, lambda g: drawn.append(1) or random_spanning_tree_array(g))
+    region = graph.subgraph([node for node in graph if node < 60])
+
+    trees = [pool.draw(region) for _ in range(3)]
+    trees.append(pool.draw(graph.subgraph(list(region.nodes))))
+    assert len(drawn) == 4
+    assert all(is_spanning_tree(tree, region) for tree in trees)
+
+    other = graph.subgraph([node for node in graph if node >= 60])
+    assert is_spanning_tree(pool.draw(other), other)
+    assert len(drawn) == 8
+
+
+def test_bipartition_tree_random_with_a_tree_pool(graph):
+    random.seed(0)
+    pool = TreePool(8)
+    total = sum(graph.nodes[node]["POP20"] for node in graph)
+    for _ in range(5):
+        nodes = bipartition_tree_random(graph, "POP20", total / 2, 0.05,
+            tree_pool=pool)
+        pop = sum(graph.nodes[node]["POP20"] for node in nodes)
+        assert abs(pop - total / 2) <= 0.05 * total / 2
+        assert nx.is_connected(graph.subgraph(nodes))
+        assert nx.is_connected(graph.subgraph(set(graph) - nodes))
+
+
+def test_bipartition_tree_speculative_is_balanced_and_reproducible(graph):
+    total = sum(graph.nodes[node]["POP20"] for node in graph)
+    results = []
+    for _ in range(2):
+        random.seed(3)
+        nodes = bipartition_tree_speculative(graph, "POP20", total / 3, 0.01,
+            node_repeats=2)
+        pop = sum(graph.nodes[node]["POP20"] for node in nodes)
+        assert abs(pop - total / 3) <= 0.01 * total / 3
+        assert nx.is_connected(graph.subgraph(nodes))
+        assert nx.is_connected(graph.subgraph(set(graph) - nodes))
+        results.append(nodes)
+    assert results[0] == results[1]
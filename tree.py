@@ -1,18 +1,224 @@
 import networkx as nx
 from networkx.algorithms import tree
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import (
+    breadth_first_order, depth_first_order, minimum_spanning_tree
+)
 
 from .random import random
-from collections import deque, namedtuple
+from .graph_index import node_index
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 
 
 def predecessors(h, root):
+    if isinstance(h, SpanningTree):
+        return h.predecessors(root)
     return {a: b for a, b in nx.bfs_predecessors(h, root)}
 
 
 def successors(h, root):
+    if isinstance(h, SpanningTree):
+        return h.successors(root)
     return {a: b for a, b in nx.bfs_successors(h, root)}
 
 
+def _numpy_rng():
+    """Returns a NumPy generator seeded from :mod:`gerrychain.random`, so that
+    array-based draws are reproducible under the usual chain seed.
+    """
+    return np.random.default_rng(random.getrandbits(64))
+
+
+def _edge_arrays(graph):
+    """Relabels ``graph`` with contiguous integer ids.
+
+    :return: ``(nodes, u, v)`` where ``nodes[i]`` is the label of id ``i`` and
+        ``(u[k], v[k])`` are the endpoints of the k-th edge.
+    """
+    nodes = list(graph)
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = np.fromiter(
+        (index[node] for edge in graph.edges for node in edge[:2]),
+        dtype=np.int64, count=2 * graph.number_of_edges()
+    ).reshape(-1, 2)
+    return nodes, edges[:, 0], edges[:, 1]
+
+
+def _graph_arrays(graph):
+    """CSR adjacency of ``graph`` over contiguous integer ids, gathered from
+    the cached :func:`~gerrychain.graph_index.node_index` of its root graph.
+
+    :return: ``(nodes, indptr, indices)`` where ``nodes[i]`` is the label of id ``i``.
+    """
+    nodes = list(graph)
+    index = node_index(graph)
+    indptr, indices = index.induced(index.ids_of(nodes))
+    return nodes, indptr, indices
+
+
+def _populations(graph, pop_col):
+    """Maps each node of ``graph`` to its ``pop_col`` attribute."""
+    index = node_index(graph)
+    nodes = list(graph)
+    return dict(zip(nodes, index.column(pop_col)[index.ids_of(nodes)].tolist()))
+
+
+def _csr_adjacency(n, u, v):
+    """Symmetric CSR adjacency ``(indptr, indices)`` of the edge list ``u, v``."""
+    rows = np.concatenate((u, v))
+    cols = np.concatenate((v, u))
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, cols[order]
+
+
+class SpanningTree:
+    """A spanning tree stored as a parent array over contiguous integer ids.
+
+    This is what the array-based spanning tree engines return. It implements
+    the small part of the graph interface that :class:`PopulatedGraph` and the
+    balanced cut finders rely on (iteration, ``degree``, ``nodes``), so it can
+    be used anywhere a networkx spanning tree was used before.
+
+    :ivar list nodes: ``nodes[i]`` is the graph node with id ``i``.
+    :ivar numpy.ndarray parent: ``parent[i]`` is the id of the parent of ``i``,
+        or -1 if ``i`` is a root.
+    """
+    __slots__ = ("nodes", "parent", "_index", "_indptr", "_indices", "_degrees")
+
+    def __init__(self, nodes, parent):
+        self.nodes = nodes
+        self.parent = parent
+        self._index = None
+        self._indptr = None
+        self._indices = None
+        self._degrees = None
+
+    @classmethod
+    def from_edges(cls, nodes, u, v):
+        """Builds the tree (or forest) with the given integer edge list,
+        rooted at id 0 (and at the lowest id of every other component).
+        """
+        n = len(nodes)
+        parent = np.full(n, -1, dtype=np.int64)
+        indptr, indices = _csr_adjacency(n, u, v)
+        adjacency = csr_matrix((np.ones(len(indices)), indices, indptr), shape=(n, n))
+        unreached = np.ones(n, dtype=bool)
+        root = 0
+        while root < n:
+            order, pred = breadth_first_order(
+                adjacency, root, directed=False, return_predecessors=True
+            )
+            parent[order[1:]] = pred[order[1:]]
+            unreached[order] = False
+            root = int(np.argmax(unreached)) if unreached.any() else n
+        tree = cls(nodes, parent)
+        tree._indptr, tree._indices = indptr, indices
+        return tree
+
+    @property
+    def index(self):
+        """Maps each graph node to its integer id."""
+        if self._index is None:
+            self._index = {node: i for i, node in enumerate(self.nodes)}
+        return self._index
+
+    def _adjacency(self):
+        if self._indptr is None:
+            children = np.flatnonzero(self.parent >= 0)
+            self._indptr, self._indices = _csr_adjacency(
+                len(self.nodes), children, self.parent[children]
+            )
+        return self._indptr, self._indices
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, node):
+        return node in self.index
+
+    def degree(self, node):
+        if self._degrees is None:
+            self._degrees = np.diff(self._adjacency()[0]).tolist()
+        return self._degrees[self.index[node]]
+
+    def neighbors(self, node):
+        indptr, indices = self._adjacency()
+        i = self.index[node]
+        return [self.nodes[j] for j in indices[indptr[i]:indptr[i + 1]].tolist()]
+
+    @property
+    def edges(self):
+        nodes = self.nodes
+        return [
+            (nodes[i], nodes[p]) for i, p in enumerate(self.parent.tolist()) if p >= 0
+        ]
+
+    def bfs(self, root):
+        """Breadth-first order and parent ids of the tree rooted at ``root``.
+
+        :param root: Integer id of the root
+        :return: ``(order, parent)`` arrays; ``parent[root]`` is negative.
+        """
+        indptr, indices = self._adjacency()
+        n = len(self.nodes)
+        adjacency = csr_matrix((np.ones(len(indices)), indices, indptr), shape=(n, n))
+        return breadth_first_order(
+            adjacency, root, directed=False, return_predecessors=True
+        )
+
+    def dfs(self, root):
+        """Depth-first preorder and parent ids of the tree rooted at ``root``.
+
+        :param root: Integer id of the root
+        :return: ``(order, parent)`` arrays; ``parent[root]`` is negative.
+        """
+        indptr, indices = self._adjacency()
+        n = len(self.nodes)
+        adjacency = csr_matrix((np.ones(len(indices)), indices, indptr), shape=(n, n))
+        return depth_first_order(
+            adjacency, root, directed=False, return_predecessors=True
+        )
+
+    def predecessors(self, root):
+        """Same as :func:`predecessors` on the networkx version of this tree."""
+        order, parent = self.bfs(self.index[root])
+        nodes = self.nodes
+        parent = parent.tolist()
+        return {nodes[i]: nodes[parent[i]] for i in order[1:].tolist()}
+
+    def successors(self, root):
+        """Same as :func:`successors` on the networkx version of this tree."""
+        order, parent = self.bfs(self.index[root])
+        nodes = self.nodes
+        parent = parent.tolist()
+        succ = {}
+        for i in order[1:].tolist():
+            succ.setdefault(nodes[parent[i]], []).append(nodes[i])
+        return succ
+
+    def to_networkx(self):
+        G = nx.Graph()
+        G.add_nodes_from(self.nodes)
+        G.add_edges_from(self.edges)
+        return G
+
+
+def _as_spanning_tree(graph):
+    """Returns ``graph`` as a :class:`SpanningTree`, converting networkx trees."""
+    if isinstance(graph, SpanningTree):
+        return graph
+    nodes, u, v = _edge_arrays(graph)
+    return SpanningTree.from_edges(nodes, u, v)
+
+
 def random_spanning_tree(graph):
     """ Builds a spanning tree chosen by Kruskal's method using random weights.
         :param graph: Networkx Graph
@@ -33,6 +239,63 @@ def random_spanning_tree(graph):
     return spanning_tree
 
 
+def random_spanning_tree_array(graph, rng=None):
+    """ Array-based version of :func:`random_spanning_tree`.
+
+        The edges of ``graph`` are relabelled into an integer edge list, given
+        random weights in a single vectorized draw and passed through Kruskal's
+        algorithm (argsort plus union-find, via
+        :func:`scipy.sparse.csgraph.minimum_spanning_tree`). The attributes of
+        ``graph`` are never touched, so this is safe to call on a shared graph
+        from several threads.
+
+        :param graph: Networkx Graph
+        :param rng: :class:`numpy.random.Generator`. Defaults to one seeded from
+            :mod:`gerrychain.random`.
+        :return: :class:`SpanningTree`
+    """
+    return random_spanning_trees_array(graph, 1, rng=rng)[0]
+
+
+def random_spanning_trees_array(graph, count, rng=None):
+    """ Draws ``count`` trees as in :func:`random_spanning_tree_array`, sharing
+        the edge list and drawing every tree's weights in one call.
+
+        :param graph: Networkx Graph
+        :param count: Number of trees to draw
+        :param rng: :class:`numpy.random.Generator`. Defaults to one seeded from
+            :mod:`gerrychain.random`.
+        :return: list of :class:`SpanningTree`
+    """
+    if rng is None:
+        rng = _numpy_rng()
+    nodes, indptr, indices = _graph_arrays(graph)
+    u, v = _upper_edges(indptr, indices)
+    # csgraph treats zero weights as missing edges, so draw from (0, 1]
+    weights = 1.0 - rng.random((count, len(u)))
+    return [_kruskal(nodes, u, v, tree_weights) for tree_weights in weights]
+
+
+def _upper_edges(indptr, indices):
+    """Each edge of the CSR adjacency once, as ``(u, v)`` arrays with ``u < v``."""
+    rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    upper = rows < indices
+    return rows[upper], indices[upper]
+
+
+def _kruskal(nodes, u, v, weights):
+    """Minimum spanning tree of the weighted edge list ``u, v``."""
+    n = len(nodes)
+    mst = minimum_spanning_tree(csr_matrix((weights, (u, v)), shape=(n, n))).tocoo()
+    return SpanningTree.from_edges(nodes, mst.row.astype(np.int64), mst.col.astype(np.int64))
+
+
+def _kruskal_tree(nodes, indptr, indices, rng):
+    """Array-level core of :func:`random_spanning_tree_array`."""
+    u, v = _upper_edges(indptr, indices)
+    return _kruskal(nodes, u, v, 1.0 - rng.random(len(u)))
+
+
 def uniform_spanning_tree(graph, choice=random.choice):
     """ Builds a spanning tree chosen uniformly from the space of all
         spanning trees of the graph.
@@ -62,10 +325,139 @@ def uniform_spanning_tree(graph, choice=random.choice):
     return G
 
 
+def _wilson(indptr, indices, rng, batch_size=4096):
+    """Wilson's algorithm on the CSR adjacency ``(indptr, indices)``.
+
+    Random numbers for the loop-erased walks are drawn in batches of
+    ``batch_size`` rather than one per step.
+
+    :return: Parent array of a uniformly random spanning tree, with -1 at the root.
+    """
+    n = len(indptr) - 1
+    starts = indptr[:-1].tolist()
+    degrees = np.diff(indptr).tolist()
+    neighbors = indices.tolist()
+
+    root = int(rng.integers(n))
+    in_tree = [False] * n
+    in_tree[root] = True
+    next_node = [-1] * n
+
+    draws = rng.random(batch_size).tolist()
+    k = 0
+    for node in range(n):
+        u = node
+        while not in_tree[u]:
+            if k == batch_size:
+                draws = rng.random(batch_size).tolist()
+                k = 0
+            next_node[u] = neighbors[starts[u] + int(draws[k] * degrees[u])]
+            k += 1
+            u = next_node[u]
+
+        u = node
+        while not in_tree[u]:
+            in_tree[u] = True
+            u = next_node[u]
+
+    return np.array(next_node, dtype=np.int64)
+
+
+def uniform_spanning_tree_array(graph, rng=None):
+    """ Array-based version of :func:`uniform_spanning_tree`.
+
+        Runs Wilson's algorithm over a CSR adjacency (offsets plus neighbor
+        arrays) of ``graph`` with batched random draws, and returns the tree as
+        a parent vector rather than building a networkx graph.
+
+        :param graph: Networkx Graph
+        :param rng: :class:`numpy.random.Generator`. Defaults to one seeded from
+            :mod:`gerrychain.random`.
+        :return: :class:`SpanningTree`
+    """
+    if rng is None:
+        rng = _numpy_rng()
+    return uniform_spanning_trees_array(graph, 1, rng=rng)[0]
+
+
+def uniform_spanning_trees_array(graph, count, rng=None):
+    """ Draws ``count`` trees as in :func:`uniform_spanning_tree_array`, sharing
+        the CSR adjacency between them.
+
+        :param graph: Networkx Graph
+        :param count: Number of trees to draw
+        :param rng: :class:`numpy.random.Generator`. Defaults to one seeded from
+            :mod:`gerrychain.random`.
+        :return: list of :class:`SpanningTree`
+    """
+    if rng is None:
+        rng = _numpy_rng()
+    nodes, indptr, indices = _graph_arrays(graph)
+    return [_wilson_tree(nodes, indptr, indices, rng) for _ in range(count)]
+
+
+def _wilson_tree(nodes, indptr, indices, rng):
+    """Array-level core of :func:`uniform_spanning_tree_array`."""
+    return SpanningTree(nodes, _wilson(indptr, indices, rng))
+
+
+class TreePool:
+    """Random spanning trees drawn ``size`` at a time and handed out one per
+    call to :meth:`draw`.
+
+    A pool is meant to be created once, by a proposal or a chain, and passed to
+    every :func:`bipartition_tree_random` call it makes. The trees left over
+    from one call are then used by the next call on the same region (the same
+    set of nodes), as when a chain proposes on the same pair of districts again
+    after a rejection, and are dropped when the region changes.
+
+    The array engines draw a whole batch with one setup of the region's
+    arrays; any other ``spanning_tree_fn`` is simply called ``size`` times.
+    """
+
+    def __init__(self, size, spanning_tree_fn=random_spanning_tree_array):
+        """
+        :param size: Number of trees to draw per batch
+        :param spanning_tree_fn: The random spanning tree algorithm to use
+        """
+        self.size = size
+        self.spanning_tree_fn = spanning_tree_fn
+        self._region = None
+        self._trees = []
+
+    def _draw_batch(self, graph):
+        batch_fn = _BATCH_SPANNING_TREE_FNS.get(self.spanning_tree_fn)
+        if batch_fn is not None:
+            return batch_fn(graph, self.size)
+        return [self.spanning_tree_fn(graph) for _ in range(self.size)]
+
+    def draw(self, graph):
+        """A random spanning tree of ``graph``."""
+        region = frozenset(graph.nodes)
+        if region != self._region:
+            self._region = region
+            self._trees = []
+        if not self._trees:
+            self._trees = self._draw_batch(graph)
+            self._trees.reverse()
+        return self._trees.pop()
+
+
+_BATCH_SPANNING_TREE_FNS = {
+    random_spanning_tree_array: random_spanning_trees_array,
+    uniform_spanning_tree_array: uniform_spanning_trees_array,
+}
+
+_ARRAY_SPANNING_TREE_FNS = {
+    random_spanning_tree_array: _kruskal_tree,
+    uniform_spanning_tree_array: _wilson_tree,
+}
+
+
 class PopulatedGraph:
     def __init__(self, graph, populations, ideal_pop, epsilon):
         self.graph = graph
-        self.subsets = {node: {node} for node in graph}
+        self._subsets = None
         self.population = populations.copy()
         self.tot_pop = sum(self.population.values())
         self.ideal_pop = ideal_pop
@@ -75,6 +467,13 @@ class PopulatedGraph:
     def __iter__(self):
         return iter(self.graph)
 
+    @property
+    def subsets(self):
+        # Only leaf contraction needs per-node subsets, so build them on demand
+        if self._subsets is None:
+            self._subsets = {node: {node} for node in self.graph}
+        return self._subsets
+
     def degree(self, node):
         return self._degrees[node]
 
@@ -89,7 +488,115 @@ class PopulatedGraph:
         )
 
 
-Cut = namedtuple("Cut", "edge subset")
+class UnionFindPopulatedGraph:
+    """Array-backed replacement for :class:`PopulatedGraph` used for leaf
+    contraction.
+
+    Nodes are the integer ids of the underlying :class:`SpanningTree`, and the
+    population, degree and union-find parent of each node are kept in flat
+    integer-indexed lists instead of per-node Python sets. Contracting a node
+    links it under its parent; the set of nodes merged into a node is only
+    rebuilt, by :meth:`subset`, for the cut that is actually used.
+    """
+    __slots__ = (
+        "graph", "population", "tot_pop", "ideal_pop", "epsilon", "_degrees", "_parents"
+    )
+
+    def __init__(self, graph, populations, ideal_pop, epsilon):
+        self.graph = _as_spanning_tree(graph)
+        self.population = [populations[node] for node in self.graph.nodes]
+        self.tot_pop = sum(self.population)
+        self.ideal_pop = ideal_pop
+        self.epsilon = epsilon
+        self._degrees = np.diff(self.graph._adjacency()[0]).tolist()
+        self._parents = list(range(len(self.population)))
+
+    def __iter__(self):
+        return iter(range(len(self.population)))
+
+    def degree(self, node):
+        return self._degrees[node]
+
+    def contract_node(self, node, parent):
+        self.population[parent] += self.population[node]
+        self._parents[node] = parent
+        self._degrees[parent] -= 1
+
+    def has_ideal_population(self, node):
+        return (
+            abs(self.population[node] - self.ideal_pop) < self.epsilon * self.ideal_pop
+        )
+
+    def subset(self, node):
+        """The graph nodes that have been contracted into ``node``."""
+        children = {}
+        for child, parent in enumerate(self._parents):
+            if child != parent:
+                children.setdefault(parent, []).append(child)
+        labels = self.graph.nodes
+        nodes = {labels[node]}
+        stack = [node]
+        while stack:
+            for child in children.get(stack.pop(), ()):
+                nodes.add(labels[child])
+                stack.append(child)
+        return nodes
+
+
+class Cut:
+    """A balanced cut edge of a spanning tree.
+
+    Cut finders report every balanced edge but a caller only ever keeps one,
+    so the node set on one side of the cut is built the first time
+    :attr:`subset` is read rather than when the cut is found.
+
+    :ivar edge: The tree edge to cut
+    :ivar pop: The population of :attr:`subset`
+    """
+    __slots__ = ("edge", "pop", "_subset", "_expand")
+
+    def __init__(self, edge, subset=None, pop=None, expand=None):
+        """
+        :param edge: The tree edge to cut
+        :param subset: The nodes on one side of the cut, if already known
+        :param pop: The population of ``subset``
+        :param expand: Zero-argument function building ``subset`` on demand
+        """
+        self.edge = edge
+        self.pop = pop
+        self._subset = subset
+        self._expand = expand
+
+    @property
+    def subset(self):
+        if self._subset is None:
+            self._subset = self._expand()
+            self._expand = None
+        return self._subset
+
+    def __repr__(self):
+        return "Cut(edge={!r}, pop={!r})".format(self.edge, self.pop)
+
+
+def _descendants(pred, start):
+    """The nodes below ``start`` in the tree given by the ``pred`` mapping."""
+    children = {}
+    for node, parent in pred.items():
+        children.setdefault(parent, []).append(node)
+    nodes = {start}
+    stack = [start]
+    while stack:
+        for child in children.get(stack.pop(), ()):
+            nodes.add(child)
+            stack.append(child)
+    return nodes
+
+
+def _preorder_slice(preorder, start, end, complement=False):
+    """The nodes of ``preorder[start:end]``, or of everything outside it."""
+    if complement:
+        return set(preorder[:start]) | set(preorder[end:])
+    return set(preorder[start:end])
 
 
 def find_balanced_edge_cuts_contraction(h, choice=random.choice):
@@ -103,7 +610,36 @@ def find_balanced_edge_cuts_contraction(h, choice=random.choice):
     while len(leaves) > 0:
         leaf = leaves.popleft()
         if h.has_ideal_population(leaf):
-            cuts.append(Cut(edge=(leaf, pred[leaf]), subset=h.subsets[leaf].copy()))
+            cuts.append(Cut(edge=(leaf, pred[leaf]), pop=h.population[leaf],
+                            expand=partial(_descendants, pred, leaf)))
+        # Contract the leaf:
+        parent = pred[leaf]
+        h.contract_node(leaf, parent)
+        if h.degree(parent) == 1 and parent != root:
+            leaves.append(parent)
+    return cuts
+
+
+def find_balanced_edge_cuts_union_find(h, choice=random.choice):
+    """Same as :func:`find_balanced_edge_cuts_contraction`, but contracts leaves
+    on a :class:`UnionFindPopulatedGraph` so that no node sets are merged along
+    the way. Can be passed anywhere a ``balance_edge_fn`` is accepted.
+    """
+    if not isinstance(h, UnionFindPopulatedGraph):
+        h = UnionFindPopulatedGraph(h.graph, h.population, h.ideal_pop, h.epsilon)
+    nodes = h.graph.nodes
+
+    root = h.graph.index[choice([nodes[x] for x in h if h.degree(x) > 1])]
+    # BFS predecessors for iteratively contracting leaves
+    pred = h.graph.bfs(root)[1].tolist()
+
+    cuts = []
+    leaves = deque(x for x in h if h.degree(x) == 1)
+    while len(leaves) > 0:
+        leaf = leaves.popleft()
+        if h.has_ideal_population(leaf):
+            cuts.append(Cut(edge=(nodes[leaf], nodes[pred[leaf]]), pop=h.population[leaf],
+                            expand=partial(h.subset, leaf)))
         # Contract the leaf:
         parent = pred[leaf]
         h.contract_node(leaf, parent)
@@ -113,49 +649,55 @@ def find_balanced_edge_cuts_contraction(h, choice=random.choice):
 
 
 def find_balanced_edge_cuts_memoization(h, choice=random.choice):
+    """Finds the balanced cut edges of the spanning tree ``h`` in one sweep.
+
+    The tree is rooted at a random non-leaf node and laid out in depth-first
+    preorder, so the subtree below every node is a contiguous slice of that
+    order. Subtree sizes are accumulated in reverse preorder and subtree
+    populations are differences of a prefix sum, so no part of the tree is
+    traversed more than once.
+    """
+    tree = _as_spanning_tree(h.graph)
     root = choice([x for x in h if h.degree(x) > 1])
-    pred = predecessors(h.graph, root)
-    succ = successors(h.graph, root)
-    total_pop = h.tot_pop
-    subtree_pops = {}
-    stack = deque(n for n in succ[root])
-    while stack:
-        next_node = stack.pop()
-        if next_node not in subtree_pops:
-            if next_node in succ:
-                children = succ[next_node]
-                if all(c in subtree_pops for c in children):
-                    subtree_pops[next_node] = sum(subtree_pops[c] for c in children)
-                    subtree_pops[next_node] += h.population[next_node]
-                else:
-                    stack.append(next_node)
-                    for c in children:
-                        if c not in subtree_pops:
-                            stack.append(c)
-            else:
-                subtree_pops[next_node] = h.population[next_node]
+    order, parent = tree.dfs(tree.index[root])
+
+    n = len(order)
+    nodes = tree.nodes
+    preorder = [nodes[i] for i in order.tolist()]
+    position = np.full(len(nodes), -1, dtype=np.int64)
+    position[order] = np.arange(n)
+    parent_position = [-1] + position[parent[order[1:]]].tolist()
+
+    sizes = [1] * n
+    for i in range(n - 1, 0, -1):
+        sizes[parent_position[i]] += sizes[i]
+    sizes = np.array(sizes)
+
+    cumulative = np.zeros(n + 1)
+    np.cumsum([h.population[node] for node in preorder], out=cumulative[1:])
+
+    # If the graph was disconnected the tree is a forest and only the root's
+    # component is searched; the other nodes always fall on the complement side
+    if n < len(nodes):
+        preorder.extend(nodes[i] for i in np.flatnonzero(position < 0).tolist())
+    starts = np.arange(n)
+    subtree_pops = cumulative[starts + sizes] - cumulative[starts]
+
+    tolerance = h.ideal_pop * h.epsilon
+    below = np.abs(subtree_pops - h.ideal_pop) <= tolerance
+    above = ~below & (np.abs((h.tot_pop - subtree_pops) - h.ideal_pop) <= tolerance)
+    below[0] = above[0] = False
 
     cuts = []
-    for node, tree_pop in subtree_pops.items():
-
-        def part_nodes(start):
-            nodes = set()
-            queue = deque([start])
-            while queue:
-                next_node = queue.pop()
-                if next_node not in nodes:
-                    nodes.add(next_node)
-                    if next_node in succ:
-                        for c in succ[next_node]:
-                            if c not in nodes:
-                                queue.append(c)
-            return nodes
-
-        if abs(tree_pop - h.ideal_pop) <= h.ideal_pop * h.epsilon:
-            cuts.append(Cut(edge=(node, pred[node]), subset=part_nodes(node)))
-        elif abs((total_pop - tree_pop) - h.ideal_pop) <= h.ideal_pop * h.epsilon:
-            cuts.append(Cut(edge=(node, pred[node]),
-                            subset=set(h.graph.nodes) - part_nodes(node)))
+    for i in np.flatnonzero(below | above).tolist():
+        end = i + int(sizes[i])
+        complement = not below[i]
+        pop = subtree_pops[i] if below[i] else h.tot_pop - subtree_pops[i]
+        cuts.append(Cut(
+            edge=(preorder[i], preorder[parent_position[i]]),
+            pop=float(pop),
+            expand=partial(_preorder_slice, preorder, i, end, complement)
+        ))
     return cuts
 
 
@@ -166,7 +708,7 @@ def bipartition_tree(
     epsilon,
     node_repeats=1,
     spanning_tree=None,
-    spanning_tree_fn=random_spanning_tree,
+    spanning_tree_fn=random_spanning_tree_array,
     balance_edge_fn=find_balanced_edge_cuts_memoization,
     choice=random.choice
 ):
@@ -194,7 +736,7 @@ def bipartition_tree(
         tree is not provided
     :param choice: :func:`random.choice`. Can be substituted for testing.
     """
-    populations = {node: graph.nodes[node][pop_col] for node in graph}
+    populations = _populations(graph, pop_col)
 
     possible_cuts = []
     if spanning_tree is None:
@@ -219,9 +761,10 @@ def bipartition_tree_random(
     node_repeats=1,
     repeat_until_valid=True,
     spanning_tree=None,
-    spanning_tree_fn=random_spanning_tree,
+    spanning_tree_fn=random_spanning_tree_array,
     balance_edge_fn=find_balanced_edge_cuts_memoization,
     choice=random.choice,
+    tree_pool=None,
 ):
     """This is like :func:`bipartition_tree` except it chooses a random balanced
     cut, rather than the first cut it finds.
@@ -254,24 +797,132 @@ def bipartition_tree_random(
         tree is not provided
     :param balance_edge_fn: The algorithm used to find balanced cut edges
     :param choice: :func:`random.choice`. Can be substituted for testing.
+    :param tree_pool: A :class:`TreePool` to draw spanning trees from instead of
+        ``spanning_tree_fn``. Trees are drawn in batches and used up across
+        retries, and the trees a call leaves over are used by later calls on
+        the same region, which amortizes the setup cost when many trees are
+        needed on a tight ``epsilon``.
     """
-    populations = {node: graph.nodes[node][pop_col] for node in graph}
+    populations = _populations(graph, pop_col)
 
-    possible_cuts = []
-    if spanning_tree is None:
-        spanning_tree = spanning_tree_fn(graph)
+    if tree_pool is not None:
+        draw_tree = partial(tree_pool.draw, graph)
+    else:
+        draw_tree = partial(spanning_tree_fn, graph)
 
+    possible_cuts = []
     repeat = True
     while repeat and len(possible_cuts) == 0:
-        spanning_tree = spanning_tree_fn(graph)
+        if spanning_tree is None:
+            spanning_tree = draw_tree()
         h = PopulatedGraph(spanning_tree, populations, pop_target, epsilon)
         possible_cuts = balance_edge_fn(h, choice=choice)
+        spanning_tree = None
         repeat = repeat_until_valid
 
     if possible_cuts:
         return choice(possible_cuts).subset
     return None
 
+def _speculative_candidate(
+    tree_fn, indptr, indices, populations, pop_target, epsilon, node_repeats,
+    balance_edge_fn, seed
+):
+    """Draws one spanning tree of a region given as arrays over local ids and
+    looks for a balanced cut on it, using only the random stream of ``seed``.
+
+    :return: The local ids on one side of a balanced cut, or None.
+    """
+    rng = np.random.default_rng(seed)
+    chooser = random.Random(int(rng.integers(2 ** 63)))
+    nodes = list(range(len(populations)))
+    populations = dict(zip(nodes, populations))
+
+    spanning_tree = tree_fn(nodes, indptr, indices, rng)
+    for _ in range(node_repeats):
+        h = PopulatedGraph(spanning_tree, populations, pop_target, epsilon)
+        possible_cuts = balance_edge_fn(h, choice=chooser.choice)
+        if possible_cuts:
+            return chooser.choice(possible_cuts).subset
+    return None
+
+
+_speculative_executor = None
+
+
+def _default_speculative_executor():
+    global _speculative_executor
+    if _speculative_executor is None:
+        _speculative_executor = ThreadPoolExecutor()
+    return _speculative_executor
+
+
+def bipartition_tree_speculative(
+    graph,
+    pop_col,
+    pop_target,
+    epsilon,
+    node_repeats=1,
+    candidates=4,
+    executor=None,
+    spanning_tree_fn=random_spanning_tree_array,
+    balance_edge_fn=find_balanced_edge_cuts_memoization,
+):
+    """Speculative version of :func:`bipartition_tree` for tight ``epsilon``.
+
+    Rather than drawing spanning trees one after another until one has a
+    balanced cut, this draws and scans ``candidates`` trees at a time on
+    ``executor`` and keeps the first candidate (in submission order) that
+    succeeded. Every candidate gets its own random stream, derived from a
+    single draw from :mod:`gerrychain.random`, so results are reproducible
+    regardless of how many workers there are or which finishes first.
+
+    The candidates only receive the region as arrays, so a
+    :class:`concurrent.futures.ProcessPoolExecutor` can be passed to scan
+    trees on several cores. The default is a shared thread pool, which also
+    works inside the worker processes of the parallel drivers. This is most
+    useful when those are not already saturating the machine.
+
+    :param graph: The graph to partition
+    :param pop_col: The node attribute holding the population of each node
+    :param pop_target: The target population for the returned subset of nodes
+    :param epsilon: The allowable deviation from  ``pop_target`` (as a percentage of
+        ``pop_target``) for the subgraph's population
+    :param node_repeats: A parameter for the algorithm: how many different choices
+        of root to use before drawing a new spanning tree.
+    :param candidates: Number of spanning trees drawn and scanned concurrently
+    :param executor: :class:`concurrent.futures.Executor` to scan candidates on
+    :param spanning_tree_fn: :func:`random_spanning_tree_array` or
+        :func:`uniform_spanning_tree_array`
+    :param balance_edge_fn: The algorithm used to find balanced cut edges
+    """
+    if executor is None:
+        executor = _default_speculative_executor()
+
+    nodes, indptr, indices = _graph_arrays(graph)
+    index = node_index(graph)
+    populations = index.column(pop_col)[index.ids_of(nodes)].tolist()
+    scan = partial(
+        _speculative_candidate, _ARRAY_SPANNING_TREE_FNS[spanning_tree_fn],
+        indptr, indices, populations, pop_target, epsilon, node_repeats, balance_edge_fn
+    )
+
+    base_seed = random.getrandbits(64)
+    attempt = 0
+    while True:
+        futures = [
+            executor.submit(scan, (base_seed, attempt, candidate))
+            for candidate in range(candidates)
+        ]
+        for future in futures:
+            subset = future.result()
+            if subset is not None:
+                for other in futures:
+                    other.cancel()
+                return {nodes[i] for i in subset}
+        attempt += 1
+
+
 def recursive_tree_part_recom(
     graph, parts, pop_target, pop_col, epsilon, node_repeats=1, method=bipartition_tree
 ):
@@ -294,10 +945,9 @@ def recursive_tree_part_recom(
         if nodes is None:
             raise BalanceError()
 
-        part_pop = 0
         for node in nodes:
             flips[node] = part
-            part_pop += graph.nodes[node][pop_col]
+        part_pop = node_index(graph).total(pop_col, nodes)
         debt += part_pop - pop_target[count]
         remaining_nodes -= nodes
 
@@ -352,10 +1002,9 @@ def recursive_tree_part(
         if nodes is None:
             raise BalanceError()
 
-        part_pop = 0
         for node in nodes:
             flips[node] = part
-            part_pop += graph.nodes[node][pop_col]
+        part_pop = node_index(graph).total(pop_col, nodes)
         debt += part_pop - pop_target
         remaining_nodes -= nodes
 
@@ -396,9 +1045,7 @@ def get_seed_chunks(
     if num_chunks_left == 1:
         new_epsilon = epsilon
 
-    chunk_pop = 0
-    for node in graph.nodes:
-        chunk_pop += graph.nodes[node][pop_col]
+    chunk_pop = node_index(graph).total(pop_col, graph.nodes)
 
     while True:
         epsilon = abs(epsilon)
@@ -436,9 +1083,7 @@ def get_seed_chunks(
             for node in remaining_nodes:
                 flips[node] = parts[-1]
 
-        part_pop = 0
-        for node in remaining_nodes:
-            part_pop += graph.nodes[node][pop_col]
+        part_pop = node_index(graph).total(pop_col, remaining_nodes)
         part_pop_as_dist = part_pop / num_chunks_left
         fake_epsilon = epsilon
         if num_chunks_left != 1:
@@ -498,6 +1143,7 @@ def recursive_seed_part_inner(
     node_repeats=1,
     n=None,
     ceil=None,
+    chunk_map=None,
 ):
     """
     Inner function for recursive_seed_part.
@@ -532,6 +1178,10 @@ def recursive_seed_part_inner(
         If ``ceil`` is a positive integer then finds the largest factor of ``num_dists`` less
         than or equal to ``ceil``, and recursively splits graph into that number of chunks, or
         bites off a district if that number is 1.
+    :param chunk_map: Either None or a function taking the list of chunks from the first
+        split into chunks and the number of districts per chunk, and returning the list of
+        their assignments, in order. Used by :func:`recursive_seed_part_parallel` to recurse
+        into the chunks concurrently.
     :return: New assignments for the nodes of ``graph``.
     :rtype: List of lists, each list is a district
     """
@@ -568,8 +1218,11 @@ def recursive_seed_part_inner(
             pop_target,
             pop_col,
             epsilon,
+            method=method,
+            node_repeats=node_repeats,
             n=n,
-            ceil=ceil)
+            ceil=ceil,
+            chunk_map=chunk_map)
 
     # split graph into num_chunks chunks, and recurse into each chunk
     elif num_dists % num_chunks == 0:
@@ -580,10 +1233,16 @@ def recursive_seed_part_inner(
             pop_target,
             pop_col,
             epsilon,
+            node_repeats=node_repeats,
             method=method
         )
 
         assignment = []
+        if chunk_map is not None:
+            for chunk_assignment in chunk_map(chunks, num_dists // num_chunks):
+                assignment += chunk_assignment
+            return assignment
+
         for chunk in chunks:
             chunk_assignment = recursive_seed_part_inner(
                 graph.subgraph(chunk),
@@ -591,6 +1250,8 @@ def recursive_seed_part_inner(
                 pop_target,
                 pop_col,
                 epsilon,
+                method=method,
+                node_repeats=node_repeats,
                 n=n,
                 ceil=ceil
             )
@@ -641,11 +1302,117 @@ def recursive_seed_part(
         pop_target,
         pop_col,
         epsilon,
-        method=bipartition_tree,
+        method=method,
+        node_repeats=node_repeats,
+        n=n,
+        ceil=ceil
+    )
+    for i in range(len(assignment)):
+        for node in assignment[i]:
+            flips[node] = parts[i]
+    return flips
+
+
+# The graph each seed worker process recurses into; set once per worker by
+# _init_seed_worker so that tasks only carry node lists.
+_seed_graph = None
+
+
+def _init_seed_worker(graph):
+    global _seed_graph
+    _seed_graph = graph
+
+
+def _seed_chunk(chunk, num_dists, pop_target, pop_col, epsilon, method, node_repeats, n, ceil,
+                seed):
+    random.seed(seed)
+    return recursive_seed_part_inner(
+        _seed_graph.subgraph(chunk),
+        num_dists,
+        pop_target,
+        pop_col,
+        epsilon,
+        method=method,
         node_repeats=node_repeats,
         n=n,
         ceil=ceil
     )
+
+
+def seed_part_executor(graph, processes=None):
+    """
+    Returns a process pool whose workers each hold a read-only copy of ``graph``, for
+    :func:`recursive_seed_part_parallel`. Create it once to build many seed plans of the
+    same graph. Where processes are forked the workers share the parent's copy.
+
+    :param graph: The graph
+    :param processes: Number of worker processes (defaults to the number of CPUs)
+    :rtype: concurrent.futures.ProcessPoolExecutor
+    """
+    return ProcessPoolExecutor(
+        max_workers=processes, initializer=_init_seed_worker, initargs=(graph,)
+    )
+
+
+def recursive_seed_part_parallel(
+    graph,
+    parts,
+    pop_target,
+    pop_col,
+    epsilon,
+    method=bipartition_tree,
+    node_repeats=1,
+    n=None,
+    ceil=None,
+    executor=None,
+    processes=None
+):
+    """
+    Parallel version of :func:`recursive_seed_part`. The graph is split as usual until it
+    is first divided into chunks; the chunks are independent, so the recursion into each of
+    them runs as a separate task on a process pool. Every task is seeded from
+    :mod:`gerrychain.random`, so the plan is reproducible for a given seed.
+
+    Takes the same parameters as :func:`recursive_seed_part`, plus:
+
+    :param executor: An executor from :func:`seed_part_executor` for this ``graph``. If
+        None, one is created for this call and shut down afterwards.
+    :param processes: Number of worker processes when ``executor`` is None
+    :return: New assignments for the nodes of ``graph``.
+    :rtype: dict
+    """
+    own_executor = executor is None
+    if own_executor:
+        executor = seed_part_executor(graph, processes)
+
+    def chunk_map(chunks, num_dists):
+        futures = [
+            executor.submit(
+                _seed_chunk, list(chunk), num_dists, pop_target, pop_col, epsilon,
+                method, node_repeats, n, ceil, random.getrandbits(64)
+            )
+            for chunk in chunks
+        ]
+        return [future.result() for future in futures]
+
+    try:
+        assignment = recursive_seed_part_inner(
+            graph,
+            len(parts),
+            pop_target,
+            pop_col,
+            epsilon,
+            method=method,
+            node_repeats=node_repeats,
+            n=n,
+            ceil=ceil,
+            chunk_map=chunk_map
+        )
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+    flips = {}
     for i in range(len(assignment)):
         for node in assignment[i]:
             flips[node] = parts[i]
@@ -1,9 +1,11 @@
 from functools import partial
 from ..random import random
+from ..cut_edge_index import random_cut_edge
 
 from ..tree import (
     recursive_tree_part, bipartition_tree, bipartition_tree_random,
-    uniform_spanning_tree, find_balanced_edge_cuts_memoization,
+    uniform_spanning_tree, uniform_spanning_tree_array,
+    find_balanced_edge_cuts_memoization,
     BalanceError, find_balanced_edge_cuts_contraction, recursive_tree_part_recom
 )
 
@@ -78,7 +80,7 @@ def recom(
         chain = MarkovChain(proposal, constraints, accept, partition, total_steps)
 
     """
-    edge = random.choice(tuple(partition["cut_edges"]))
+    edge = random_cut_edge(partition)
     parts_to_merge = (partition.assignment[edge[0]], partition.assignment[edge[1]])
 
     subgraph = partition.graph.subgraph(
@@ -102,7 +104,8 @@ def recom(
 
 def reversible_recom(partition, pop_col, pop_target, epsilon,
                      balance_edge_fn=find_balanced_edge_cuts_memoization, M=1,
-                     repeat_until_valid=False):
+                     repeat_until_valid=False,
+                     spanning_tree_fn=uniform_spanning_tree_array):
     def dist_pair_edges(part, a, b):
         return set(
             e for e in part.graph.edges
@@ -110,6 +113,17 @@ def reversible_recom(partition, pop_col, pop_target, epsilon,
                 (part.assignment[e[0]] == b and part.assignment[e[1]] == a))
         )
 
+    def dist_pair_edge(part, a, b):
+        if "district_pair_edges" in part.updaters:
+            return part["district_pair_edges"].choice(a, b, random)
+        pair_edges = dist_pair_edges(part, a, b)
+        return random.choice(list(pair_edges)) if pair_edges else None
+
+    def dist_pair_seam_length(part, a, b):
+        if "district_pair_edges" in part.updaters:
+            return part["district_pair_edges"].count(a, b)
+        return len(dist_pair_edges(part, a, b))
+
     def bounded_balance_edge_fn(*args, **kwargs):
         cuts = balance_edge_fn(*args, **kwargs)
         if len(cuts) > M:
@@ -120,22 +134,18 @@ def reversible_recom(partition, pop_col, pop_target, epsilon,
     bipartition_tree_random_reversible = partial(
         bipartition_tree_random,
         repeat_until_valid=repeat_until_valid,
-        spanning_tree_fn=uniform_spanning_tree,
+        spanning_tree_fn=spanning_tree_fn,
         balance_edge_fn=bounded_balance_edge_fn
     )
 
+    # Uniform over all ordered pairs of districts, self-pairs included
     parts = sorted(list(partition.parts.keys()))
-    dist_pairs = []
-    for out_part in parts:
-        for in_part in parts:
-            dist_pairs.append((out_part, in_part))
-
-    random_pair = random.choice(dist_pairs)
-    pair_edges = dist_pair_edges(partition, *random_pair)
-    if random_pair[0] == random_pair[1] or not pair_edges:
+    out_part, in_part = divmod(random.randrange(len(parts) ** 2), len(parts))
+    random_pair = (parts[out_part], parts[in_part])
+    edge = None if out_part == in_part else dist_pair_edge(partition, *random_pair)
+    if edge is None:
         return partition    # self-loop: no adjacency
 
-    edge = random.choice(list(pair_edges))
     parts_to_merge = (partition.assignment[edge[0]], partition.assignment[edge[1]])
     subgraph = partition.graph.subgraph(
         partition.parts[parts_to_merge[0]] | partition.parts[parts_to_merge[1]]
@@ -154,7 +164,7 @@ def reversible_recom(partition, pop_col, pop_target, epsilon,
         return partition    # self-loop: no balance edge
 
     new_part = partition.flip(flips)
-    seam_length = len(dist_pair_edges(new_part, *random_pair))
+    seam_length = dist_pair_seam_length(new_part, *random_pair)
 
     if random.random() < 1 / (M * seam_length):
         return new_part
@@ -0,0 +1,81 @@
+"""
+Persistent versions of a mutable structure, for incremental updaters.
+
+A Markov chain proposes many children of the same partition and keeps at most
+one of them, so an updater cannot simply mutate its parent's value in place.
+Copying the value on every step, on the other hand, costs as much as
+recomputing it. :class:`Version` avoids both by sharing one mutable store
+between every version derived from it: the store always holds exactly one
+version (the root), and every other version records the change that turns the
+version it points to back into itself. Reading a version replays the changes
+on the path to it and reverses the pointers, so moving between a partition and
+its proposals costs only the size of the changes involved.
+
+The store only needs an ``apply(change)`` method that applies ``change`` and
+returns the change that undoes it.
+
+Like tree.py, this file must be placed in the gerrychain directory.
+"""
+
+
+class Version:
+    """One version of a store shared with the versions derived from it."""
+    __slots__ = ("_store", "_next", "_change")
+
+    def __init__(self, store):
+        """
+        :param store: The mutable structure, holding this version. Must
+            implement ``apply(change)``, which returns the inverse change.
+        """
+        self._store = store
+        self._next = None
+        self._change = None
+
+    def _reroot(self):
+        # Walk to the version the store currently holds, then replay the
+        # changes back toward this version, reversing the pointers as we go
+        path = []
+        version = self
+        while version._next is not None:
+            path.append(version)
+            version = version._next
+
+        store = self._store
+        for version_ in reversed(path):
+            inverse = store.apply(version_._change)
+            version._next, version._change = version_, inverse
+            version_._next = version_._change = None
+            version = version_
+        return store
+
+    @property
+    def store(self):
+        """The store, holding this version."""
+        return self._reroot()
+
+    def derive(self, change):
+        """A new version that is this version with ``change`` applied.
+
+        :param change: A change accepted by the store's ``apply``
+        :rtype: Version
+        """
+        inverse = self._reroot().apply(change)
+        child = Version(self._store)
+        self._next, self._change = child, inverse
+        return child
+
+
+def changed_nodes(partition):
+    """The nodes that ``partition`` moved to a different part than its parent.
+
+    Proposals such as ReCom flip every node of the districts they redraw, most
+    of which stay where they were; incremental updaters only need the rest.
+
+    :return: Dict mapping each moved node to its ``(old part, new part)``.
+    """
+    old = partition.parent.assignment
+    return {
+        node: (old[node], part)
+        for node, part in partition.flips.items()
+        if old[node] != part
+    }